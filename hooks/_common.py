@@ -2,15 +2,29 @@
 
 Stdlib-only. Imported by every hook script. Keep this surface minimal — hooks
 must stay fast (sub-second) so heavy work belongs in detached subprocesses.
+
+Parsed config files are memoized by (mtime, size) so the warm hook daemon
+(``hook-daemon.py``) answers repeat events without re-reading the workspace.
 """
+import copy
+import hashlib
 import json
 import os
 import re
+import socket
 import sys
-from fnmatch import fnmatch
+import tempfile
+import time
+from contextlib import contextmanager
+from fnmatch import translate
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:  # POSIX advisory locks; elsewhere runtime-log writes go unlocked
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 
 def read_event() -> dict[str, Any]:
@@ -29,6 +43,35 @@ def write_output(output: dict[str, Any]) -> None:
     json.dump(output, sys.stdout)
 
 
+# ---------------------------------------------------------------------------
+# File-parse cache
+# ---------------------------------------------------------------------------
+
+_PARSE_CACHE: dict[tuple[str, str], tuple[tuple[int, int], Any]] = {}
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached_parse(kind: str, path: Path, parse: Any) -> Any:
+    """Return ``parse(path)``, reusing the last result while the file is unchanged."""
+    sig = _file_signature(path)
+    key = (kind, str(path))
+    if sig is None:
+        _PARSE_CACHE.pop(key, None)
+        return parse(path)
+    hit = _PARSE_CACHE.get(key)
+    if hit is None or hit[0] != sig:
+        hit = (sig, parse(path))
+        _PARSE_CACHE[key] = hit
+    return copy.deepcopy(hit[1])
+
+
 # ---------------------------------------------------------------------------
 # Workspace-path resolution
 # ---------------------------------------------------------------------------
@@ -47,6 +90,10 @@ def _read_install_yaml(path: Path) -> dict[str, Any] | None:
     Supports `key: value` lines with string/bool scalars and `# comments`.
     Returns None if the file is missing or unreadable.
     """
+    return _cached_parse("install", path, _parse_install_yaml)
+
+
+def _parse_install_yaml(path: Path) -> dict[str, Any] | None:
     try:
         text = path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
@@ -114,6 +161,25 @@ def read_acknowledged_notices(vault: Path) -> dict[str, datetime]:
     return notices
 
 
+def replace_text(target: Path, text: str) -> None:
+    """Write ``text`` to ``target`` through a temp file and ``os.replace``.
+
+    Concurrent readers see the old or the new file, never a truncated one.
+    Raises OSError (after removing the temp file) when the write fails.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def is_notice_suppressed(vault: Path, notice_id: str, ttl_days: int = 7) -> bool:
     seen = read_acknowledged_notices(vault).get(notice_id)
     if not seen:
@@ -163,7 +229,7 @@ def mark_notice_acknowledged(vault: Path, notice_id: str, when: datetime | None
         out.append(f"  {notice_id}: \"{stamp}\"")
     try:
         target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text("\n".join(out) + "\n", encoding="utf-8")
+        replace_text(target, "\n".join(out) + "\n")
     except OSError:
         return
 
@@ -260,11 +326,12 @@ def log_stderr(message: str) -> None:
     sys.stderr.write(message.rstrip() + "\n")
 
 
-def append_telemetry(vault: Path, event: dict[str, Any]) -> None:
+def append_telemetry(vault: Path, event: dict[str, Any], stream: str | None = None) -> None:
     """Append one JSONL event to ``_system/telemetry/YYYY-MM-DD.jsonl``.
 
     Mirrors ``tars_vault.telemetry.append_event`` so hook scripts (which can't
-    always import the MCP package) have a stdlib-only path. Silently no-ops if
+    always import the MCP package) have a stdlib-only path; ``stream`` routes
+    to ``<stream>-YYYY-MM-DD.jsonl`` the same way. Silently no-ops if
     ``TARS_DISABLE_TELEMETRY`` is set, or on any IO failure — telemetry must
     never take the session down.
     """
@@ -273,21 +340,104 @@ def append_telemetry(vault: Path, event: dict[str, Any]) -> None:
     try:
         from datetime import datetime
         day = datetime.now().astimezone().strftime("%Y-%m-%d")
-        target = Path(vault) / "_system" / "telemetry" / f"{day}.jsonl"
-        target.parent.mkdir(parents=True, exist_ok=True)
+        name = f"{stream}-{day}.jsonl" if stream else f"{day}.jsonl"
+        target = Path(vault) / "_system" / "telemetry" / name
         payload = dict(event)
         payload.setdefault("ts", datetime.now().astimezone().isoformat(timespec="seconds"))
-        with target.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(payload, separators=(",", ":")) + "\n")
+        line = json.dumps(payload, separators=(",", ":")) + "\n"
+        try:
+            handle = target.open("a", encoding="utf-8")
+        except FileNotFoundError:
+            # First event of the workspace: create the folder once, not per call.
+            target.parent.mkdir(parents=True, exist_ok=True)
+            handle = target.open("a", encoding="utf-8")
+        with handle:
+            handle.write(line)
     except Exception:
         return
 
 
+# ---------------------------------------------------------------------------
+# Trace spans (record shape shared with tars_vault.tracing)
+# ---------------------------------------------------------------------------
+
+TRACE_ENV = "TARS_TRACE_ID"
+TRACE_PARENT_ENV = "TARS_PARENT_SPAN_ID"
+TRACE_SESSION_ENV = "TARS_SESSION_ID"
+
+
+def trace_id_for_session(session_id: str) -> str:
+    """Stable trace id for a session so every hook in it shares one trace.
+
+    Hashes the same way as ``tars_vault.tracing.trace_id_for_session``, so
+    server spans started with ``TARS_SESSION_ID`` (or a ``_trace`` argument
+    carrying ``session_id``) land in the hooks' trace.
+    """
+    env_id = os.environ.get(TRACE_ENV)
+    if env_id:
+        return env_id
+    seed = session_id or os.environ.get(TRACE_SESSION_ENV) or f"pid-{os.getpid()}"
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+
+@contextmanager
+def trace_span(name: str, event: dict[str, Any], vault: Path | None = None, **attrs: Any) -> Iterator[dict[str, Any] | None]:
+    """Record one hook invocation to ``traces-YYYY-MM-DD.jsonl``.
+
+    Opt-in via ``TARS_TRACE=1`` (or an inherited ``TARS_TRACE_ID``). The
+    workspace is resolved when the span closes unless ``vault`` is given, and
+    the yielded dict takes extra attributes. Never raises.
+    """
+    if os.environ.get("TARS_TRACE") != "1" and not os.environ.get(TRACE_ENV):
+        yield None
+        return
+    import secrets
+    import threading
+    import time
+
+    span_attrs: dict[str, Any] = dict(attrs)
+    wall_us = time.time_ns() // 1000
+    started = time.perf_counter_ns()
+    status = "ok"
+    try:
+        yield span_attrs
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        try:
+            target = vault or vault_path()
+            if target is not None:
+                append_telemetry(
+                    target,
+                    {
+                        "trace_id": trace_id_for_session(str(event.get("session_id") or "")),
+                        "span_id": secrets.token_hex(8),
+                        "parent_id": os.environ.get(TRACE_PARENT_ENV) or None,
+                        "name": name,
+                        "proc": "hook",
+                        "ts_us": wall_us,
+                        "dur_us": (time.perf_counter_ns() - started) // 1000,
+                        "pid": os.getpid(),
+                        "tid": threading.get_native_id(),
+                        "status": status,
+                        "attrs": span_attrs,
+                    },
+                    stream="traces",
+                )
+        except Exception:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # Extension runtime state and policy helpers
 # ---------------------------------------------------------------------------
 
-EXTENSION_RUNTIME = "_system/extension-runtime.json"
+EXTENSION_RUNTIME_DIR = "_system/extension-runtime"
+EXTENSION_RUNTIME_LEGACY = "_system/extension-runtime.json"
+EXTENSION_RUNTIME_TTL_DAYS = 7
+EXTENSION_RUNTIME_COMPACT_BYTES = 16 * 1024
+EXTENSION_RUNTIME_TOUCH_SECONDS = 3600
 
 
 def _parse_scalar(value: str) -> Any:
@@ -384,6 +534,10 @@ def _next_yaml_content(lines: list[str], index: int) -> int | None:
 
 
 def read_yaml_subset(path: Path) -> dict[str, Any]:
+    return _cached_parse("yaml", Path(path), _parse_yaml_file)
+
+
+def _parse_yaml_file(path: Path) -> dict[str, Any]:
     try:
         text = path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
@@ -400,66 +554,224 @@ def _list(value: Any) -> list[str]:
     return [str(value)]
 
 
-def load_extension_runtime(vault: Path) -> dict[str, Any]:
-    target = Path(vault) / EXTENSION_RUNTIME
+# Extension runtime state is one append-only JSONL log per session under
+# ``_system/extension-runtime/``. Hooks append a line per event; readers fold
+# only their own session's log, which compaction keeps small, so the cost of a
+# hook call no longer grows with the workspace's session history.
+#
+# Appends and compaction (fold, rewrite, replace) hold an exclusive lock on
+# ``.lock`` in the log directory, so an event from a parallel hook cannot land
+# in a log that is about to be replaced. Readers need no lock: the replace is
+# atomic. Reading a session's log also refreshes its mtime (at most once per
+# ``EXTENSION_RUNTIME_TOUCH_SECONDS``), so the mtime is last activity, and logs
+# idle for ``EXTENSION_RUNTIME_TTL_DAYS`` are evicted when a new session
+# starts. The pre-log ``extension-runtime.json`` is folded into per-session
+# logs the first time a hook touches runtime state, then removed.
+
+
+def _runtime_log(vault: Path, session_id: str) -> Path:
+    sid = session_id or "unknown"
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", sid)[:80]
+    if safe != sid:
+        safe = f"{safe}-{hashlib.sha1(sid.encode('utf-8')).hexdigest()[:8]}"
+    return Path(vault) / EXTENSION_RUNTIME_DIR / f"{safe}.jsonl"
+
+
+@contextmanager
+def _runtime_lock(vault: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    directory = Path(vault) / EXTENSION_RUNTIME_DIR
     try:
-        data = json.loads(target.read_text(encoding="utf-8"))
-        return data if isinstance(data, dict) else {}
-    except Exception:
-        return {}
+        directory.mkdir(parents=True, exist_ok=True)
+        handle = (directory / ".lock").open("a")
+    except OSError:
+        yield
+        return
+    with handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _runtime_line(event: dict[str, Any]) -> str:
+    return json.dumps(event, separators=(",", ":"), sort_keys=True) + "\n"
 
 
-def write_extension_runtime(vault: Path, state: dict[str, Any]) -> None:
-    target = Path(vault) / EXTENSION_RUNTIME
+def _replace_runtime_log(target: Path, text: str) -> None:
     try:
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        replace_text(target, text)
+    except OSError:
+        pass
+
+
+def _migrate_legacy_runtime(vault: Path) -> None:
+    """Fold ``extension-runtime.json`` into per-session logs once."""
+    legacy = Path(vault) / EXTENSION_RUNTIME_LEGACY
+    if not legacy.is_file():
+        return
+    with _runtime_lock(vault):
+        try:
+            data = json.loads(legacy.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return  # another hook migrated it while we waited
+        except (OSError, ValueError):
+            data = {}
+        sessions = data.get("sessions") if isinstance(data, dict) else None
+        for session_id, session in (sessions if isinstance(sessions, dict) else {}).items():
+            if not isinstance(session, dict):
+                continue
+            updated = str(session.get("updated_at") or "")
+            events: list[dict[str, Any]] = []
+            if session.get("last_skill"):
+                events.append({"ts": updated, "skill": str(session["last_skill"])})
+            loaded = session.get("loaded_extensions")
+            for extension_id, ts in sorted((loaded if isinstance(loaded, dict) else {}).items()):
+                events.append({"ts": str(ts or updated), "extension": str(extension_id)})
+            if not events:
+                continue
+            target = _runtime_log(vault, str(session_id))
+            try:
+                existing = target.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                existing = ""
+            # Legacy events are older than anything already logged: they go first.
+            _replace_runtime_log(target, "".join(_runtime_line(e) for e in events) + existing)
+        try:
+            legacy.unlink()
+        except OSError:
+            pass
+
+
+def _fold_runtime_log(path: Path) -> dict[str, Any]:
+    state: dict[str, Any] = {"last_skill": "", "loaded_extensions": {}, "updated_at": ""}
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return state
+    for line in text.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(event, dict):
+            continue
+        ts = str(event.get("ts") or "")
+        if "skill" in event:
+            state["last_skill"] = str(event.get("skill") or "")
+        if event.get("extension"):
+            state["loaded_extensions"][str(event["extension"])] = ts
+        state["updated_at"] = ts or state["updated_at"]
+    return state
+
+
+def session_runtime(vault: Path, session_id: str) -> dict[str, Any]:
+    """Folded runtime state for one session: last skill and loaded extensions."""
+    _migrate_legacy_runtime(vault)
+    target = _runtime_log(vault, session_id)
+    sig = _file_signature(target)
+    if sig is not None and time.time() - sig[0] / 1e9 > EXTENSION_RUNTIME_TOUCH_SECONDS:
+        try:
+            os.utime(target)  # a session that only reads is still active
+        except OSError:
+            pass
+    return _cached_parse("runtime", target, _fold_runtime_log)
+
+
+def _compact_runtime_log(target: Path) -> None:
+    """Rewrite ``target`` as its folded state. Caller holds ``_runtime_lock``."""
+    state = _fold_runtime_log(target)
+    events: list[dict[str, Any]] = []
+    if state["last_skill"]:
+        events.append({"ts": state["updated_at"], "skill": state["last_skill"]})
+    for extension_id, ts in sorted(state["loaded_extensions"].items()):
+        events.append({"ts": ts, "extension": extension_id})
+    _replace_runtime_log(target, "".join(_runtime_line(event) for event in events))
+
+
+def _evict_runtime_sessions(vault: Path, keep: Path) -> None:
+    """Drop session logs with no activity (write or read) within the TTL."""
+    cutoff = time.time() - EXTENSION_RUNTIME_TTL_DAYS * 86400
+    try:
+        candidates = list(keep.parent.iterdir())
     except OSError:
         return
+    for path in candidates:
+        if path == keep or path.name == ".lock":
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            continue
 
 
-def _session_state(state: dict[str, Any], session_id: str) -> dict[str, Any]:
-    sessions = state.setdefault("sessions", {})
-    if not isinstance(sessions, dict):
-        state["sessions"] = sessions = {}
-    session = sessions.setdefault(session_id or "unknown", {})
-    if not isinstance(session, dict):
-        sessions[session_id or "unknown"] = session = {}
-    return session
+def _append_runtime_event(vault: Path, session_id: str, event: dict[str, Any]) -> None:
+    _migrate_legacy_runtime(vault)
+    target = _runtime_log(vault, session_id)
+    payload = {"ts": datetime.now(timezone.utc).isoformat(), **event}
+    with _runtime_lock(vault):
+        try:
+            new_session = not target.exists()
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with target.open("a", encoding="utf-8") as handle:
+                handle.write(_runtime_line(payload))
+            size = target.stat().st_size
+        except OSError:
+            return
+        if new_session:
+            _evict_runtime_sessions(vault, keep=target)
+        elif size > EXTENSION_RUNTIME_COMPACT_BYTES:
+            _compact_runtime_log(target)
 
 
 def record_skill_loaded(vault: Path, session_id: str, skill: str) -> None:
-    state = load_extension_runtime(vault)
-    session = _session_state(state, session_id)
-    session["last_skill"] = skill
-    session["updated_at"] = datetime.now(timezone.utc).isoformat()
-    write_extension_runtime(vault, state)
+    if session_runtime(vault, session_id)["last_skill"] == skill:
+        return
+    _append_runtime_event(vault, session_id, {"skill": skill})
 
 
 def record_extension_loaded(vault: Path, session_id: str, extension_id: str) -> None:
-    state = load_extension_runtime(vault)
-    session = _session_state(state, session_id)
-    loaded = session.setdefault("loaded_extensions", {})
-    if not isinstance(loaded, dict):
-        session["loaded_extensions"] = loaded = {}
-    loaded[extension_id] = datetime.now(timezone.utc).isoformat()
-    session["updated_at"] = datetime.now(timezone.utc).isoformat()
-    write_extension_runtime(vault, state)
+    if extension_id in session_runtime(vault, session_id)["loaded_extensions"]:
+        return
+    _append_runtime_event(vault, session_id, {"extension": extension_id})
 
 
 def extension_loaded(vault: Path, session_id: str, extension_id: str) -> bool:
-    session = (load_extension_runtime(vault).get("sessions") or {}).get(session_id or "unknown") or {}
-    loaded = session.get("loaded_extensions") or {}
-    return isinstance(loaded, dict) and extension_id in loaded
+    return extension_id in session_runtime(vault, session_id)["loaded_extensions"]
 
 
 def last_loaded_skill(vault: Path, session_id: str) -> str:
-    session = (load_extension_runtime(vault).get("sessions") or {}).get(session_id or "unknown") or {}
-    return str(session.get("last_skill") or "")
+    return session_runtime(vault, session_id)["last_skill"]
+
+
+_POLICY_CACHE: dict[str, tuple[tuple[Path, ...], tuple[Any, ...], list[dict[str, Any]]]] = {}
 
 
 def enabled_extension_policies(vault: Path) -> list[dict[str, Any]]:
-    registry = read_yaml_subset(Path(vault) / "_system" / "extensions.yaml")
+    """Provider-tool policies of enabled extensions, with compiled matchers.
+
+    Memoized per workspace until ``extensions.yaml`` or an enabled manifest
+    changes (a few ``stat`` calls), so the warm hook daemon does not re-walk
+    the registry on every tool call. Callers must treat the result as
+    read-only.
+    """
+    key = str(vault)
+    hit = _POLICY_CACHE.get(key)
+    if hit is not None and tuple(_file_signature(path) for path in hit[0]) == hit[1]:
+        return hit[2]
+    inputs, policies = _build_extension_policies(vault)
+    _POLICY_CACHE[key] = (inputs, tuple(_file_signature(path) for path in inputs), policies)
+    return policies
+
+
+def _build_extension_policies(vault: Path) -> tuple[tuple[Path, ...], list[dict[str, Any]]]:
+    registry_file = Path(vault) / "_system" / "extensions.yaml"
+    inputs = [registry_file]
+    registry = read_yaml_subset(registry_file)
     entries = registry.get("extensions") if isinstance(registry.get("extensions"), dict) else {}
     policies: list[dict[str, Any]] = []
     for extension_id, entry in sorted(entries.items()):
@@ -473,6 +785,7 @@ def enabled_extension_policies(vault: Path) -> list[dict[str, Any]]:
             ext_dir.relative_to((Path(vault) / "extensions").resolve())
         except ValueError:
             continue
+        inputs.append(ext_dir / "extension.yaml")
         manifest = read_yaml_subset(ext_dir / "extension.yaml")
         owns = manifest.get("owns") if isinstance(manifest.get("owns"), dict) else {}
         provider = manifest.get("provider") if isinstance(manifest.get("provider"), dict) else {}
@@ -487,6 +800,7 @@ def enabled_extension_policies(vault: Path) -> list[dict[str, Any]]:
                 "extension_id": str(extension_id),
                 "name": str(manifest.get("name") or extension_id),
                 "provider_tools": provider_tools,
+                "provider_matchers": compile_provider_patterns(provider_tools),
                 "enforcement": str(owns.get("enforcement") or "advisory"),
                 "applies_to_skills": _list(applies_to.get("skills")),
                 "tool_contract": (manifest.get("entrypoints") or {}).get("tool_contract", "")
@@ -494,16 +808,38 @@ def enabled_extension_policies(vault: Path) -> list[dict[str, Any]]:
                 else "",
             }
         )
-    return policies
+    return tuple(inputs), policies
 
 
 def provider_tool_matches(pattern: str, tool_name: str) -> bool:
-    if fnmatch(tool_name, pattern):
-        return True
-    try:
-        return bool(re.search(pattern, tool_name, re.IGNORECASE))
-    except re.error:
-        return pattern.lower() in tool_name.lower()
+    return provider_tools_match(compile_provider_patterns([pattern]), tool_name)
+
+
+def compile_provider_patterns(patterns: list[str]) -> tuple[tuple[Any, Any, str], ...]:
+    """Precompile each pattern as a glob, a case-insensitive regex, or a
+    case-insensitive substring when the regex is invalid.
+    """
+    compiled = []
+    for pattern in patterns:
+        try:
+            search = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            search = None
+        compiled.append((re.compile(translate(os.path.normcase(pattern))), search, pattern.lower()))
+    return tuple(compiled)
+
+
+def provider_tools_match(compiled: tuple[tuple[Any, Any, str], ...], tool_name: str) -> bool:
+    normalized = os.path.normcase(tool_name)
+    for glob, search, literal in compiled:
+        if glob.match(normalized):
+            return True
+        if search is not None:
+            if search.search(tool_name):
+                return True
+        elif literal in tool_name.lower():
+            return True
+    return False
 
 
 def normalized_tool_name(tool_name: str) -> str:
@@ -527,3 +863,65 @@ def is_tars_vault_tool(tool_name: str) -> bool:
 
 def is_tars_vault_action(tool_name: str, action: str) -> bool:
     return is_tars_vault_tool(tool_name) and tool_action(tool_name) == normalized_tool_name(action)
+
+
+# ---------------------------------------------------------------------------
+# Warm hook daemon
+# ---------------------------------------------------------------------------
+
+# Environment the daemon must mirror from the calling hook process.
+HOOK_DAEMON_ENV = (
+    "TARS_VAULT_PATH",
+    "TARS_IN_HOOK",
+    "TARS_DISABLE_TELEMETRY",
+    "TARS_TRACE",
+    TRACE_ENV,
+    TRACE_PARENT_ENV,
+    TRACE_SESSION_ENV,
+)
+_MAX_SOCKET_PATH = 100  # AF_UNIX paths are capped near 104 bytes on macOS
+
+
+def hook_daemon_vault_hint() -> Path | None:
+    """Cheap vault guess for locating a daemon socket (no config reads)."""
+    env_value = os.environ.get("TARS_VAULT_PATH")
+    if env_value and not _is_unexpanded_var(env_value):
+        return Path(env_value).expanduser().resolve()
+    cwd = Path.cwd()
+    if _candidate_has_install(cwd) or _candidate_has_config(cwd):
+        return cwd.resolve()
+    return None
+
+
+def hook_daemon_socket(vault: Path) -> Path:
+    """Socket path for the warm hook daemon serving ``vault``.
+
+    Prefers ``$XDG_RUNTIME_DIR``; otherwise lives under the workspace's
+    ``_system/``. Falls back to the temp dir when the path would exceed the
+    AF_UNIX length limit (e.g. deep "Application Support" workspaces).
+    """
+    digest = hashlib.sha1(str(Path(vault).resolve()).encode("utf-8")).hexdigest()[:12]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and Path(runtime_dir).is_dir():
+        candidate = Path(runtime_dir) / f"tars-hooks-{digest}.sock"
+    else:
+        candidate = Path(vault) / "_system" / "hook-daemon.sock"
+    if len(str(candidate)) > _MAX_SOCKET_PATH:
+        uid = os.getuid() if hasattr(os, "getuid") else 0
+        candidate = Path(tempfile.gettempdir()) / f"tars-hooks-{uid}-{digest}.sock"
+    return candidate
+
+
+def hook_daemon_alive(path: Path, timeout: float = 0.2) -> bool:
+    """True when something is accepting connections on the daemon socket."""
+    if not hasattr(socket, "AF_UNIX") or not Path(path).exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
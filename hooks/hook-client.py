@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Hook client shim.
+
+Usage (hooks.json): ``python3 hooks/hook-client.py <hook-name>``
+
+Forwards the stdin event to the warm hook daemon (``hook-daemon.py``) when
+one is serving this workspace, and otherwise runs ``hooks/<hook-name>.py``
+in-process with the same stdin — exactly what invoking the script directly
+would do. Any daemon problem (missing socket, timeout, reload request) takes
+the in-process path, so the shim never changes hook behaviour.
+"""
+import io
+import json
+import os
+import runpy
+import socket
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+from _common import HOOK_DAEMON_ENV, hook_daemon_socket, hook_daemon_vault_hint  # noqa: E402
+
+
+FORWARDED_HOOKS = frozenset({"pre-tool-use", "post-tool-use"})
+CONNECT_TIMEOUT_SECONDS = 0.2
+REPLY_TIMEOUT_SECONDS = 5.0
+
+
+def _forward(hook: str, raw: str) -> dict | None:
+    """Return the daemon's hook output, or None to run the hook locally."""
+    if hook not in FORWARDED_HOOKS or not hasattr(socket, "AF_UNIX"):
+        return None
+    vault = hook_daemon_vault_hint()
+    if vault is None:
+        return None
+    path = hook_daemon_socket(vault)
+    if not path.exists():
+        return None
+    try:
+        event = json.loads(raw) if raw.strip() else {}
+    except json.JSONDecodeError:
+        return None
+    request = {
+        "hook": hook,
+        "cwd": os.getcwd(),
+        "env": {key: os.environ.get(key) for key in HOOK_DAEMON_ENV},
+        "event": event if isinstance(event, dict) else {},
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+        sock.connect(str(path))
+        sock.settimeout(REPLY_TIMEOUT_SECONDS)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as handle:
+            line = handle.readline()
+        reply = json.loads(line or b"{}")
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+    output = reply.get("output") if isinstance(reply, dict) else None
+    return output if isinstance(output, dict) else None
+
+
+def _run_local(hook: str, raw: str) -> int:
+    script = ROOT / f"{hook}.py"
+    if not script.is_file():
+        sys.stdout.write("{}")
+        return 0
+    sys.stdin = io.StringIO(raw)
+    sys.argv = [str(script)]
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        return exc.code if isinstance(exc.code, int) else 0
+    return 0
+
+
+def main() -> int:
+    hook = sys.argv[1] if len(sys.argv) > 1 else ""
+    raw = sys.stdin.read()
+    output = _forward(hook, raw)
+    if output is not None:
+        json.dump(output, sys.stdout)
+        return 0
+    return _run_local(hook, raw)
+
+
+if __name__ == "__main__":
+    try:
+        rc = main()
+    except Exception as exc:  # pragma: no cover
+        sys.stderr.write(f"hook-client error: {exc}\n")
+        rc = 0
+    sys.exit(rc)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Optional warm hook daemon.
+
+Serves PreToolUse / PostToolUse events over a unix socket so a busy session
+does not pay a cold interpreter start, `_common` import, and config re-read
+for every tool call. `hook-client.py` forwards events here and falls back to
+running the hook script in-process whenever the daemon is absent, stale, or
+slow — enabling the daemon never changes hook decisions, only their latency.
+
+Started detached by SessionStart when ``TARS_HOOK_DAEMON=1`` (or manually):
+
+    python3 hooks/hook-daemon.py --vault /path/to/workspace
+
+Wire protocol: one JSON line per connection in each direction.
+
+    request:  {"hook": "pre-tool-use", "cwd": "...", "env": {...}, "event": {...}}
+    response: {"output": {...}}            — hook result
+              {"reload": true}             — hook sources changed; run locally
+
+Requests are handled serially because hook handlers resolve the workspace
+from the process environment and CWD, which the daemon mirrors per request.
+The daemon exits after ``--idle-timeout`` seconds without traffic or when
+the hook sources change on disk (plugin update).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import socket
+import socketserver
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+from _common import HOOK_DAEMON_ENV, hook_daemon_alive, hook_daemon_socket, log_stderr  # noqa: E402
+
+
+SERVED_HOOKS = ("pre-tool-use", "post-tool-use")
+DEFAULT_IDLE_TIMEOUT = 1800
+_MAX_REQUEST_BYTES = 8 * 1024 * 1024
+
+
+def _source_signature() -> tuple[tuple[str, int], ...]:
+    names = ["_common.py", *(f"{hook}.py" for hook in SERVED_HOOKS)]
+    out = []
+    for name in names:
+        try:
+            out.append((name, (ROOT / name).stat().st_mtime_ns))
+        except OSError:
+            out.append((name, 0))
+    return tuple(out)
+
+
+def _load_handlers() -> dict[str, object]:
+    handlers: dict[str, object] = {}
+    for hook in SERVED_HOOKS:
+        spec = importlib.util.spec_from_file_location(f"tars_hook_{hook.replace('-', '_')}", ROOT / f"{hook}.py")
+        if spec is None or spec.loader is None:
+            continue
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        handlers[hook] = module.handle
+    return handlers
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: HookDaemon = self.server  # type: ignore[assignment]
+        raw = self.rfile.readline(_MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            return
+        if server.sources_changed():
+            self._reply({"reload": True})
+            server.stop_requested = True
+            return
+        handler = server.handlers.get(str(request.get("hook") or ""))
+        if handler is None:
+            self._reply({"reload": True})
+            return
+        self._reply({"output": server.run_isolated(handler, request)})
+
+    def _reply(self, payload: dict) -> None:
+        try:
+            self.wfile.write((json.dumps(payload) + "\n").encode("utf-8"))
+        except OSError:
+            return
+
+
+class HookDaemon(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Path, idle_timeout: float) -> None:
+        self.socket_path = socket_path
+        self.handlers = _load_handlers()
+        self.signature = _source_signature()
+        self.stop_requested = False
+        self.timeout = idle_timeout
+        super().__init__(str(socket_path), _Handler)
+        os.chmod(str(socket_path), 0o600)
+
+    def sources_changed(self) -> bool:
+        return _source_signature() != self.signature
+
+    def handle_timeout(self) -> None:
+        self.stop_requested = True
+
+    def run_isolated(self, handler, request: dict) -> dict:
+        """Run one hook handler with the caller's env + CWD, then restore ours."""
+        saved_env = {key: os.environ.get(key) for key in HOOK_DAEMON_ENV}
+        saved_cwd = os.getcwd()
+        env = request.get("env") if isinstance(request.get("env"), dict) else {}
+        try:
+            for key in HOOK_DAEMON_ENV:
+                value = env.get(key)
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = str(value)
+            cwd = request.get("cwd")
+            if isinstance(cwd, str) and os.path.isdir(cwd):
+                os.chdir(cwd)
+            event = request.get("event") if isinstance(request.get("event"), dict) else {}
+            result = handler(event)
+            return result if isinstance(result, dict) else {}
+        except Exception as exc:
+            log_stderr(f"hook-daemon: {request.get('hook')} failed: {exc}")
+            return {}
+        finally:
+            os.chdir(saved_cwd)
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def serve_until_idle(self) -> None:
+        while not self.stop_requested:
+            self.handle_request()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="hook-daemon")
+    parser.add_argument("--vault", default=os.environ.get("TARS_VAULT_PATH"), help="Workspace the daemon serves.")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        log_stderr("hook-daemon: unix sockets unavailable on this platform")
+        return 0
+    if not args.vault:
+        log_stderr("hook-daemon: --vault or TARS_VAULT_PATH is required")
+        return 2
+    vault = Path(args.vault).expanduser().resolve()
+    socket_path = hook_daemon_socket(vault)
+    if socket_path.exists():
+        if hook_daemon_alive(socket_path):
+            return 0
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    daemon = HookDaemon(socket_path, args.idle_timeout)
+    try:
+        daemon.serve_until_idle()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
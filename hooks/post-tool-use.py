@@ -20,6 +20,7 @@ from _common import (
     append_telemetry,
     record_extension_loaded,
     tool_action,
+    trace_span,
 )
 
 
@@ -50,15 +51,21 @@ def _is_error_response(tool_response: object) -> bool:
     return False
 
 
-def main() -> int:
-    event = read_event()
+def handle(event: dict) -> dict:
+    """Record telemetry / extension acknowledgements for one PostToolUse event.
+
+    Shared by the standalone script and the warm hook daemon.
+    """
     if in_recursion():
-        write_output({})
-        return 0
+        return {}
+    with trace_span("hook.post-tool-use", event, tool=str(event.get("tool_name") or "")):
+        return _record(event)
+
+
+def _record(event: dict) -> dict:
     vault = vault_path()
     if vault is None:
-        write_output({})
-        return 0
+        return {}
 
     tool_name = event.get("tool_name") or ""
     tool_input = event.get("tool_input") or {}
@@ -71,17 +78,14 @@ def main() -> int:
             extension_id = str(tool_input.get("extension_id") or tool_input.get("id") or "")
         if extension_id and not _is_error_response(tool_response):
             record_extension_loaded(vault, str(event.get("session_id", "")), extension_id)
-        write_output({})
-        return 0
+        return {}
 
     if not is_tars_vault_action(tool_name, tool_action(tool_name)) or tool_action(tool_name) not in MUTATING_ACTIONS:
-        write_output({})
-        return 0
+        return {}
 
     # Respect both string + object response shapes. Treat missing error as success.
     if _is_error_response(tool_response):
-        write_output({})
-        return 0
+        return {}
 
     append_telemetry(
         vault,
@@ -92,7 +96,11 @@ def main() -> int:
             "file": _extract_file(tool_input) or "",
         },
     )
-    write_output({})
+    return {}
+
+
+def main() -> int:
+    write_output(handle(read_event()))
     return 0
 
 
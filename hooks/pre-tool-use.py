@@ -35,10 +35,11 @@ from _common import (
     is_tars_vault_action,
     is_tars_vault_tool,
     last_loaded_skill,
-    provider_tool_matches,
+    provider_tools_match,
     read_event,
     resolve_vault,
     tool_action,
+    trace_span,
     write_output,
 )
 
@@ -178,16 +179,14 @@ def _check_prefix(tool_name: str, tool_input: dict) -> str:
     return ""
 
 
-def _deny(reason: str) -> None:
-    write_output(
-        {
-            "hookSpecificOutput": {
-                "hookEventName": "PreToolUse",
-                "permissionDecision": "deny",
-                "permissionDecisionReason": reason,
-            }
+def _deny(reason: str) -> dict:
+    return {
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "deny",
+            "permissionDecisionReason": reason,
         }
-    )
+    }
 
 
 def _under_claude_home(path: Path) -> bool:
@@ -216,8 +215,19 @@ def _claude_home_write_reason(vault: Path | None, tool_input: dict) -> str:
     )
 
 
-def main() -> int:
-    event = read_event()
+def handle(event: dict) -> dict:
+    """Evaluate one PreToolUse event and return the hook output.
+
+    Shared by the standalone script and the warm hook daemon.
+    """
+    with trace_span("hook.pre-tool-use", event, tool=str(event.get("tool_name") or "")) as span:
+        output = _evaluate(event)
+        if span is not None:
+            span["denied"] = bool(output)
+    return output
+
+
+def _evaluate(event: dict) -> dict:
     tool_name = str(event.get("tool_name") or "")
     tool_input = event.get("tool_input") or {}
     _vault, status = resolve_vault()
@@ -230,65 +240,62 @@ def main() -> int:
             applies_to = policy.get("applies_to_skills") or []
             if applies_to and active_skill and active_skill not in applies_to:
                 continue
-            if not any(provider_tool_matches(str(pattern), tool_name) for pattern in policy.get("provider_tools", [])):
+            if not provider_tools_match(policy.get("provider_matchers") or (), tool_name):
                 continue
             extension_id = str(policy.get("extension_id") or "")
             if extension_id and not extension_loaded(_vault, session_id, extension_id):
                 contract = policy.get("tool_contract") or "the extension instructions"
-                _deny(
+                return _deny(
                     "Refusing direct provider MCP call because enabled TARS extension "
                     f"{extension_id} governs {tool_name} with {policy.get('enforcement')} "
                     "enforcement. Call mcp__tars_vault__resolve_extension and "
                     f"mcp__tars_vault__read_extension first, then follow {contract}."
                 )
-                return 0
 
     if tool_action(tool_name) not in _MUTATION_ACTIONS or not is_tars_vault_tool(tool_name):
-        write_output({})
-        return 0
+        return {}
 
     # Rule 1: install.yaml mismatch.
     ti = tool_input if isinstance(tool_input, dict) else {}
     claude_home_reason = _claude_home_write_reason(_vault, ti)
     if claude_home_reason:
-        _deny(claude_home_reason)
-        return 0
+        return _deny(claude_home_reason)
 
     if status.get("mismatch"):
         install = status.get("install") or {}
         stored = install.get("workspace_path") or install.get("vault_path") or "(unset)"
-        _deny(
+        return _deny(
             "Refusing workspace write: this folder does not match the workspace recorded in "
             f"_system/install.yaml (workspace_path={stored}). Run /welcome --relocate to "
             "update the install record before writing."
         )
-        return 0
 
     # Rule 2: bad wikilinks in content payload.
     findings: list[str] = []
     for chunk in _content_fields(tool_name, ti):
         findings.extend(_scan_bad_wikilinks(chunk))
     if findings:
-        _deny(
+        return _deny(
             "Refusing workspace write: wikilink validation failed. "
             "Use mcp__tars_vault__format_wikilink to form links. Findings: "
             + "; ".join(findings)
         )
-        return 0
 
     # Rule 3: 40KB body cap on non-chunking write tools.
     size_reason = _check_payload_size(tool_name, ti)
     if size_reason:
-        _deny(size_reason)
-        return 0
+        return _deny(size_reason)
 
     # Rule 4: tars- prefix enforcement on frontmatter / updates.
     prefix_reason = _check_prefix(tool_name, ti)
     if prefix_reason:
-        _deny(prefix_reason)
-        return 0
+        return _deny(prefix_reason)
+
+    return {}
 
-    write_output({})
+
+def main() -> int:
+    write_output(handle(read_event()))
     return 0
 
 
@@ -15,11 +15,22 @@ Banner composition (v3.3):
   5. Cron-job health: any job with id: null or status != registered surfaces
      as a notice.  Re-registration runs in the user's session via /welcome
      step 7 (hooks cannot call MCP tools).
+
+The notice collectors run concurrently under one wall-clock budget
+(``_NOTICE_BUDGET_SECONDS``); a collector that has not finished by then is
+dropped from this session's banner. Expensive inputs — git worktree state,
+schedule parsing, and the full-workspace fallback scans — are memoized in
+``_system/session-start-cache.json`` keyed by the mtimes of the files they
+read, so an unchanged workspace skips the work entirely. The cache holds
+inputs, never notice text: suppression and acknowledgement run every time.
 """
+import hashlib
+import json
 import os
 import re
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime, timezone, date, timedelta
 from pathlib import Path
@@ -27,17 +38,172 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT))
 from _common import (
+    hook_daemon_alive,
+    hook_daemon_socket,
     in_recursion,
     is_notice_suppressed,
     mark_notice_acknowledged,
     read_event,
     read_install_config,
+    replace_text,
     resolve_vault,
+    trace_span,
     write_output,
 )
 
 
 _REGISTRY_TTL_SECONDS = 24 * 60 * 60  # 24h per CLAUDE.md startup-checks §6
+_NOTICE_BUDGET_SECONDS = 5.0
+_CACHE_VERSION = 1
+_CACHE_NAME = "session-start-cache.json"
+
+
+def _stat_sig(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _markdown_signature(vault: Path) -> list:
+    """[count, newest mtime_ns, total bytes, path digest] of workspace notes.
+
+    A stat-only walk: far cheaper than the reads it guards, and it changes
+    whenever a note is added, removed, renamed, or edited. The top-level
+    `_system/` folder is skipped because this hook writes there.
+    """
+    count = newest = total = 0
+    paths: list[str] = []
+    stack = [str(vault)]
+    system_dir = str(vault / "_system")
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if entry.path != system_dir:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.name.endswith(".md"):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                count += 1
+                total += st.st_size
+                newest = max(newest, st.st_mtime_ns)
+                paths.append(entry.path)
+    digest = hashlib.sha1("\n".join(sorted(paths)).encode("utf-8", "surrogateescape")).hexdigest()[:16]
+    return [count, newest, total, digest]
+
+
+class _NoticeCache:
+    """Per-run memo backed by `_system/session-start-cache.json`.
+
+    Each entry stores the signature of its inputs next to the computed value;
+    ``memo`` returns the stored value while the signature still matches.
+    Also serializes `install.yaml` writes from concurrent collectors and
+    refuses new ones once the run is closed, so an abandoned collector can
+    never be cut off mid-write when the hook exits.
+    """
+
+    def __init__(self, vault: Path | None) -> None:
+        sys_dir = vault / "_system" if vault is not None else None
+        self.vault = vault
+        self.path = sys_dir / _CACHE_NAME if sys_dir is not None and sys_dir.is_dir() else None
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._md_sig: list | None = None
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == _CACHE_VERSION and isinstance(data.get("entries"), dict):
+            self._entries = data["entries"]
+
+    def memo(self, name: str, key: list, compute):
+        key = json.loads(json.dumps(key))
+        with self._lock:
+            entry = self._entries.get(name)
+        if isinstance(entry, dict) and entry.get("key") == key:
+            return entry.get("value")
+        value = compute()
+        with self._lock:
+            self._entries[name] = {"key": key, "value": value}
+            self._dirty = True
+        return value
+
+    def markdown_signature(self) -> list:
+        with self._lock:
+            if self._md_sig is None and self.vault is not None:
+                self._md_sig = _markdown_signature(self.vault)
+            return self._md_sig or []
+
+    def write_install(self, fn, *args) -> None:
+        with self._write_lock:
+            if not self._closed:
+                fn(*args)
+
+    def close(self) -> None:
+        with self._write_lock:
+            self._closed = True
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            payload = json.dumps({"version": _CACHE_VERSION, "entries": self._entries}, sort_keys=True)
+            self._dirty = False
+        try:
+            replace_text(self.path, payload)
+        except OSError:
+            pass
+
+
+def _memo(cache: _NoticeCache | None, name: str, key: list, compute):
+    return compute() if cache is None else cache.memo(name, key, compute)
+
+
+def _acknowledge(cache: _NoticeCache | None, vault: Path, notice_id: str) -> None:
+    if cache is None:
+        mark_notice_acknowledged(vault, notice_id)
+    else:
+        cache.write_install(mark_notice_acknowledged, vault, notice_id)
+
+
+def _run_collectors(collectors: list, budget: float) -> list:
+    """Run notice collectors concurrently and return their results in order.
+
+    Threads are daemonic: a collector still busy when the budget runs out (a
+    slow git call, a registry refresh) is abandoned at exit rather than
+    holding the session open, and its slot comes back as None.
+    """
+    results: list = [None] * len(collectors)
+
+    def run(index: int, fn) -> None:
+        try:
+            results[index] = fn()
+        except Exception as exc:
+            sys.stderr.write(f"session-start collector error: {exc}\n")
+
+    threads = [
+        threading.Thread(target=run, args=(i, fn), daemon=True)
+        for i, fn in enumerate(collectors)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + budget
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0.0))
+    return list(results)
 
 
 def _unexpanded_env_notice(status: dict) -> str:
@@ -51,9 +217,27 @@ def _unexpanded_env_notice(status: dict) -> str:
     )
 
 
-def _worktree_notice() -> str:
-    """Surface a clear notice when the session is running inside a git worktree."""
-    cwd = os.getcwd()
+def _git_signature(cwd: str) -> list:
+    """Stat signature of the git metadata `_git_worktree_state` reads."""
+    here = Path(cwd)
+    for base in (here, *here.parents):
+        dotgit = base / ".git"
+        if not dotgit.exists():
+            continue
+        gitdir = dotgit
+        if dotgit.is_file():
+            try:
+                m = re.match(r"gitdir:\s*(.+)", dotgit.read_text(encoding="utf-8").strip())
+            except (OSError, UnicodeDecodeError):
+                m = None
+            if m:
+                gitdir = base / m.group(1).strip()
+        common = gitdir.parent.parent if gitdir.parent.name == "worktrees" else gitdir
+        return [str(gitdir), _stat_sig(gitdir / "HEAD"), _stat_sig(common / "worktrees")]
+    return []
+
+
+def _git_worktree_state(cwd: str) -> dict:
     # Both .claude/worktrees/ (standard Claude Code path) and any path that
     # has /.git/worktrees/ ancestry indicate worktree isolation.
     in_worktree = ".claude/worktrees/" in cwd or "/.git/worktrees/" in cwd
@@ -61,10 +245,9 @@ def _worktree_notice() -> str:
         # Also check via git — the working directory may be a detached worktree
         # without the canonical path substring.
         try:
-            import subprocess
             result = subprocess.run(
                 ["git", "rev-parse", "--show-toplevel"],
-                capture_output=True, text=True, timeout=3
+                capture_output=True, text=True, timeout=3, cwd=cwd
             )
             if result.returncode == 0:
                 toplevel = result.stdout.strip()
@@ -85,20 +268,29 @@ def _worktree_notice() -> str:
             pass
 
     if not in_worktree:
-        return ""
+        return {"in_worktree": False, "branch": ""}
 
     # Extract branch name from CWD or git
     branch = ""
     try:
-        import subprocess
         result = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True, text=True, timeout=3
+            capture_output=True, text=True, timeout=3, cwd=cwd
         )
         if result.returncode == 0:
             branch = result.stdout.strip()
     except Exception:
         pass
+    return {"in_worktree": True, "branch": branch}
+
+
+def _worktree_notice(cache: _NoticeCache | None = None) -> str:
+    """Surface a clear notice when the session is running inside a git worktree."""
+    cwd = os.getcwd()
+    state = _memo(cache, "worktree", [cwd, _git_signature(cwd)], lambda: _git_worktree_state(cwd))
+    if not isinstance(state, dict) or not state.get("in_worktree"):
+        return ""
+    branch = str(state.get("branch") or "")
 
     profile_populated = False
     try:
@@ -170,7 +362,7 @@ def _claude_home_workspace_notice(vault: Path | None) -> str:
     )
 
 
-def _registry_notice(vault: Path) -> str:
+def _registry_notice(vault: Path, cache: _NoticeCache | None = None) -> str:
     """Refresh stale or missing integrations registry. Notice only on failure."""
     target = vault / "_system" / "tools-registry.yaml"
     needs_refresh = not target.is_file()
@@ -200,7 +392,7 @@ def _registry_notice(vault: Path) -> str:
         pass
     if is_notice_suppressed(vault, "integrations_refresh_failed"):
         return ""
-    mark_notice_acknowledged(vault, "integrations_refresh_failed")
+    _acknowledge(cache, vault, "integrations_refresh_failed")
     return "TARS couldn't refresh its integrations index. Run `/doctor` when you have a minute."
     return ""
 
@@ -242,32 +434,16 @@ def _parse_cron_jobs(text: str) -> dict[str, dict[str, str]]:
     return job_state
 
 
-def _cron_notice(vault: Path) -> str:
-    """Surface scheduler health issues at session start.
-
-    Checks performed (all stdlib, no MCP calls):
-      1. Unregistered jobs — scheduler_type is null/empty or status != registered.
-      2. CronCreate TTL expiry — cron_create_registered_at + 7d ≤ today+2d.
-         These are re-registered automatically in /maintain; notice is informational.
-      3. Mutual-exclusion drift — install.yaml scheduler_type disagrees with
-         housekeeping-state.yaml (indicates a scheduler was changed without updating
-         both records). Surface as a warning; auto-fix is NOT performed.
-
-    Never blocks the session (observability-only).
-    """
-    target = vault / "_system" / "housekeeping-state.yaml"
-    if not target.is_file():
-        return ""
+def _cron_job_health(target: Path) -> dict[str, list[str]] | None:
+    """Classify housekeeping-state.yaml jobs as unregistered / expiring soon."""
     try:
         text = target.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
-        return ""
-
+        return None
     job_state = _parse_cron_jobs(text)
 
     unregistered: list[str] = []
     expiring_soon: list[str] = []
-    now = time.time()
 
     for job, props in job_state.items():
         job_id = props.get("id", "")
@@ -284,22 +460,49 @@ def _cron_notice(vault: Path) -> str:
             if registered_at_str:
                 try:
                     # Parse ISO-8601 date/datetime — take just the date portion.
-                    date_part = registered_at_str[:10]
-                    import datetime as _dt
-                    reg_date = _dt.date.fromisoformat(date_part)
-                    age_days = (_dt.date.today() - reg_date).days
+                    reg_date = date.fromisoformat(registered_at_str[:10])
+                    age_days = (date.today() - reg_date).days
                     days_left = _CRON_CREATE_TTL_DAYS - age_days
                     if days_left <= _CRON_CREATE_WARN_DAYS:
                         expiring_soon.append(f"{job} ({days_left}d remaining)")
                 except (ValueError, TypeError):
                     pass
+    return {"unregistered": unregistered, "expiring_soon": expiring_soon}
+
+
+def _cron_notice(vault: Path, cache: _NoticeCache | None = None) -> str:
+    """Surface scheduler health issues at session start.
+
+    Checks performed (all stdlib, no MCP calls):
+      1. Unregistered jobs — scheduler_type is null/empty or status != registered.
+      2. CronCreate TTL expiry — cron_create_registered_at + 7d ≤ today+2d.
+         These are re-registered automatically in /maintain; notice is informational.
+      3. Mutual-exclusion drift — install.yaml scheduler_type disagrees with
+         housekeeping-state.yaml (indicates a scheduler was changed without updating
+         both records). Surface as a warning; auto-fix is NOT performed.
+
+    Never blocks the session (observability-only).
+    """
+    target = vault / "_system" / "housekeeping-state.yaml"
+    if not target.is_file():
+        return ""
+    health = _memo(
+        cache,
+        "schedules",
+        [_stat_sig(target), date.today().isoformat()],
+        lambda: _cron_job_health(target),
+    )
+    if not health:
+        return ""
+    unregistered = health.get("unregistered") or []
+    expiring_soon = health.get("expiring_soon") or []
 
     parts: list[str] = []
 
     if unregistered:
         if is_notice_suppressed(vault, "schedules_not_registered"):
             return ""
-        mark_notice_acknowledged(vault, "schedules_not_registered")
+        _acknowledge(cache, vault, "schedules_not_registered")
         parts.append(
             "TARS scheduled jobs aren't running yet. Run `/welcome --setup-schedules` to enable them."
         )
@@ -358,7 +561,7 @@ def _stamp_install_version(vault: Path, version: str) -> None:
     if not found:
         lines.append(f'plugin_version: "{version}"')
     try:
-        target.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        replace_text(target, "\n".join(lines) + "\n")
     except OSError:
         return
 
@@ -375,7 +578,7 @@ def _parse_iso_date(value: str) -> date | None:
             return None
 
 
-def _version_drift_notice(vault: Path) -> str:
+def _version_drift_notice(vault: Path, cache: _NoticeCache | None = None) -> str:
     live = _live_plugin_version()
     recorded = _install_value(vault, "plugin_version")
     if not live or not recorded or recorded == live:
@@ -384,34 +587,44 @@ def _version_drift_notice(vault: Path) -> str:
         return ""
     if is_notice_suppressed(vault, "version_drift"):
         return ""
-    _stamp_install_version(vault, live)
-    mark_notice_acknowledged(vault, "version_drift")
+    if cache is None:
+        _stamp_install_version(vault, live)
+    else:
+        cache.write_install(_stamp_install_version, vault, live)
+    _acknowledge(cache, vault, "version_drift")
     return f"TARS was upgraded from {recorded} to {live}. No migration needed; refreshing your install record."
 
 
-def _welcome_back_notice(vault: Path) -> str:
+def _welcome_back_notice(vault: Path, cache: _NoticeCache | None = None) -> str:
     last = _parse_iso_date(_install_value(vault, "last_session_at"))
     if not last:
         return ""
     days = (date.today() - last).days
     if days < 30 or is_notice_suppressed(vault, "welcome_back", ttl_days=30):
         return ""
-    mark_notice_acknowledged(vault, "welcome_back")
+    _acknowledge(cache, vault, "welcome_back")
     ledger = _activity_ledger(vault)
     note_count = _ledger_int(ledger, "active_file_count", 0)
     detail = "Your workspace is still light" if note_count < 20 else "There may be useful changes to catch up on"
     return f"Welcome back. You haven't used TARS in {days} days. {detail}. Say \"catch me up\" or run `/briefing` for a 60-second summary."
 
 
-def _pollution_notice(vault: Path) -> str:
+def _pollution_notice(vault: Path, cache: _NoticeCache | None = None) -> str:
     ledger = _activity_ledger(vault)
     if ledger:
         polluted = _ledger_int(ledger, "frontmatter_pollution_count", 0)
-        if polluted == 0 or is_notice_suppressed(vault, "frontmatter_pollution"):
-            return ""
-        mark_notice_acknowledged(vault, "frontmatter_pollution")
-        return f"{polluted} note(s) use non-TARS frontmatter and won't show up in structured search. Run `/lint --fix-prefixes` to migrate."
+    elif cache is None:
+        polluted = _count_polluted_notes(vault)
+    else:
+        polluted = cache.memo("pollution", [cache.markdown_signature()], lambda: _count_polluted_notes(vault))
+    if not polluted or is_notice_suppressed(vault, "frontmatter_pollution"):
+        return ""
+    _acknowledge(cache, vault, "frontmatter_pollution")
+    return f"{polluted} note(s) use non-TARS frontmatter and won't show up in structured search. Run `/lint --fix-prefixes` to migrate."
 
+
+def _count_polluted_notes(vault: Path) -> int:
+    """Legacy full scan used until the activity ledger has been materialized."""
     allowed = {"tags", "aliases"}
     polluted = 0
     for md in vault.rglob("*.md"):
@@ -427,10 +640,7 @@ def _pollution_notice(vault: Path) -> str:
             continue
         if any((k not in allowed and not k.startswith("tars-")) for k in fm):
             polluted += 1
-    if polluted == 0 or is_notice_suppressed(vault, "frontmatter_pollution"):
-        return ""
-    mark_notice_acknowledged(vault, "frontmatter_pollution")
-    return f"{polluted} note(s) use non-TARS frontmatter and won't show up in structured search. Run `/lint --fix-prefixes` to migrate."
+    return polluted
 
 
 def _parse_frontmatter_only(text: str) -> dict[str, str]:
@@ -514,7 +724,7 @@ def _ledger_nested_int(ledger: dict, section: str, key: str, default: int = 0) -
         return default
 
 
-def _state_aware_lines(vault: Path) -> list[str]:
+def _state_aware_lines(vault: Path, cache: _NoticeCache | None = None) -> list[str]:
     """Power-user state insights (PRD-11). Each insight: at most one line.
 
     Staleness is judged by `tars-modified` in frontmatter (the workspace's
@@ -538,6 +748,30 @@ def _state_aware_lines(vault: Path) -> list[str]:
         return lines
 
     today = date.today()
+    if cache is None:
+        stale, overdue = _scan_stale_and_overdue(vault, today)
+    else:
+        stale, overdue = cache.memo(
+            "state_aware",
+            [cache.markdown_signature(), today.isoformat()],
+            lambda: _scan_stale_and_overdue(vault, today),
+        )
+    if stale:
+        lines.append(f"{stale} active initiative(s) haven't been touched in 30+ days. Say \"check stale initiatives\" when ready.")
+    if overdue:
+        lines.append(f"{overdue} task(s) are overdue. Say \"triage my tasks\" to work through them.")
+
+    inbox_dir = vault / "inbox" / "pending"
+    pending = 0
+    if inbox_dir.is_dir():
+        pending = sum(1 for p in inbox_dir.iterdir() if p.is_file())
+    if pending:
+        lines.append(f"{pending} item(s) waiting in your inbox. Say \"process inbox\" to work through them.")
+    return lines
+
+
+def _scan_stale_and_overdue(vault: Path, today: date) -> list[int]:
+    """Legacy frontmatter scan used until the activity ledger exists."""
     cutoff = today - timedelta(days=30)
 
     stale = 0
@@ -558,8 +792,6 @@ def _state_aware_lines(vault: Path) -> list[str]:
                 stale += 1
         except ValueError:
             continue
-    if stale:
-        lines.append(f"{stale} active initiative(s) haven't been touched in 30+ days. Say \"check stale initiatives\" when ready.")
 
     overdue = 0
     today_iso = today.isoformat()
@@ -575,16 +807,7 @@ def _state_aware_lines(vault: Path) -> list[str]:
                 due = fm.get("tars-due", "").strip('"').strip("'")
                 if due and due < today_iso:
                     overdue += 1
-    if overdue:
-        lines.append(f"{overdue} task(s) are overdue. Say \"triage my tasks\" to work through them.")
-
-    inbox_dir = vault / "inbox" / "pending"
-    pending = 0
-    if inbox_dir.is_dir():
-        pending = sum(1 for p in inbox_dir.iterdir() if p.is_file())
-    if pending:
-        lines.append(f"{pending} item(s) waiting in your inbox. Say \"process inbox\" to work through them.")
-    return lines
+    return [stale, overdue]
 
 
 def _build_context(vault: Path | None, status: dict) -> str:
@@ -629,41 +852,65 @@ def _build_context(vault: Path | None, status: dict) -> str:
     if not _looks_like_workspace(vault) and not _is_plugin_checkout(vault):
         return "This folder isn't a TARS workspace yet. Run `/welcome` to set one up."
 
-    # Worktree isolation notice (informational, non-blocking).
-    worktree = _worktree_notice()
-    if worktree:
-        parts.append(worktree)
-
-    vault_note = _vault_notice(status)
-    if vault_note:
-        parts.append(vault_note)
-    claude_home = _claude_home_workspace_notice(vault)
-    if claude_home:
-        parts.append(claude_home)
+    cache = _NoticeCache(vault)
+    collectors = [
+        # Worktree isolation notice (informational, non-blocking).
+        lambda: _worktree_notice(cache),
+        lambda: _vault_notice(status),
+        lambda: _claude_home_workspace_notice(vault),
+    ]
     if vault and status.get("source") in ("env", "cwd-install", "cwd-config"):
-        for line in (
-            _welcome_back_notice(vault),
-            _version_drift_notice(vault),
-            _pollution_notice(vault),
-        ):
-            if line:
-                parts.append(line)
-        parts.extend(_state_aware_lines(vault))
-        reg = _registry_notice(vault)
-        if reg:
-            parts.append(reg)
-        cron = _cron_notice(vault)
-        if cron:
-            parts.append(cron)
+        collectors += [
+            lambda: _welcome_back_notice(vault, cache),
+            lambda: _version_drift_notice(vault, cache),
+            lambda: _pollution_notice(vault, cache),
+            lambda: _state_aware_lines(vault, cache),
+            lambda: _registry_notice(vault, cache),
+            lambda: _cron_notice(vault, cache),
+        ]
+    try:
+        results = _run_collectors(collectors, _NOTICE_BUDGET_SECONDS)
+    finally:
+        cache.close()
+    for result in results:
+        if isinstance(result, list):
+            parts.extend(line for line in result if line)
+        elif result:
+            parts.append(result)
     return "\n\n".join(parts)
 
 
+def _maybe_start_hook_daemon(vault: Path | None) -> None:
+    """Spawn the optional warm hook daemon when TARS_HOOK_DAEMON=1.
+
+    Detached and best-effort: hook-client.py runs hooks in-process whenever
+    the daemon is not answering, so a failed spawn only costs latency.
+    """
+    if vault is None or os.environ.get("TARS_HOOK_DAEMON") != "1":
+        return
+    if hook_daemon_alive(hook_daemon_socket(vault)):
+        return
+    try:
+        subprocess.Popen(
+            [sys.executable, str(ROOT / "hook-daemon.py"), "--vault", str(vault)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        return
+
+
 def main() -> int:
     _event = read_event()
     if in_recursion():
         return 0
     vault, status = resolve_vault()
-    context = _build_context(vault, status)
+    with trace_span("hook.session-start", _event, vault=vault):
+        _maybe_start_hook_daemon(vault)
+        context = _build_context(vault, status)
     write_output({"hookSpecificOutput": {"additionalContext": context}})
     return 0
 
@@ -3,6 +3,11 @@
 The Markdown workspace remains the source of truth. This module scans it
 lightly, returns structured summaries for MCP tools, and can materialize a
 small `_system/activity-ledger.yaml` capsule for SessionStart.
+
+Scans honour the active call budget (`call_context`): when a tool call hits
+its deadline or is cancelled, iteration stops early and the ledger is marked
+``truncated`` so it is never persisted as the workspace capsule. They also
+tick the call's progress reporter so clients can show sweep progress.
 """
 from __future__ import annotations
 
@@ -12,6 +17,7 @@ from pathlib import Path
 from typing import Any
 
 from . import _common
+from . import call_context
 
 
 SKIP_PARTS = {".git", ".obsidian", ".claude"}
@@ -50,6 +56,9 @@ def _skip_path(rel: str, *, include_archive: bool = False, include_system: bool
 def iter_markdown(vault: Path, *, include_archive: bool = False, include_system: bool = False) -> list[Path]:
     out: list[Path] = []
     for md in vault.rglob("*.md"):
+        if not call_context.checkpoint():
+            break
+        call_context.tick(message="Scanning workspace")
         rel = _rel(vault, md)
         if _skip_path(rel, include_archive=include_archive, include_system=include_system):
             continue
@@ -151,6 +160,8 @@ def _latest_under(vault: Path, rel: str) -> str | None:
         return None
     dates: list[str] = []
     for path in root.rglob("*"):
+        if not call_context.checkpoint():
+            break
         if path.is_dir() or path.name.startswith("."):
             continue
         fm, _body = _read_note(path) if path.suffix == ".md" else ({}, "")
@@ -195,7 +206,12 @@ def build_activity_ledger(
     transcripts: list[dict[str, Any]] = []
     frontmatter_pollution_count = 0
 
-    for md in iter_markdown(vault_p, include_archive=True):
+    notes = iter_markdown(vault_p, include_archive=True)
+    call_context.expect(len(notes))
+    for md in notes:
+        if not call_context.checkpoint():
+            break
+        call_context.tick(message="Reading notes")
         rel = _rel(vault_p, md)
         if rel.startswith("archive/"):
             archive_file_count += 1
@@ -280,7 +296,7 @@ def build_activity_ledger(
     stale_active.sort(key=lambda item: int(item.get("age_days") or 0), reverse=True)
     overdue_tasks.sort(key=lambda item: int(item.get("age_days") or 0), reverse=True)
 
-    return {
+    ledger: dict[str, Any] = {
         "generated_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
         "source": "derived-from-markdown",
         "active_file_count": active_file_count,
@@ -312,6 +328,9 @@ def build_activity_ledger(
         "context_gaps": context_gaps,
         "frontmatter_pollution_count": frontmatter_pollution_count,
     }
+    if call_context.truncated():
+        ledger["truncated"] = True
+    return ledger
 
 
 def summarize_for_yaml(ledger: dict[str, Any]) -> dict[str, Any]:
@@ -349,7 +368,10 @@ def summarize_for_yaml(ledger: dict[str, Any]) -> dict[str, Any]:
 def write_activity_ledger(vault: str | Path, ledger: dict[str, Any] | None = None) -> Path:
     vault_p = _common.resolve_vault_path(vault)
     ledger = ledger or build_activity_ledger(vault_p)
-    payload = summarize_for_yaml(ledger)
     target = vault_p / "_system" / "activity-ledger.yaml"
+    if ledger.get("truncated"):
+        # A partial scan would under-report counts; keep the previous capsule.
+        return target
+    payload = summarize_for_yaml(ledger)
     _common.write_note_text(target, _common.serialize_frontmatter(payload), backup=False)
     return target
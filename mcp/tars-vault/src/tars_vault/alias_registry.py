@@ -23,6 +23,13 @@ Format we recognize (lifted from the file's own examples):
   | DP           | [[Data Platform]] |
 
 Pure stdlib. Comment-only example rows (HTML comments) are ignored.
+
+``load_index`` merges the registry with the ``aliases:`` frontmatter of every
+vault note (collected by ``entity_index``) into one ``AliasIndex``: a dict
+keyed by normalized alias, with per-kind and context-override sub-indexes,
+so a lookup is a dict get. Registry rows win: a frontmatter alias whose note
+the registry already names for that alias adds nothing. Aliases left pointing
+at more than one note are reported as ``conflicts``.
 """
 from __future__ import annotations
 
@@ -46,6 +53,8 @@ class AliasEntry:
     canonical: str  # basename without .md
     kind: str = ""  # "ambiguous" | "team" | "product" | ""
     contexts: list[tuple[str, str]] = field(default_factory=list)  # [(context_keyword, canonical), ...]
+    source: str = "alias-registry"  # "alias-registry" | "frontmatter"
+    path: str | None = None  # vault-relative note, for frontmatter entries
 
 
 _WIKILINK_INNER = re.compile(r"\[\[([^\[\]\n|]+)(?:\|[^\]]*)?\]\]")
@@ -204,24 +213,127 @@ def load_entries(vault: Path) -> list[AliasEntry]:
     return entries
 
 
+# ---------------------------------------------------------------------------
+# Unified index (registry + note frontmatter).
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class AliasIndex:
+    entries: dict[str, list[AliasEntry]] = field(default_factory=dict)
+    # kind → alias → entries of that kind or with no kind (what a hint admits)
+    by_kind: dict[str, dict[str, list[AliasEntry]]] = field(default_factory=dict)
+    kindless: dict[str, list[AliasEntry]] = field(default_factory=dict)
+    # alias → [(context_keyword, canonical, entry), ...]
+    overrides: dict[str, list[tuple[str, str, AliasEntry]]] = field(default_factory=dict)
+    conflicts: list[dict] = field(default_factory=list)
+
+
+def _canonical_key(canonical: str) -> str:
+    return normalize_text(canonical).lower()
+
+
+def build_index(
+    registry: list[AliasEntry], frontmatter: list[tuple[str, tuple[str, ...]]], kinds: dict[str, str] | None = None
+) -> AliasIndex:
+    """Index registry entries plus ``(path, aliases)`` frontmatter pairs.
+
+    ``kinds`` maps a note path to its entity kind (unlisted paths get none).
+    """
+    index = AliasIndex()
+    covered: set[tuple[str, str]] = set()  # (alias, canonical key) the registry answers
+    for entry in registry:
+        key = (entry.alias, _canonical_key(entry.canonical))
+        if key in covered:
+            continue
+        covered.add(key)
+        covered.update((entry.alias, _canonical_key(c)) for _, c in entry.contexts)
+        index.entries.setdefault(entry.alias, []).append(entry)
+        for keyword, canonical in entry.contexts:
+            index.overrides.setdefault(entry.alias, []).append((keyword, canonical, entry))
+
+    notes: dict[str, dict[str, list[str]]] = {}  # alias → canonical key → paths
+    for rel, aliases in frontmatter:
+        canonical = Path(rel).stem
+        for raw in aliases:
+            alias = normalize_text(raw).lower()
+            if not alias:
+                continue
+            paths = notes.setdefault(alias, {}).setdefault(_canonical_key(canonical), [])
+            paths.append(rel)
+            key = (alias, _canonical_key(canonical))
+            if key in covered:
+                continue
+            covered.add(key)
+            kind = (kinds or {}).get(rel, "")
+            index.entries.setdefault(alias, []).append(
+                AliasEntry(alias=alias, canonical=canonical, kind=kind, source="frontmatter", path=rel)
+            )
+
+    kinds_seen = {e.kind for entries in index.entries.values() for e in entries if e.kind}
+    for alias, entries in index.entries.items():
+        kindless = [e for e in entries if not e.kind]
+        if kindless:
+            index.kindless[alias] = kindless
+        for kind in kinds_seen:
+            matching = [e for e in entries if e.kind in (kind, "")]
+            if matching:
+                index.by_kind.setdefault(kind, {})[alias] = matching
+
+        # Registry rows (defaults and context overrides) are deliberate; a
+        # frontmatter alias that adds another note to them is a conflict.
+        if all(e.source == "alias-registry" for e in entries):
+            continue
+        canonicals = sorted({e.canonical for e in entries}, key=str.lower)
+        if len(canonicals) > 1:
+            index.conflicts.append({
+                "alias": alias,
+                "canonicals": canonicals,
+                "paths": sorted(p for paths in notes.get(alias, {}).values() for p in paths),
+            })
+    return index
+
+
+_INDEX_CACHE: dict[Path, tuple[tuple, AliasIndex]] = {}
+
+
+def load_index(vault: Path) -> AliasIndex:
+    """Registry + frontmatter alias index, rebuilt when either source changes."""
+    from . import entity_index  # entity_index imports this module
+
+    vault = Path(vault)
+    notes = entity_index.get_index(vault)
+    path = registry_path(vault)
+    stamp = (path.stat().st_mtime if path.is_file() else None, id(notes), notes.generation)
+    cached = _INDEX_CACHE.get(vault)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    pairs = notes.frontmatter_aliases()
+    kinds = {rel: entity_index.entity_kind(rel) or "" for rel, _ in pairs}
+    index = build_index(load_entries(vault), pairs, kinds)
+    _INDEX_CACHE[vault] = (stamp, index)
+    return index
+
+
 def lookup(vault: Path, alias: str, kind_hint: str | None = None) -> list[AliasEntry]:
-    """Return matching registry entries for ``alias``.
+    """Return matching alias entries for ``alias``, registry rows first.
 
-    Lookup is case-insensitive on the alias key. ``kind_hint`` (e.g.
-    ``"product"``) restricts to entries declared with that kind. Returns an
-    empty list when no match is found.
+    Lookup is case-insensitive on the alias key and covers both the registry
+    and note ``aliases:`` frontmatter. ``kind_hint`` (e.g. ``"product"``)
+    restricts to entries declared with that kind or with no kind. Returns
+    an empty list when no match is found.
     """
+    return index_lookup(load_index(vault), alias, kind_hint)
+
+
+def index_lookup(index: AliasIndex, alias: str, kind_hint: str | None = None) -> list[AliasEntry]:
+    """``lookup`` against an already-loaded index (for batch callers)."""
     needle = normalize_text(alias).lower()
     if not needle:
         return []
-    matches: list[AliasEntry] = []
-    for entry in load_entries(vault):
-        if entry.alias != needle:
-            continue
-        if kind_hint and entry.kind and entry.kind != kind_hint:
-            continue
-        matches.append(entry)
-    return matches
+    if kind_hint:
+        return list(index.by_kind.get(kind_hint, index.kindless).get(needle, []))
+    return list(index.entries.get(needle, []))
 
 
 def all_canonicals(vault: Path) -> set[str]:
@@ -0,0 +1,147 @@
+"""Per-call deadline, cancellation, and progress state for long-running tools.
+
+`_execute_call` activates a `CallContext` around every dispatch. Vault
+iterators call `checkpoint()` between files; once the caller's deadline
+passes or the client cancels the request, `checkpoint()` returns False and
+marks the call truncated so the loop can stop and return what it has. The
+server then adds `truncated: true` to the tool result.
+
+The same iterators `tick()` a shared `ProgressReporter`. When the client
+asked for progress (an MCP `progressToken`), the transport attaches a sink
+and throttled `notifications/progress` messages flow while the sweep runs.
+
+Outside a server call (scripts, tests, hooks) no context is active:
+`checkpoint()` always returns True and `tick()` is a no-op, so helpers
+behave exactly as before.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+PROGRESS_INTERVAL_SECONDS = 0.25
+
+ProgressSink = Callable[[int, "int | None", "str | None"], None]
+
+
+class ProgressReporter:
+    """Monotonic work counter with a throttled notification sink.
+
+    ``done`` only ever increases (MCP requires increasing progress values);
+    ``expect(n)`` announces that ``n`` more units follow so clients can render
+    a bounded bar once the total is known.
+    """
+
+    def __init__(self, sink: ProgressSink | None = None) -> None:
+        self.sink = sink
+        self.done = 0
+        self.total: int | None = None
+        self._sent_at = 0.0
+
+    def expect(self, remaining: int) -> None:
+        self.total = self.done + max(int(remaining), 0)
+
+    def tick(self, n: int = 1, message: str | None = None) -> None:
+        self.done += n
+        if self.sink is None or n <= 0:
+            return
+        now = time.monotonic()
+        if now - self._sent_at < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._sent_at = now
+        total = self.total if self.total is not None and self.total >= self.done else None
+        try:
+            self.sink(self.done, total, message)
+        except Exception:
+            # A closed pipe must never fail the tool call itself.
+            self.sink = None
+
+
+class CallContext:
+    def __init__(self, deadline_ms: float | None = None, progress: ProgressSink | None = None) -> None:
+        self.deadline: float | None = None
+        self.truncated = False
+        self.reason: str | None = None
+        self.progress = ProgressReporter(progress)
+        self._cancelled = threading.Event()
+        if deadline_ms is not None:
+            self.set_deadline(deadline_ms)
+
+    def set_deadline(self, deadline_ms: float) -> None:
+        self.deadline = time.monotonic() + max(float(deadline_ms), 0.0) / 1000.0
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self, default: float | None = None) -> float | None:
+        """Seconds left before the deadline (``default`` when unbounded)."""
+        if self.deadline is None:
+            return default
+        left = max(self.deadline - time.monotonic(), 0.0)
+        return left if default is None else min(left, default)
+
+    def checkpoint(self) -> bool:
+        """Return False (and mark truncated) once the budget is exhausted."""
+        if self._cancelled.is_set():
+            self.reason = "cancelled"
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.reason = "deadline"
+        else:
+            return True
+        self.truncated = True
+        return False
+
+    def mark_truncated(self, reason: str) -> None:
+        """Record a stop the caller detected itself (e.g. a subprocess timeout)."""
+        self.truncated = True
+        self.reason = self.reason or reason
+
+
+_CURRENT: ContextVar[CallContext | None] = ContextVar("tars_call_context", default=None)
+
+
+def current() -> CallContext | None:
+    return _CURRENT.get()
+
+
+@contextmanager
+def activate(ctx: CallContext) -> Iterator[CallContext]:
+    token = _CURRENT.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _CURRENT.reset(token)
+
+
+def checkpoint() -> bool:
+    ctx = _CURRENT.get()
+    return True if ctx is None else ctx.checkpoint()
+
+
+def remaining(default: float | None = None) -> float | None:
+    ctx = _CURRENT.get()
+    return default if ctx is None else ctx.remaining(default)
+
+
+def truncated() -> bool:
+    ctx = _CURRENT.get()
+    return bool(ctx and ctx.truncated)
+
+
+def tick(n: int = 1, message: str | None = None) -> None:
+    ctx = _CURRENT.get()
+    if ctx is not None:
+        ctx.progress.tick(n, message)
+
+
+def expect(remaining: int) -> None:
+    ctx = _CURRENT.get()
+    if ctx is not None:
+        ctx.progress.expect(remaining)
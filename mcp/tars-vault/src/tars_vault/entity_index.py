@@ -0,0 +1,372 @@
+"""In-memory index of entity notes for name autocomplete.
+
+Entity notes live in the ``wikilink`` entity folders (``memory/people``,
+``memory/vendors``, ...). For each one the index keeps its basename,
+``tars-name``, frontmatter ``aliases``, note date, and link in-degree (the
+number of vault notes whose body links ``[[<basename>...]]``). Alias-registry
+rows are merged in as extra names; a registry canonical with no note becomes
+a name-only entry. The ``aliases`` frontmatter of every other note is kept
+too, for ``alias_registry.load_index``.
+
+Names are stored as a sorted list of normalized keys, one per name plus one
+per later word of it ("dan rivera", "rivera"), so a prefix lookup is a
+``bisect`` and a scan over the matching run.
+
+Freshness, cheapest check first:
+  - each lookup stats the entity directories and the alias registry, so
+    creating, deleting, or renaming an entity note is seen immediately;
+  - ``invalidate(vault, paths)`` (the server calls it after every write tool
+    with the notes the tool reports) re-checks just those files;
+  - ``invalidate(vault)`` without paths (a write whose files are unknown) and
+    a ``FULL_RESCAN_SECONDS`` timer trigger a stat sweep of the whole vault;
+  - a sweep re-reads only files whose (mtime, size) changed.
+
+Pure stdlib.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterable
+
+from . import _common, alias_registry
+from .activity_ledger import note_date
+from .sanitize import normalize_text
+
+
+FULL_RESCAN_SECONDS = 60.0
+SKIP_DIR_NAMES = {".git", ".obsidian", ".claude", "embedding-cache"}
+
+# Canonical homes for entity notes per CLAUDE.md, with the kind each holds.
+ENTITY_FOLDERS: dict[str, str] = {
+    "memory/people": "person",
+    "memory/vendors": "vendor",
+    "memory/competitors": "competitor",
+    "memory/products": "product",
+    "memory/initiatives": "initiative",
+    "memory/decisions": "decision",
+    "memory/org-context": "org-context",
+}
+
+_LINK_RE = re.compile(r"\[\[([^\[\]\n|#^]+)")
+
+
+def name_key(text: str) -> str:
+    """Normalized lookup key for a name (NFC, quotes folded, lowercased)."""
+    return normalize_text(text).lower()
+
+
+def entity_kind(relative_path: str) -> str | None:
+    for folder, kind in ENTITY_FOLDERS.items():
+        if relative_path.startswith(folder + "/"):
+            return kind
+    return None
+
+
+@dataclass
+class Entity:
+    basename: str
+    path: str | None  # vault-relative; None for a registry-only name
+    kind: str
+    names: list[tuple[str, str]]  # (name, source): basename | tars-name | alias | alias-registry
+    date: str | None = None
+    inbound: int = 0
+
+
+@dataclass
+class _FileInfo:
+    stamp: tuple[int, int]
+    links: frozenset[str]
+    names: list[tuple[str, str]] | None = None  # entity notes only
+    date: str | None = None
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass
+class _Keys:
+    keys: list[str] = field(default_factory=list)
+    refs: list[tuple[int, int, bool]] = field(default_factory=list)  # (entity, name, inner word)
+
+
+def parse_aliases(fm: dict) -> tuple[str, ...]:
+    """A note's ``aliases:`` frontmatter as a tuple of non-empty strings."""
+    aliases = fm.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    if not isinstance(aliases, list):
+        return ()
+    return tuple(str(a).strip() for a in aliases if str(a).strip())
+
+
+def _frontmatter_names(stem: str, fm: dict) -> list[tuple[str, str]]:
+    names = [(stem, "basename")]
+    tars_name = fm.get("tars-name")
+    if isinstance(tars_name, str) and tars_name.strip():
+        names.append((tars_name.strip(), "tars-name"))
+    names.extend((alias, "alias") for alias in parse_aliases(fm))
+    return names
+
+
+class EntityIndex:
+    def __init__(self, vault: Path) -> None:
+        self.vault = vault
+        self._lock = threading.Lock()
+        self._files: dict[str, _FileInfo] = {}
+        self._dirs: list[Path] = [vault / folder for folder in ENTITY_FOLDERS]
+        self._dir_stamp: tuple = ()
+        self._registry_stamp: tuple | None = None
+        self._swept_at = 0.0
+        self._stale = True
+        self._pending: set[str] = set()  # vault-relative paths to re-check
+        self._pending_lock = threading.Lock()
+        self.generation = 0  # bumped on every rebuild; keys derived caches
+        self._view: tuple[list[Entity], _Keys] = ([], _Keys())  # swapped whole on rebuild
+        self._aliases: list[tuple[str, tuple[str, ...]]] = []
+
+    @property
+    def entities(self) -> list[Entity]:
+        return self._view[0]
+
+    # -- freshness --------------------------------------------------------
+
+    def invalidate(self, paths: Iterable[str] | None = None) -> None:
+        """Re-check ``paths`` (vault-relative) on the next lookup; all files if None."""
+        if paths is None:
+            self._stale = True
+            return
+        with self._pending_lock:
+            self._pending.update(str(p).replace(os.sep, "/") for p in paths)
+
+    def refresh(self) -> None:
+        with self._lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, set()
+            full = self._stale or time.monotonic() - self._swept_at > FULL_RESCAN_SECONDS
+            changed = False
+            if full:
+                changed = self._sweep([self.vault])
+            elif pending:
+                changed = self._recheck(pending)
+            if not full and _stamps(self._dirs) != self._dir_stamp:
+                changed = self._sweep([self.vault / folder for folder in ENTITY_FOLDERS]) or changed
+            registry_stamp = _stamps([alias_registry.registry_path(self.vault)])
+            if changed or registry_stamp != self._registry_stamp:
+                self._registry_stamp = registry_stamp
+                self._rebuild()
+
+    def _sweep(self, roots: list[Path]) -> bool:
+        """Re-stat ``roots``; re-read changed files. True if anything changed."""
+        changed = False
+        seen: set[str] = set()
+        dirs = [self.vault / folder for folder in ENTITY_FOLDERS]
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [
+                    d for d in dirnames
+                    if d not in SKIP_DIR_NAMES and not (dirpath == str(self.vault) and d == "_system")
+                ]
+                rel_dir = os.path.relpath(dirpath, self.vault).replace(os.sep, "/")
+                is_entity_dir = entity_kind(rel_dir + "/") is not None
+                if is_entity_dir and Path(dirpath) not in dirs:
+                    dirs.append(Path(dirpath))
+                for name in filenames:
+                    if not name.endswith(".md"):
+                        continue
+                    rel = name if rel_dir == "." else f"{rel_dir}/{name}"
+                    seen.add(rel)
+                    try:
+                        st = os.stat(os.path.join(dirpath, name))
+                    except OSError:
+                        continue
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    known = self._files.get(rel)
+                    if known is not None and known.stamp == stamp:
+                        continue
+                    self._files[rel] = self._read(rel, stamp, is_entity_dir)
+                    changed = True
+        full = self.vault in roots  # otherwise only the entity folders were walked
+        for rel in list(self._files):
+            if rel not in seen and (full or entity_kind(rel) is not None):
+                del self._files[rel]
+                changed = True
+        self._dirs = dirs
+        self._dir_stamp = _stamps(dirs)
+        if full:
+            self._swept_at = time.monotonic()
+            self._stale = False
+        return changed
+
+    def _recheck(self, rels: set[str]) -> bool:
+        """Re-stat single notes; re-read the changed ones. True if anything changed."""
+        changed = False
+        for rel in rels:
+            parts = rel.split("/")
+            if not rel.endswith(".md") or parts[0] == "_system" or SKIP_DIR_NAMES.intersection(parts[:-1]):
+                continue
+            try:
+                st = os.stat(self.vault / rel)
+            except OSError:
+                changed = self._files.pop(rel, None) is not None or changed
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            known = self._files.get(rel)
+            if known is None or known.stamp != stamp:
+                info = self._files[rel] = self._read(rel, stamp, entity_kind(rel) is not None)
+                # An edit that leaves links and names alone needs no rebuild.
+                changed = changed or known is None or replace(known, stamp=stamp) != info
+        return changed
+
+    def _read(self, rel: str, stamp: tuple[int, int], is_entity: bool) -> _FileInfo:
+        path = self.vault / rel
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return _FileInfo(stamp, frozenset(), [(path.stem, "basename")] if is_entity else None)
+        links = frozenset(name_key(m.group(1).rsplit("/", 1)[-1]) for m in _LINK_RE.finditer(text))
+        if not is_entity:
+            if not text.startswith("---"):
+                return _FileInfo(stamp, links)
+            fm = _common.split_frontmatter(text)[0] or {}
+            return _FileInfo(stamp, links, aliases=parse_aliases(fm))
+        fm = _common.split_frontmatter(text)[0] or {}
+        day = note_date(path, fm)
+        return _FileInfo(
+            stamp, links, _frontmatter_names(path.stem, fm), day.isoformat() if day else None,
+            parse_aliases(fm),
+        )
+
+    def _rebuild(self) -> None:
+        entities: list[Entity] = []
+        by_basename: dict[str, list[Entity]] = {}
+        for rel in sorted(self._files):
+            info = self._files[rel]
+            if info.names is None:
+                continue
+            entity = Entity(
+                basename=Path(rel).stem, path=rel, kind=entity_kind(rel) or "",
+                names=list(info.names), date=info.date,
+            )
+            entities.append(entity)
+            by_basename.setdefault(name_key(entity.basename), []).append(entity)
+
+        for entry in alias_registry.load_entries(self.vault):
+            targets = by_basename.get(name_key(entry.canonical))
+            if not targets:
+                target = Entity(basename=entry.canonical, path=None, kind=entry.kind,
+                                names=[(entry.canonical, "alias-registry")])
+                entities.append(target)
+                targets = by_basename[name_key(entry.canonical)] = [target]
+            for target in targets:
+                target.names.append((entry.alias, "alias-registry"))
+
+        inbound: Counter = Counter()
+        for rel, info in self._files.items():
+            own = name_key(Path(rel).stem) if info.names is not None else None
+            inbound.update(link for link in info.links if link != own)
+        for entity in entities:
+            entity.inbound = inbound.get(name_key(entity.basename), 0)
+
+        pairs: list[tuple[str, int, int, bool]] = []
+        for ei, entity in enumerate(entities):
+            for ni, (name, _source) in enumerate(entity.names):
+                words = name_key(name).split()
+                for wi in range(len(words)):
+                    pairs.append((" ".join(words[wi:]), ei, ni, wi > 0))
+        pairs.sort()
+        self._view = (entities, _Keys([p[0] for p in pairs], [p[1:] for p in pairs]))
+        self._aliases = [(rel, info.aliases) for rel, info in sorted(self._files.items()) if info.aliases]
+        self.generation += 1
+
+    def frontmatter_aliases(self) -> list[tuple[str, tuple[str, ...]]]:
+        """``(path, aliases)`` for every note declaring ``aliases:``."""
+        return self._aliases
+
+    # -- lookup -----------------------------------------------------------
+
+    def suggest(self, prefix: str, *, kind: str | None = None, limit: int = 10) -> list[dict]:
+        """Entities with a name (or a later word of one) starting with ``prefix``.
+
+        Order: exact name, then names whose first word(s) the prefix
+        completes, then other name prefixes, then later-word prefixes; ties
+        go to more inbound links, then the more recent note date.
+        """
+        needle = name_key(prefix)
+        if not needle:
+            return []
+        entities, keys = self._view
+        best: dict[int, tuple[int, int]] = {}
+        i = bisect_left(keys.keys, needle)
+        while i < len(keys.keys) and keys.keys[i].startswith(needle):
+            ei, ni, inner = keys.refs[i]
+            i += 1
+            if kind and entities[ei].kind != kind:
+                continue
+            key = keys.keys[i - 1]
+            if inner:
+                rank = 3
+            elif key == needle:
+                rank = 0
+            else:
+                rank = 1 if key[len(needle)] == " " else 2
+            if ei not in best or (rank, ni) < best[ei]:
+                best[ei] = (rank, ni)
+        ordered = sorted(best, key=lambda ei: entities[ei].basename.lower())
+        ordered.sort(key=lambda ei: entities[ei].date or "", reverse=True)
+        ordered.sort(key=lambda ei: (best[ei][0], -entities[ei].inbound))
+        out = []
+        for ei in ordered[:limit]:
+            entity = entities[ei]
+            matched, source = entity.names[best[ei][1]]
+            out.append({
+                "basename": entity.basename,
+                "wikilink": f"[[{entity.basename}]]",
+                "path": entity.path,
+                "kind": entity.kind,
+                "matched": matched,
+                "match_source": source,
+                "inbound_links": entity.inbound,
+                "date": entity.date,
+            })
+        return out
+
+
+def _stamps(paths: list[Path]) -> tuple:
+    out = []
+    for path in paths:
+        try:
+            out.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+_INDEXES: dict[str, EntityIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(vault: Path) -> EntityIndex:
+    """The refreshed index for ``vault`` (built on first use)."""
+    key = str(vault)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = EntityIndex(Path(vault))
+    index.refresh()
+    return index
+
+
+def invalidate(vault: Path, paths: Iterable[str] | None = None) -> None:
+    """Re-check ``paths`` in ``vault``'s index on its next lookup.
+
+    Without ``paths`` the next lookup runs a stat sweep of the whole vault.
+    """
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(str(vault))
+    if index is not None:
+        index.invalidate(paths)
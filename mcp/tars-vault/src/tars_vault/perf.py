@@ -0,0 +1,214 @@
+"""Per-tool latency histograms for the tars-vault server.
+
+Every tool call is recorded here: wall time, request and response payload
+sizes, and the error class (if any). The stdio transports count the bytes
+they send and receive; in-process calls through `_call_handler_sync` fall
+back to a compact JSON encoding. Latencies land in a
+log-linear (HDR-style) histogram so p50/p95/p99 stay accurate to ~6% at any
+scale without keeping every sample.
+
+Two views are kept per tool:
+
+  - cumulative, since server start — surfaced by ``runtime_info(perf=true)``
+  - a flush window — written to ``_system/telemetry/perf-YYYY-MM-DD.jsonl``
+    at most once per ``FLUSH_INTERVAL_SECONDS`` and then reset
+
+Stdlib-only and thread-safe (the SDK transport runs handlers in a worker
+thread).
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+FLUSH_INTERVAL_SECONDS = 60.0
+SLOWEST_KEEP = 10
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < 2 * SUB_BUCKETS:
+        return max(value_us, 0)
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (value_us >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    top = index - shift * SUB_BUCKETS
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram over microsecond latencies."""
+
+    __slots__ = ("counts", "count", "sum_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def record(self, value_us: int) -> None:
+        idx = _bucket_index(value_us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.sum_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, pct: float) -> int:
+        """Highest equivalent value at ``pct`` (capped at the observed max)."""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(_bucket_upper(idx), self.max_us)
+        return self.max_us
+
+
+class _ToolStats:
+    __slots__ = ("latency", "bytes_in", "bytes_out", "errors")
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.errors: dict[str, int] = {}
+
+    def record(self, elapsed_us: int, bytes_in: int, bytes_out: int, error_class: str | None) -> None:
+        self.latency.record(elapsed_us)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        if error_class:
+            self.errors[error_class] = self.errors.get(error_class, 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        h = self.latency
+        return {
+            "calls": h.count,
+            "p50_ms": round(h.percentile(50) / 1000, 3),
+            "p95_ms": round(h.percentile(95) / 1000, 3),
+            "p99_ms": round(h.percentile(99) / 1000, 3),
+            "max_ms": round(h.max_us / 1000, 3),
+            "mean_ms": round(h.sum_us / h.count / 1000, 3) if h.count else 0.0,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "errors": dict(self.errors),
+        }
+
+
+class PerfRecorder:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._cumulative: dict[str, _ToolStats] = {}
+        self._window: dict[str, _ToolStats] = {}
+        self._window_started = time.monotonic()
+        self._slowest: list[tuple[int, int, dict[str, Any]]] = []
+        self._seq = 0
+        self._vault: Path | None = None
+
+    def record(
+        self,
+        tool: str,
+        elapsed_us: int,
+        *,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        error_class: str | None = None,
+        vault: Path | None = None,
+    ) -> None:
+        due: dict[str, Any] | None = None
+        with self._lock:
+            for table in (self._cumulative, self._window):
+                stats = table.get(tool)
+                if stats is None:
+                    stats = table[tool] = _ToolStats()
+                stats.record(elapsed_us, bytes_in, bytes_out, error_class)
+            self._seq += 1
+            if vault is not None:
+                self._vault = vault
+            entry = {
+                "tool": tool,
+                "ms": round(elapsed_us / 1000, 3),
+                "at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "bytes_out": bytes_out,
+                "error": error_class,
+            }
+            item = (elapsed_us, self._seq, entry)
+            if len(self._slowest) < SLOWEST_KEEP:
+                heapq.heappush(self._slowest, item)
+            elif elapsed_us > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+            if vault is not None and time.monotonic() - self._window_started >= FLUSH_INTERVAL_SECONDS:
+                due = self._take_window()
+        if due is not None:
+            _write_window(vault, due)
+
+    def _take_window(self) -> dict[str, Any] | None:
+        now = time.monotonic()
+        window, self._window = self._window, {}
+        span = now - self._window_started
+        self._window_started = now
+        if not window:
+            return None
+        return {
+            "event": "tool_perf",
+            "window_s": round(span, 1),
+            "tools": {name: stats.summary() for name, stats in sorted(window.items())},
+        }
+
+    def flush(self, vault: Path | None = None) -> None:
+        """Write the pending window now (server shutdown, tests).
+
+        Defaults to the workspace of the most recent call.
+        """
+        with self._lock:
+            vault = vault or self._vault
+            due = self._take_window() if vault is not None else None
+        if due is not None:
+            _write_window(vault, due)
+
+    def report(self, slowest: int = SLOWEST_KEEP) -> dict[str, Any]:
+        with self._lock:
+            tools = {name: stats.summary() for name, stats in sorted(self._cumulative.items())}
+            worst = [entry for _, _, entry in heapq.nlargest(slowest, self._slowest)]
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self._started)),
+            "calls": sum(t["calls"] for t in tools.values()),
+            "tools": tools,
+            "slowest": worst,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started = time.time()
+            self._cumulative = {}
+            self._window = {}
+            self._window_started = time.monotonic()
+            self._slowest = []
+            self._vault = None
+
+
+def _write_window(vault: Path, record: dict[str, Any]) -> None:
+    try:
+        from .telemetry import append_event
+
+        append_event(vault, record, stream="perf")
+    except Exception:
+        pass
+
+
+RECORDER = PerfRecorder()
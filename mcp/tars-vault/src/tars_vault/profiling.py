@@ -0,0 +1,170 @@
+"""On-demand cProfile / tracemalloc capture for single tool calls.
+
+Enabled per call with the ``profile`` argument every tool accepts, or for
+every call with ``TARS_PROFILE``. Modes:
+
+  - ``cpu`` (also ``true`` / ``1``) — cProfile around the handler
+  - ``memory`` — tracemalloc around the handler, top allocation sites
+  - ``all`` — both
+
+Each capture writes ``_system/profiles/<stamp>-<tool>.pstats`` (cpu modes;
+open with ``python -m pstats``) and a plain-text ``.txt`` report, keeps the
+newest ``RETENTION`` captures, and the server returns the vault-relative
+paths in the result's ``profile`` field.
+
+Only one capture runs at a time — cProfile and tracemalloc are process-wide
+— so a concurrent request is served unprofiled with ``profile.skipped`` set.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+PROFILE_DIR = "_system/profiles"
+RETENTION = 20
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+MODES = ("cpu", "memory", "all")
+
+_lock = threading.Lock()
+
+
+def requested_mode(value: Any) -> str | None:
+    """Normalize a ``profile`` argument, falling back to ``TARS_PROFILE``.
+
+    Raises ValueError for an unrecognized argument; an unrecognized
+    environment value just leaves profiling off.
+    """
+    from_env = value is None
+    if from_env:
+        value = os.environ.get("TARS_PROFILE")
+    if value is None or value is False:
+        return None
+    text = str(value).strip().lower()
+    if text in {"", "0", "false", "no", "off"}:
+        return None
+    if text in {"1", "true", "yes", "on"}:
+        return "cpu"
+    if text in MODES:
+        return text
+    if from_env:
+        return None
+    raise ValueError("profile must be true, false, cpu, memory, or all")
+
+
+class Capture:
+    """Result of one profiled call; ``summary()`` is what the caller sees."""
+
+    def __init__(self, vault: Path, tool: str, mode: str) -> None:
+        self.vault = vault
+        self.tool = tool
+        self.mode = mode
+        self.skipped: str | None = None
+        self.wall_ms = 0.0
+        self.peak_kb: int | None = None
+        self.paths: dict[str, str] = {}
+
+    def summary(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"mode": self.mode}
+        if self.skipped:
+            out["skipped"] = self.skipped
+            return out
+        out["wall_ms"] = round(self.wall_ms, 2)
+        if self.peak_kb is not None:
+            out["peak_kb"] = self.peak_kb
+        out.update(self.paths)
+        return out
+
+
+@contextmanager
+def capture(vault: Path | None, tool: str, mode: str | None) -> Iterator[Capture | None]:
+    """Profile the enclosed block; yields None when profiling is off."""
+    if mode is None or vault is None:
+        yield None
+        return
+    result = Capture(Path(vault), tool, mode)
+    if not _lock.acquire(blocking=False):
+        result.skipped = "another profile capture is running"
+        yield result
+        return
+    profiler = cProfile.Profile() if mode in {"cpu", "all"} else None
+    trace_memory = mode in {"memory", "all"} and not tracemalloc.is_tracing()
+    try:
+        if trace_memory:
+            tracemalloc.start(10)
+        started = time.perf_counter()
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler (coverage, debugger) owns the hook
+                profiler = None
+                if not trace_memory:
+                    result.skipped = "cpu profiler unavailable in this process"
+        try:
+            yield result
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            result.wall_ms = (time.perf_counter() - started) * 1000
+            snapshot = None
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                result.peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+            if not result.skipped:
+                try:
+                    _write_reports(result, profiler, snapshot)
+                except OSError as exc:
+                    result.skipped = f"could not write profile: {exc}"
+    finally:
+        _lock.release()
+
+
+def _write_reports(result: Capture, profiler: cProfile.Profile | None, snapshot: Any) -> None:
+    out_dir = result.vault / PROFILE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    stem = f"{stamp}-{result.tool}"
+    lines = [
+        f"tool: {result.tool}",
+        f"mode: {result.mode}",
+        f"wall_ms: {result.wall_ms:.2f}",
+    ]
+    if profiler is not None:
+        pstats_path = out_dir / f"{stem}.pstats"
+        profiler.dump_stats(str(pstats_path))
+        result.paths["pstats"] = f"{PROFILE_DIR}/{pstats_path.name}"
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        lines += ["", "## cProfile (cumulative)", buf.getvalue().strip()]
+    if snapshot is not None:
+        lines += ["", f"## tracemalloc (peak {result.peak_kb} KB, top {TOP_ALLOCATIONS} sites)"]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            lines.append(f"{stat.size / 1024:10.1f} KB  {stat.count:7d} blocks  {stat.traceback}")
+    report_path = out_dir / f"{stem}.txt"
+    report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    result.paths["report"] = f"{PROFILE_DIR}/{report_path.name}"
+    _prune(out_dir)
+
+
+def _prune(out_dir: Path, keep: int = RETENTION) -> None:
+    """Keep the newest ``keep`` captures (a capture is every file sharing a stem)."""
+    stems: dict[str, list[Path]] = {}
+    for path in out_dir.iterdir():
+        if path.suffix in {".pstats", ".txt"}:
+            stems.setdefault(path.stem, []).append(path)
+    for stem in sorted(stems, reverse=True)[keep:]:
+        for path in stems[stem]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -5,10 +5,32 @@ Phase 4 implementation — PRD §6.
 Layout (one file, three virtual tables):
 - ``fts_notes``  — FTS5 over Tier A + Tier B (title, tags, body).
 - ``chunks``     — normal table, one row per Tier B chunk.
-- ``vec_chunks`` — sqlite-vec virtual table, embedding per chunk. rowid matches
-                   ``chunks.id`` one-to-one.
+- ``vec_chunks_<model>`` — sqlite-vec virtual table per embedding space
+                   (one per model), embedding per chunk. rowid matches
+                   ``chunks.id`` one-to-one. ``source_type`` and ``date``
+                   are vec0 metadata columns so KNN filters run inside the
+                   scan. Indexes from before spaces keep their single
+                   ``vec_chunks`` table as the first space.
+- ``<space table>_q`` — optional quantized copy (``int8[N]`` or ``bit[N]``)
+                   of the active space used for a cheap first-pass KNN;
+                   candidates are rescored against the float32 rows. Mode
+                   lives in ``meta.vec_quantization``.
 - ``meta``       — key/value schema + model bookkeeping.
 
+``meta.vec_spaces`` maps model name to ``{table, dim, status}``; exactly one
+space is ``active`` (builds write to it, queries read it and must embed with
+its model). Switching models adds a ``building`` space that the builder
+fills from ``chunks.text`` while the active one keeps serving, then
+``cutover`` flips the statuses in one transaction; the old space is
+``retired`` and its tables are dropped on the next build.
+
+Sharded layout (optional, ``build-search-index.py --layout sharded``):
+Tier B notes with a date go to ``_system/search/<source_type>-<year>.db``,
+each a complete index with the schema above; ``search.db`` keeps Tier A and
+undated notes. ``search_targets`` picks the DBs a query's scope and date
+range can touch and ``fan_out`` queries them in parallel. Past years stop
+changing, so their shards are left alone by maintenance.
+
 The module does two jobs:
 1. DB access (open / schema / upsert / search). No FastEmbed dependency here —
    the embedding call is injected by callers so tests can run stdlib-only.
@@ -23,7 +45,9 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import shutil
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Iterable, Sequence
@@ -31,10 +55,23 @@ from typing import Callable, Iterable, Sequence
 
 INDEX_DB_RELATIVE = "_system/search.db"
 INDEX_STATE_RELATIVE = "_system/search-index-state.json"
+SHARD_DIR_RELATIVE = "_system/search"
+MAIN_SHARD = ""  # shard name of search.db itself
+MAX_FANOUT = 8
 EMBED_DIM = 384  # bge-small-en-v1.5 / all-MiniLM-L6-v2 both 384-dim.
 CHUNK_WORDS = 300  # ~400 tokens at 1.33 token/word.
 CHUNK_OVERLAP_WORDS = 60  # ~80-token overlap.
 SCHEMA_VERSION = "0.2.0-phase4"
+QUANTIZATION_MODES = ("none", "int8", "binary")
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+CACHE_SIZE_KIB = 32 * 1024
+BUSY_TIMEOUT_MS = 5000
+RESCORE_FACTOR = 8  # quantized first pass over-fetches this many candidates per hit
+DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
+LEGACY_VEC_TABLE = "vec_chunks"
+_QUANT_TYPE = {"int8": "int8", "binary": "bit"}
+_QUANT_EXPR = {"int8": "vec_quantize_int8({}, 'unit')", "binary": "vec_quantize_binary({})"}
+_VEC_METADATA = "source_type text, date text"
 
 TIER_A_PREFIXES = ("memory/",)
 TIER_B_PREFIXES = ("journal/", "archive/transcripts/", "contexts/")
@@ -44,6 +81,7 @@ SOURCE_TYPE_BY_PREFIX = {
     "contexts/": "context",
     "memory/": "memory",
 }
+TIER_B_SOURCE_TYPES = frozenset(SOURCE_TYPE_BY_PREFIX[p] for p in TIER_B_PREFIXES)
 
 
 def index_path(vault: Path) -> Path:
@@ -54,6 +92,78 @@ def state_path(vault: Path) -> Path:
     return Path(vault) / INDEX_STATE_RELATIVE
 
 
+def shard_path(vault: Path, name: str) -> Path:
+    return Path(vault) / SHARD_DIR_RELATIVE / f"{name}.db"
+
+
+def shard_name(source_type: str, date: str | None) -> str:
+    """``<source_type>-<year>`` for a dated Tier B note, else ``MAIN_SHARD``."""
+    if source_type in TIER_B_SOURCE_TYPES and date and date[:4].isdigit():
+        return f"{source_type}-{date[:4]}"
+    return MAIN_SHARD
+
+
+def list_shards(vault: Path) -> dict[str, Path]:
+    """Shard DBs on disk; empty for the single-file layout."""
+    shard_dir = Path(vault) / SHARD_DIR_RELATIVE
+    if not shard_dir.is_dir():
+        return {}
+    return {path.stem: path for path in sorted(shard_dir.glob("*.db"))}
+
+
+def remove_shard(vault: Path, name: str) -> None:
+    """Delete one shard DB (with WAL sidecars)."""
+    db = shard_path(vault, name)
+    for path in (db, db.with_name(db.name + "-wal"), db.with_name(db.name + "-shm")):
+        path.unlink(missing_ok=True)
+
+
+def remove_index(vault: Path) -> None:
+    """Delete ``search.db`` (with WAL sidecars) and every shard."""
+    db = index_path(vault)
+    for path in (db, db.with_name(db.name + "-wal"), db.with_name(db.name + "-shm")):
+        path.unlink(missing_ok=True)
+    shutil.rmtree(Path(vault) / SHARD_DIR_RELATIVE, ignore_errors=True)
+
+
+def search_targets(
+    vault: Path,
+    *,
+    tier: str | None = None,
+    source_types: Iterable[str] | None = None,
+    date_start: str | None = None,
+    date_end: str | None = None,
+) -> list[Path]:
+    """``search.db`` plus the shards a query can match, by scope and year."""
+    targets = [index_path(vault)]
+    if tier == "A":
+        return targets
+    stypes = set(source_types or ())
+    for name, path in list_shards(vault).items():
+        stype, _, year = name.rpartition("-")
+        if stypes and stype not in stypes:
+            continue
+        if (date_start and year < date_start[:4]) or (date_end and year > date_end[:4]):
+            continue
+        targets.append(path)
+    return targets
+
+
+def fan_out(paths: Sequence[Path], fn: Callable, *, load_vec: bool = False) -> list:
+    """Run ``fn(conn, vec_ok)`` on a read-only connection per DB, in parallel."""
+    def one(path: Path):
+        conn, vec_ok = open_index(path, load_vec=load_vec, read_only=True)
+        try:
+            return fn(conn, vec_ok)
+        finally:
+            conn.close()
+
+    if len(paths) <= 1:
+        return [one(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(MAX_FANOUT, len(paths))) as pool:
+        return list(pool.map(one, paths))
+
+
 # ---------------------------------------------------------------------------
 # Tier + path helpers
 # ---------------------------------------------------------------------------
@@ -211,16 +321,34 @@ def load_sqlite_vec(conn: sqlite3.Connection) -> bool:
     return True
 
 
-def open_index(db_path: Path, *, load_vec: bool = True) -> tuple[sqlite3.Connection, bool]:
-    """Open (or create the parent dir of) the index DB. Returns (conn, vec_ok)."""
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
+def open_index(
+    db_path: Path, *, load_vec: bool = True, read_only: bool = False
+) -> tuple[sqlite3.Connection, bool]:
+    """Open (or create the parent dir of) the index DB. Returns (conn, vec_ok).
+
+    Writers switch the file to WAL with ``synchronous=NORMAL`` so query tools
+    keep reading the last committed state during a rebuild. ``read_only``
+    opens a ``mode=ro`` URI connection for the query tools; the database must
+    already exist.
+    """
+    if read_only:
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    else:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
     conn.row_factory = sqlite3.Row
     vec_ok = load_sqlite_vec(conn) if load_vec else False
     return conn, vec_ok
 
 
-def init_schema(conn: sqlite3.Connection, *, vec_enabled: bool) -> None:
+def init_schema(conn: sqlite3.Connection, *, vec_enabled: bool, quantization: str | None = None) -> None:
+    """Create tables. ``quantization`` None keeps the index's current mode."""
+    if quantization is not None and quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"quantization must be one of {QUANTIZATION_MODES}")
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS meta (
@@ -242,12 +370,20 @@ def init_schema(conn: sqlite3.Connection, *, vec_enabled: bool) -> None:
             UNIQUE(path, chunk_index)
         );
         CREATE INDEX IF NOT EXISTS idx_chunks_path ON chunks(path);
+        CREATE INDEX IF NOT EXISTS idx_chunks_type_date ON chunks(source_type, date);
         """
     )
     if vec_enabled:
+        drop_retired_spaces(conn)
+        if _table_exists(conn, LEGACY_VEC_TABLE) and not vec_has_metadata(conn):
+            _migrate_vec_metadata(conn)
+        current = index_quantization(conn)
+        if quantization is not None and quantization != current and active_space(conn):
+            _rebuild_quantized(conn, quantization)
+    if vec_enabled and quantization is not None:
         conn.execute(
-            f"CREATE VIRTUAL TABLE IF NOT EXISTS vec_chunks USING vec0("
-            f"embedding float[{EMBED_DIM}])"
+            "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+            ("vec_quantization", quantization),
         )
     conn.execute(
         "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
@@ -260,6 +396,255 @@ def init_schema(conn: sqlite3.Connection, *, vec_enabled: bool) -> None:
     conn.commit()
 
 
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, value))
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def vec_has_metadata(conn: sqlite3.Connection) -> bool:
+    """True when the vec tables carry ``source_type`` / ``date`` columns.
+
+    Only a pre-metadata ``vec_chunks`` lacks them; every space table is
+    created with the columns.
+    """
+    return get_meta(conn, "vec_metadata") == "1" or not _table_exists(conn, LEGACY_VEC_TABLE)
+
+
+# ---------------------------------------------------------------------------
+# Embedding spaces
+# ---------------------------------------------------------------------------
+
+def space_table(model: str) -> str:
+    return "vec_chunks_" + re.sub(r"[^a-z0-9]+", "_", model.lower()).strip("_")
+
+
+def vec_spaces(conn: sqlite3.Connection) -> dict[str, dict]:
+    """``{model: {"table", "dim", "status"}}``; synthesized for legacy indexes."""
+    raw = get_meta(conn, "vec_spaces")
+    if raw:
+        try:
+            spaces = json.loads(raw)
+        except json.JSONDecodeError:
+            spaces = None
+        if isinstance(spaces, dict):
+            return spaces
+    if _table_exists(conn, LEGACY_VEC_TABLE):
+        model = get_meta(conn, "embed_model") or DEFAULT_MODEL
+        return {model: {"table": LEGACY_VEC_TABLE, "dim": EMBED_DIM, "status": "active"}}
+    return {}
+
+
+def _save_spaces(conn: sqlite3.Connection, spaces: dict[str, dict]) -> None:
+    set_meta(conn, "vec_spaces", json.dumps(spaces, sort_keys=True))
+
+
+def _space_with_status(conn: sqlite3.Connection, status: str) -> dict | None:
+    for model, entry in vec_spaces(conn).items():
+        if entry.get("status") == status:
+            return {"model": model, **entry}
+    return None
+
+
+def active_space(conn: sqlite3.Connection) -> dict | None:
+    """The space queries must use: ``{"model", "table", "dim", "status"}``."""
+    return _space_with_status(conn, "active")
+
+
+def building_space(conn: sqlite3.Connection) -> dict | None:
+    return _space_with_status(conn, "building")
+
+
+def _create_space_table(conn: sqlite3.Connection, table: str, dim: int) -> None:
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING vec0(embedding float[{int(dim)}], {_VEC_METADATA})")
+
+
+def ensure_active_space(conn: sqlite3.Connection, model: str, dim: int) -> dict:
+    """Create the first space for ``model`` when the index has none.
+
+    On a quantized index the space's ``_q`` copy is created with it, since
+    ``init_schema`` records the mode before any space exists.
+    """
+    current = active_space(conn)
+    if current is not None:
+        return current
+    table = space_table(model)
+    _create_space_table(conn, table, dim)
+    spaces = vec_spaces(conn)
+    spaces[model] = {"table": table, "dim": int(dim), "status": "active"}
+    _save_spaces(conn, spaces)
+    mode = index_quantization(conn)
+    if mode != "none":
+        _rebuild_quantized(conn, mode)
+    conn.commit()
+    return {"model": model, **spaces[model]}
+
+
+def begin_migration(conn: sqlite3.Connection, model: str, dim: int) -> dict | None:
+    """Start (or resume) building a space for ``model``; None if already active.
+
+    Only one space builds at a time; a different in-progress target is
+    abandoned and its table dropped.
+    """
+    spaces = vec_spaces(conn)
+    entry = spaces.get(model)
+    if entry and entry.get("status") == "active":
+        return None
+    if entry and entry.get("status") == "building" and entry.get("dim") == int(dim):
+        return {"model": model, **entry}
+    for other, other_entry in list(spaces.items()):
+        if other_entry.get("status") == "building" and other != model:
+            conn.execute(f"DROP TABLE IF EXISTS {other_entry['table']}")
+            del spaces[other]
+    table = space_table(model)
+    conn.execute(f"DROP TABLE IF EXISTS {table}")
+    _create_space_table(conn, table, dim)
+    spaces[model] = {"table": table, "dim": int(dim), "status": "building"}
+    _save_spaces(conn, spaces)
+    conn.commit()
+    return {"model": model, **spaces[model]}
+
+
+def pending_space_ids(conn: sqlite3.Connection, table: str) -> list[int]:
+    """Chunk ids not yet embedded into ``table`` (new notes land here too)."""
+    done = {row[0] for row in conn.execute(f"SELECT rowid FROM {table}")}
+    return [row[0] for row in conn.execute("SELECT id FROM chunks ORDER BY id") if row[0] not in done]
+
+
+def chunk_rows(conn: sqlite3.Connection, ids: Sequence[int]) -> list[sqlite3.Row]:
+    marks = ",".join("?" * len(ids))
+    return conn.execute(f"SELECT id, text, source_type, date FROM chunks WHERE id IN ({marks}) ORDER BY id", list(ids)).fetchall()
+
+
+def insert_space_vectors(
+    conn: sqlite3.Connection, table: str, rows: Sequence[sqlite3.Row], embeddings: Sequence[Sequence[float]]
+) -> None:
+    conn.executemany(
+        f"INSERT INTO {table}(rowid, embedding, source_type, date) VALUES (?, ?, ?, ?)",
+        [
+            (row["id"], _serialize_vector(vec), row["source_type"] or "", row["date"] or "")
+            for row, vec in zip(rows, embeddings)
+        ],
+    )
+
+
+def cutover(conn: sqlite3.Connection, model: str) -> None:
+    """Make the building space for ``model`` active in one transaction.
+
+    The previous active space is marked retired (queries stop using it the
+    moment this commits) and dropped by the next ``init_schema``.
+    """
+    spaces = vec_spaces(conn)
+    if spaces.get(model, {}).get("status") != "building":
+        raise ValueError(f"no building space for {model}")
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for entry in spaces.values():
+            if entry.get("status") == "active":
+                entry["status"] = "retired"
+        spaces[model]["status"] = "active"
+        _save_spaces(conn, spaces)
+        mode = index_quantization(conn)
+        if mode != "none":
+            _rebuild_quantized(conn, mode)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def drop_retired_spaces(conn: sqlite3.Connection) -> list[str]:
+    spaces = vec_spaces(conn)
+    retired = [model for model, entry in spaces.items() if entry.get("status") == "retired"]
+    for model in retired:
+        table = spaces.pop(model)["table"]
+        conn.execute(f"DROP TABLE IF EXISTS {table}_q")
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    if retired:
+        _save_spaces(conn, spaces)
+    return retired
+
+
+def _migrate_vec_metadata(conn: sqlite3.Connection) -> None:
+    """Recreate a pre-metadata ``vec_chunks`` with filter columns.
+
+    Vectors are copied, not re-embedded; the quantized copy is re-derived.
+    """
+    conn.execute(
+        "CREATE TEMP TABLE vec_migrate AS"
+        " SELECT v.rowid AS id, v.embedding AS embedding, c.source_type AS source_type, c.date AS date"
+        " FROM vec_chunks v JOIN chunks c ON c.id = v.rowid"
+    )
+    conn.execute("DROP TABLE vec_chunks")
+    conn.execute(f"CREATE VIRTUAL TABLE vec_chunks USING vec0(embedding float[{EMBED_DIM}], {_VEC_METADATA})")
+    conn.execute(
+        "INSERT INTO vec_chunks(rowid, embedding, source_type, date)"
+        " SELECT id, embedding, coalesce(source_type, ''), coalesce(date, '') FROM vec_migrate"
+    )
+    conn.execute("DROP TABLE vec_migrate")
+    set_meta(conn, "vec_metadata", "1")
+    mode = index_quantization(conn)
+    if mode != "none":
+        _rebuild_quantized(conn, mode)
+
+
+def index_quantization(conn: sqlite3.Connection) -> str:
+    """The index's vector quantization mode (``"none"`` when unset)."""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'vec_quantization'").fetchone()
+    except sqlite3.OperationalError:
+        return "none"
+    return row[0] if row and row[0] in QUANTIZATION_MODES else "none"
+
+
+def _rebuild_quantized(conn: sqlite3.Connection, mode: str) -> None:
+    """Recreate the active space's ``_q`` table for ``mode``.
+
+    Switching modes needs no re-embedding: the quantized column is derived
+    from the float32 table with sqlite-vec's quantize functions.
+    """
+    space = active_space(conn)
+    if space is None:
+        return
+    table, quant = space["table"], f"{space['table']}_q"
+    conn.execute(f"DROP TABLE IF EXISTS {quant}")
+    if mode == "none":
+        return
+    conn.execute(
+        f"CREATE VIRTUAL TABLE {quant} USING vec0("
+        f"embedding {_QUANT_TYPE[mode]}[{int(space['dim'])}], {_VEC_METADATA})"
+    )
+    conn.execute(
+        f"INSERT INTO {quant}(rowid, embedding, source_type, date)"
+        f" SELECT rowid, {_QUANT_EXPR[mode].format('embedding')}, source_type, date FROM {table}"
+    )
+
+
+def _vec_tables(conn: sqlite3.Connection) -> list[str]:
+    """Every vec table that mirrors ``chunks`` (deletes and renames hit all)."""
+    quantized = index_quantization(conn) != "none"
+    tables: list[str] = []
+    for entry in vec_spaces(conn).values():
+        if entry.get("status") == "active":
+            tables.append(entry["table"])
+            if quantized:
+                tables.append(f"{entry['table']}_q")
+        elif entry.get("status") == "building":
+            tables.append(entry["table"])
+    return tables
+
+
 # ---------------------------------------------------------------------------
 # Upsert helpers
 # ---------------------------------------------------------------------------
@@ -270,12 +655,99 @@ def delete_path(conn: sqlite3.Connection, relative_path: str, *, vec_enabled: bo
         rows = conn.execute(
             "SELECT id FROM chunks WHERE path = ?", (relative_path,)
         ).fetchall()
-        for row in rows:
-            conn.execute("DELETE FROM vec_chunks WHERE rowid = ?", (row["id"],))
+        for table in _vec_tables(conn):
+            for row in rows:
+                conn.execute(f"DELETE FROM {table} WHERE rowid = ?", (row["id"],))
     conn.execute("DELETE FROM chunks WHERE path = ?", (relative_path,))
     conn.execute("DELETE FROM fts_notes WHERE path = ?", (relative_path,))
 
 
+_BULK_BATCH = 500
+
+
+def indexed_paths(conn: sqlite3.Connection) -> set[str]:
+    """Every path with a row in ``fts_notes`` or ``chunks``."""
+    paths = {row[0] for row in conn.execute("SELECT DISTINCT path FROM chunks")}
+    paths.update(row[0] for row in conn.execute("SELECT path FROM fts_notes"))
+    return paths
+
+
+def is_empty(conn: sqlite3.Connection) -> bool:
+    """True when no note has a row in ``fts_notes`` or ``chunks``."""
+    return not any(
+        conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() for table in ("fts_notes", "chunks")
+    )
+
+
+def delete_paths(conn: sqlite3.Connection, relative_paths: Iterable[str], *, vec_enabled: bool) -> int:
+    """Bulk ``delete_path``: one statement per table per batch of paths.
+
+    FTS5 cannot use an index on ``path``, so deleting orphans one by one
+    rescans the table per path; batching keeps a large cleanup to a handful
+    of scans. Returns the number of paths processed.
+    """
+    paths = list(relative_paths)
+    vec_tables = _vec_tables(conn) if vec_enabled else []
+    for start in range(0, len(paths), _BULK_BATCH):
+        batch = paths[start:start + _BULK_BATCH]
+        marks = ",".join("?" * len(batch))
+        if vec_enabled:
+            ids = [(row[0],) for row in conn.execute(f"SELECT id FROM chunks WHERE path IN ({marks})", batch)]
+            for table in vec_tables:
+                conn.executemany(f"DELETE FROM {table} WHERE rowid = ?", ids)
+        conn.execute(f"DELETE FROM chunks WHERE path IN ({marks})", batch)
+        conn.execute(f"DELETE FROM fts_notes WHERE path IN ({marks})", batch)
+    return len(paths)
+
+
+def rename_path(conn: sqlite3.Connection, old_path: str, note: "NoteRecord") -> int:
+    """Point an unchanged note's rows at its new path, keeping embeddings.
+
+    The FTS row is rewritten (title and date can follow the filename);
+    chunk rows are updated in place so vec table rowids stay valid.
+    Returns the number of chunks carried over.
+    """
+    conn.execute("DELETE FROM fts_notes WHERE path = ?", (old_path,))
+    upsert_note_fts(conn, note)
+    ids = [row[0] for row in conn.execute("SELECT id FROM chunks WHERE path = ?", (old_path,))]
+    conn.execute(
+        "UPDATE chunks SET path = ?, source_type = ?, date = ? WHERE path = ?",
+        (note.path, note.source_type, note.date or "", old_path),
+    )
+    if ids and vec_has_metadata(conn):
+        try:
+            for table in _vec_tables(conn):
+                conn.executemany(
+                    f"UPDATE {table} SET source_type = ?, date = ? WHERE rowid = ?",
+                    [(note.source_type, note.date or "", chunk_id) for chunk_id in ids],
+                )
+        except sqlite3.OperationalError:  # extension not loaded; next vec build re-syncs
+            pass
+    return len(ids)
+
+
+def optimize(conn: sqlite3.Connection, *, vacuum: bool = False) -> None:
+    """Merge FTS5 segments and refresh planner stats; optionally VACUUM.
+
+    Must run outside a transaction (VACUUM refuses to run inside one).
+    The WAL is checkpointed afterwards so the file does not keep the
+    pre-optimize pages around.
+    """
+    conn.commit()
+    conn.execute("INSERT INTO fts_notes(fts_notes) VALUES ('optimize')")
+    conn.commit()
+    conn.execute("PRAGMA optimize")
+    if vacuum:
+        conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def free_page_ratio(conn: sqlite3.Connection) -> float:
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return free / pages if pages else 0.0
+
+
 @dataclass
 class NoteRecord:
     path: str          # vault-relative, forward slashes
@@ -310,14 +782,24 @@ def upsert_chunks(
     embeddings: Sequence[Sequence[float]] | None,
     *,
     vec_enabled: bool,
-) -> None:
+) -> list[int]:
     """Insert chunk rows and (if vec is enabled) their embeddings.
 
     ``embeddings`` may be None when the semantic layer is disabled — the chunk
-    rows still land so FTS search can surface them.
+    rows still land so FTS search can surface them. Returns the new chunk ids
+    in order (the flat-file ``vector_store`` keys on them).
     """
     if embeddings is not None and len(embeddings) != len(chunks):
         raise ValueError("embedding count must match chunk count")
+    space = active_space(conn) if vec_enabled and embeddings is not None else None
+    if space is None:
+        vec_enabled = False
+    quantization = index_quantization(conn) if space else "none"
+    with_metadata = space is not None and vec_has_metadata(conn)
+    columns = "rowid, embedding, source_type, date" if with_metadata else "rowid, embedding"
+    extra = (note.source_type, note.date or "") if with_metadata else ()
+    marks = ", ?, ?" if with_metadata else ""
+    chunk_ids: list[int] = []
     for idx, chunk in enumerate(chunks):
         cursor = conn.execute(
             "INSERT INTO chunks(path, chunk_index, text, source_type, date)"
@@ -325,11 +807,19 @@ def upsert_chunks(
             (note.path, chunk.index, chunk.text, note.source_type, note.date or ""),
         )
         chunk_id = cursor.lastrowid
+        chunk_ids.append(chunk_id)
         if vec_enabled and embeddings is not None:
             conn.execute(
-                "INSERT INTO vec_chunks(rowid, embedding) VALUES (?, ?)",
-                (chunk_id, _serialize_vector(embeddings[idx])),
+                f"INSERT INTO {space['table']}({columns}) VALUES (?, ?{marks})",
+                (chunk_id, _serialize_vector(embeddings[idx]), *extra),
             )
+            if quantization != "none":
+                conn.execute(
+                    f"INSERT INTO {space['table']}_q({columns})"
+                    f" VALUES (?, {_QUANT_EXPR[quantization].format('?')}{marks})",
+                    (chunk_id, _serialize_vector(embeddings[idx]), *extra),
+                )
+    return chunk_ids
 
 
 def _serialize_vector(vec: Sequence[float]) -> bytes:
@@ -349,9 +839,15 @@ def fts_query(
     *,
     tier: str | None = None,
     source_types: Iterable[str] | None = None,
+    date_start: str | None = None,
+    date_end: str | None = None,
     limit: int = 10,
 ) -> list[dict]:
-    """Keyword search. Returns rows ordered by bm25."""
+    """Keyword search. Returns rows ordered by bm25.
+
+    ``date_start`` / ``date_end`` (inclusive ISO strings) filter on the
+    note date inside the query, so a narrow window still fills ``limit``.
+    """
     clauses = ["fts_notes MATCH ?"]
     params: list = [query]
     if tier:
@@ -363,6 +859,7 @@ def fts_query(
             placeholders = ",".join(["?"] * len(stypes))
             clauses.append(f"source_type IN ({placeholders})")
             params.extend(stypes)
+    clauses, params = _date_clauses(clauses, params, date_start, date_end)
     sql = (
         "SELECT path, title, source_type, date, tier,"
         " snippet(fts_notes, 3, '<<<', '>>>', '…', 12) AS snippet,"
@@ -375,49 +872,160 @@ def fts_query(
     return [dict(row) for row in rows]
 
 
+def merge_fts(per_db: Iterable[list[dict]], limit: int) -> list[dict]:
+    """Merge ``fts_query`` rows from several DBs, best first.
+
+    bm25 weighs terms by each DB's own IDF, so raw scores from different
+    shards are not comparable. Each DB's scores are divided by its best hit
+    first: ``score`` becomes -1.0 for a DB's top hit and rises toward 0 for
+    weaker ones (lower is still better), and the raw value moves to ``bm25``.
+    """
+    merged: list[dict] = []
+    for rows in per_db:
+        best = min((row["score"] for row in rows), default=0.0)
+        scale = -best if best < 0 else 1.0
+        for row in rows:
+            merged.append({**row, "score": row["score"] / scale, "bm25": row["score"]})
+    merged.sort(key=lambda row: row["score"])
+    return merged[:limit]
+
+
+def _date_clauses(
+    clauses: list[str], params: list, date_start: str | None, date_end: str | None
+) -> tuple[list[str], list]:
+    if date_start:
+        clauses.append("date >= ?")
+        params.append(date_start)
+    if date_end:
+        clauses.append("date <= ?")
+        params.append(date_end)
+    return clauses, params
+
+
+def _vec_filters(
+    stypes: list[str], date_start: str | None, date_end: str | None
+) -> tuple[list[str], list, bool]:
+    """KNN metadata predicates plus whether a Python source-type check remains.
+
+    vec0 metadata columns take comparison operators but not ``IN``: one
+    source type becomes ``=``, the full Tier B set needs no predicate, and
+    any other subset is left to the post-filter.
+    """
+    clauses: list[str] = []
+    params: list = []
+    residual = False
+    if len(stypes) == 1:
+        clauses.append("source_type = ?")
+        params.append(stypes[0])
+    elif stypes and not TIER_B_SOURCE_TYPES <= set(stypes):
+        residual = True
+    clauses, params = _date_clauses(clauses, params, date_start, date_end)
+    return clauses, params, residual
+
+
 def semantic_query(
     conn: sqlite3.Connection,
     query_vector: Sequence[float],
     *,
     source_types: Iterable[str] | None = None,
+    date_start: str | None = None,
+    date_end: str | None = None,
     limit: int = 10,
+    store=None,
 ) -> list[dict]:
-    """Vector KNN against ``vec_chunks`` joined with ``chunks`` metadata.
+    """Vector KNN against the active space joined with ``chunks`` metadata.
 
     sqlite-vec's vec0 table exposes ``distance`` only when the WHERE clause
-    contains ``embedding MATCH ?``. We over-fetch by a factor so the optional
-    source-type filter still returns ``limit`` rows after filtering.
+    contains ``embedding MATCH ?``. Source-type and date predicates run
+    inside the KNN on the vec0 metadata columns, so a narrow window returns
+    its own nearest ``limit`` chunks rather than whatever survives a global
+    top-k. Indexes without metadata columns over-fetch and post-filter.
+
+    On a quantized index the KNN runs over the ``_q`` table with
+    ``RESCORE_FACTOR`` times the candidates, which are then re-ranked by exact
+    float32 L2 distance, so returned distances match an unquantized index.
+
+    ``store`` (a ``vector_store.VectorStore``) replaces the sqlite-vec KNN on
+    hosts without the extension; it searches by the same L2 distance.
     """
     stypes = list(source_types) if source_types else []
-    fetch_k = limit * 4 if stypes else limit
-    match_sql = (
-        "SELECT rowid, distance FROM vec_chunks"
-        " WHERE embedding MATCH ? ORDER BY distance LIMIT ?"
-    )
-    matches = conn.execute(
-        match_sql, (_serialize_vector(query_vector), fetch_k)
-    ).fetchall()
+    query_blob = _serialize_vector(query_vector)
+    if store is not None:
+        allowed = None
+        if stypes or date_start or date_end:
+            clauses, params = _date_clauses([], [], date_start, date_end)
+            if stypes:
+                clauses.append(f"source_type IN ({','.join('?' * len(stypes))})")
+                params.extend(stypes)
+            allowed = [row[0] for row in conn.execute(f"SELECT id FROM chunks WHERE {' AND '.join(clauses)}", params)]
+        matches = store.search(query_vector, limit, allowed_ids=allowed)
+    else:
+        space = active_space(conn)
+        if space is None:
+            return []
+        table = space["table"]
+        if vec_has_metadata(conn):
+            filters, params, residual = _vec_filters(stypes, date_start, date_end)
+        else:
+            filters, params, residual = [], [], bool(stypes or date_start or date_end)
+        fetch_k = limit * 4 if residual else limit
+        where = "".join(f" AND {clause}" for clause in filters)
+        quantization = index_quantization(conn)
+        if quantization == "none":
+            matches = [
+                (row["rowid"], row["distance"])
+                for row in conn.execute(
+                    f"SELECT rowid, distance FROM {table} WHERE embedding MATCH ? AND k = ?{where}"
+                    " ORDER BY distance",
+                    (query_blob, fetch_k, *params),
+                )
+            ]
+        else:
+            matches = _quantized_knn(conn, table, query_blob, quantization, fetch_k, where, params)
     if not matches:
         return []
     results: list[dict] = []
-    for row in matches:
+    for rowid, distance in matches:
         chunk = conn.execute(
             "SELECT path, chunk_index, text, source_type, date"
             " FROM chunks WHERE id = ?",
-            (row["rowid"],),
+            (rowid,),
         ).fetchone()
         if chunk is None:
             continue
         if stypes and chunk["source_type"] not in stypes:
             continue
+        if (date_start and (chunk["date"] or "") < date_start) or (date_end and (chunk["date"] or "") > date_end):
+            continue
         entry = dict(chunk)
-        entry["distance"] = row["distance"]
+        entry["distance"] = distance
         results.append(entry)
         if len(results) >= limit:
             break
     return results
 
 
+def _quantized_knn(
+    conn: sqlite3.Connection, table: str, query_blob: bytes, mode: str, k: int, where: str = "", params: Sequence = ()
+) -> list[tuple[int, float]]:
+    """First-pass KNN on the quantized table, rescored with float32 L2."""
+    candidates = conn.execute(
+        f"SELECT rowid FROM {table}_q"
+        f" WHERE embedding MATCH {_QUANT_EXPR[mode].format('?')} AND k = ?{where} ORDER BY distance",
+        (query_blob, k * RESCORE_FACTOR, *params),
+    ).fetchall()
+    rescored: list[tuple[int, float]] = []
+    for (rowid,) in candidates:
+        row = conn.execute(
+            f"SELECT vec_distance_l2(embedding, ?) FROM {table} WHERE rowid = ?",
+            (query_blob, rowid),
+        ).fetchone()
+        if row is not None:
+            rescored.append((rowid, row[0]))
+    rescored.sort(key=lambda item: item[1])
+    return rescored[:k]
+
+
 # ---------------------------------------------------------------------------
 # State file (incremental-build SHA map)
 # ---------------------------------------------------------------------------
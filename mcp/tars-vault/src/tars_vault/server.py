@@ -11,14 +11,25 @@ and is injected into every tool call so individual skills don't have to pass it.
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from . import tools as _tools
 from . import _common
+from . import call_context as _call_context
+from . import entity_index as _entity_index
+from . import perf as _perf
+from . import profiling as _profiling
+from . import telemetry as _telemetry
+from . import tracing as _tracing
+from . import wikilink as _wikilink
 
 
 def _resolve_handler(name: str):
@@ -37,6 +48,20 @@ TOOL_REGISTRY: dict[str, Any] = {
 # ---------------------------------------------------------------------------
 
 _COMMON_VAULT = {"vault": {"type": "string", "description": "Absolute workspace path (auto-injected by server if omitted)."}}
+_DEADLINE = {
+    "deadline_ms": {
+        "type": "integer",
+        "description": "Optional time budget. When exceeded the tool returns partial results with truncated=true.",
+    }
+}
+# Accepted by every tool; popped by the server before the handler runs.
+_PROFILE = {
+    "profile": {
+        "type": ["boolean", "string"],
+        "enum": [True, False, "cpu", "memory", "all"],
+        "description": "Diagnostics: capture cProfile (true/cpu), tracemalloc (memory), or both (all) for this call; report paths come back under profile.",
+    }
+}
 
 
 TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
@@ -191,6 +216,7 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                **_DEADLINE,
                 "folder": {"type": "string"},
                 "min_cluster": {"type": "integer"},
             },
@@ -306,6 +332,10 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                "perf": {
+                    "type": "boolean",
+                    "description": "Include per-tool latency percentiles and the slowest recent calls.",
+                },
             },
         },
     },
@@ -352,6 +382,7 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                **_DEADLINE,
                 "limit": {"type": "integer", "description": "Maximum rows per repeated section."},
             },
         },
@@ -362,6 +393,7 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                **_DEADLINE,
                 "days_without_transcript": {"type": "integer"},
                 "stale_days": {"type": "integer"},
             },
@@ -373,6 +405,7 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                **_DEADLINE,
                 "query": {"type": "string"},
                 "kind": {"type": "string", "description": "Optional tag kind filter, e.g. person, initiative, decision."},
                 "limit": {"type": "integer"},
@@ -386,6 +419,7 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                **_DEADLINE,
                 "query": {"type": "string"},
                 "limit": {"type": "integer"},
             },
@@ -398,6 +432,7 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
+                **_DEADLINE,
                 "check": {"type": "string", "enum": ["all", "memory", "workflows", "inbox"]},
                 "active_limit": {"type": "integer"},
             },
@@ -431,29 +466,54 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
                 "since": {"type": "string"},
                 "until": {"type": "string"},
                 "date_range": {"type": "object"},
-                "semantic_weight": {"type": "number"},
+                "semantic_weight": {"type": "number", "description": "0..1 share of the semantic score in the hybrid merge (default 0.7)."},
             },
             "required": ["query"],
         },
     },
     "rerank": {
-        "description": "Deterministic rerank with recency + source boosts.",
+        "description": (
+            "Rerank search results: local cross-encoder when its model is cached, "
+            "else deterministic; recency + source boosts either way."
+        ),
         "inputSchema": {
             "type": "object",
             "properties": {
                 **_COMMON_VAULT,
                 "results": {"type": "array"},
+                "candidates": {"type": "array", "description": "Alias of results."},
                 "query": {"type": "string"},
+                "top_k": {"type": "integer"},
+                "today": {"type": "string"},
                 "recency_boost": {"type": "number"},
+                "cross_encoder": {"type": "boolean", "description": "False forces the deterministic rerank."},
+                "budget_ms": {"type": "number", "description": "Cross-encoder latency budget (default 1500)."},
             },
-            "required": ["results"],
+        },
+    },
+    "suggest_entities": {
+        "description": (
+            "Autocomplete entity names (basenames, tars-name, frontmatter aliases, "
+            "alias registry) from a prefix, ranked by inbound links and recency."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                **_COMMON_VAULT,
+                "prefix": {"type": "string", "description": "Start of a name or of any word in it."},
+                "kind": {"type": "string", "description": "person, vendor, competitor, product, initiative, decision, or org-context."},
+                "limit": {"type": "integer"},
+            },
+            "required": ["prefix"],
         },
     },
     "format_wikilink": {
         "description": (
             "Resolve raw text into an Obsidian-safe wikilink via the alias "
             "registry and vault file lookup. Returns status=resolved | "
-            "disambiguation_needed | new_entity | error. Skills MUST use this "
+            "disambiguation_needed | new_entity | error. Pass `texts` instead "
+            "of `text` to format every entity mention of a draft in one call "
+            "(returns results=[...] in input order). Skills MUST use this "
             "instead of hand-forming [[...]] from user-provided text."
         ),
         "inputSchema": {
@@ -464,16 +524,21 @@ TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
                     "type": "string",
                     "description": "Reference text to convert into a wikilink.",
                 },
+                "texts": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Bulk form: reference texts to format in one call (instead of `text`).",
+                },
                 "kind": {
                     "type": "string",
                     "description": (
                         "Optional entity kind hint (person, vendor, competitor, "
                         "product, initiative, decision, org-context). Restricts "
-                        "alias-registry matches when provided."
+                        "alias-registry matches when provided; applies to every "
+                        "entry of `texts`."
                     ),
                 },
             },
-            "required": ["text"],
         },
     },
 }
@@ -494,6 +559,9 @@ WRITE_TOOLS = {
 
 READ_TOOLS = set(TOOL_REGISTRY) - WRITE_TOOLS
 
+_MAX_CONCURRENT_CALLS = 4
+_WRITE_LOCK = threading.Lock()  # transports run write tools one at a time
+
 
 def _validate_kwargs(tool_name: str, schema: dict[str, Any], kwargs: dict[str, Any]) -> str | None:
     declared = set(schema.get("properties", {}).keys())
@@ -591,46 +659,176 @@ def _tool_specs() -> list[dict[str, Any]]:
     for name, spec in TOOL_SCHEMAS.items():
         if name not in TOOL_REGISTRY:
             continue
+        schema = dict(spec["inputSchema"])
+        schema["properties"] = {**schema.get("properties", {}), **_PROFILE}
         out.append(
             {
                 "name": name,
                 "description": spec["description"],
-                "inputSchema": spec["inputSchema"],
+                "inputSchema": schema,
             }
         )
     return out
 
 
-def _call_handler_sync(name: str, arguments: dict | None, default_vault: str) -> dict:
-    handler = TOOL_REGISTRY.get(name)
-    if handler is None:
-        return {"status": "error", "reason": f"unknown tool: {name}"}
+def _payload_size(payload: Any) -> int:
+    try:
+        return len(json.dumps(payload, separators=(",", ":"), default=str))
+    except Exception:
+        return 0
+
+
+def _dispatch(
+    name: str,
+    handler: Any,
+    arguments: dict | None,
+    default_vault: str,
+    context: _call_context.CallContext,
+) -> tuple[dict, str | None, Path | None]:
+    """Validate, resolve the vault, and run one handler under ``context``.
+
+    Returns ``(result, error_class, vault)``; ``error_class`` names the
+    exception type when the handler raised.
+    """
     args = dict(arguments or {})
+    try:
+        profile_mode = _profiling.requested_mode(args.pop("profile", None))
+    except ValueError as exc:
+        return _common.error(str(exc)), None, None
     schema = TOOL_SCHEMAS.get(name, {}).get("inputSchema", {})
     kw_error = _validate_kwargs(name, schema, args)
     if kw_error:
-        return _common.error(kw_error)
+        return _common.error(kw_error), None, None
+    deadline_ms = args.pop("deadline_ms", None)
+    if deadline_ms is not None:
+        try:
+            context.set_deadline(float(deadline_ms))
+        except (TypeError, ValueError):
+            return _common.error("deadline_ms must be a number"), None, None
     vault, vault_error = _resolve_call_vault(args, default_vault)
     if vault_error:
-        return _common.error(vault_error)
+        return _common.error(vault_error), None, None
     if vault is not None:
         args["vault"] = str(vault)
         alignment_error = _enforce_install_alignment(name, vault)
         if alignment_error:
-            return alignment_error
+            return alignment_error, None, vault
+    error_class = None
+    capture = None
     try:
-        result = handler(**args)
+        with _call_context.activate(context), _profiling.capture(vault, name, profile_mode) as capture:
+            result = handler(**args)
     except TypeError as exc:
         result = {"status": "error", "reason": f"bad arguments: {exc}"}
+        error_class = type(exc).__name__
     except NotImplementedError as exc:
         result = {"status": "error", "reason": f"tool not yet implemented: {exc}"}
+        error_class = type(exc).__name__
     except Exception as exc:
         result = {"status": "error", "reason": f"tool raised: {exc}"}
+        error_class = type(exc).__name__
     if not isinstance(result, dict):
         result = {"status": "error", "reason": f"tool returned non-dict: {type(result).__name__}"}
+    if capture is not None:
+        result["profile"] = capture.summary()
+    return result, error_class, vault
+
+
+def _execute_call(
+    name: str,
+    arguments: dict | None,
+    default_vault: str,
+    context: _call_context.CallContext | None = None,
+) -> tuple[dict, Callable[..., None] | None]:
+    """Run one tool call and hand back its perf sample unfiled.
+
+    Returns ``(result, record)``. ``record(bytes_in=..., bytes_out=...)``
+    files the latency sample once the caller knows the payload sizes, so a
+    transport can count the bytes it serialized anyway instead of encoding
+    the result a second time. ``record`` is None for an unknown tool.
+    """
+    handler = TOOL_REGISTRY.get(name)
+    if handler is None:
+        return {"status": "error", "reason": f"unknown tool: {name}"}, None
+    context = context or _call_context.CallContext()
+    args = dict(arguments or {})
+    trace = args.pop("_trace", None)  # reserved: caller's trace context, never schema-validated
+    started = time.perf_counter()
+    with _tracing.span(None, f"tool.{name}", trace=trace if isinstance(trace, dict) else None, tool=name) as span:
+        result, error_class, vault = _dispatch(name, handler, args, default_vault, context)
+        if name in WRITE_TOOLS and vault is not None and result.get("status") != "error":
+            _entity_index.invalidate(vault, _written_paths(result))
+            _wikilink.invalidate(vault)
+        if context.truncated and result.get("status") != "error":
+            result["truncated"] = True
+            result["truncated_reason"] = context.reason
+        elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+        if error_class is None and result.get("status") == "error":
+            error_class = "ToolError"
+        if span is not None:
+            span.vault = vault
+            if error_class:
+                span.status = "error"
+                span.set(error_class=error_class)
+    return result, functools.partial(_perf.RECORDER.record, name, elapsed_us, error_class=error_class, vault=vault)
+
+
+def _call_handler_sync(
+    name: str,
+    arguments: dict | None,
+    default_vault: str,
+    context: _call_context.CallContext | None = None,
+) -> dict:
+    """Run one tool call. ``context`` lets the transport cancel it mid-flight.
+
+    In-process callers have no wire payload, so the sizes recorded here come
+    from a compact encoding of the arguments and result.
+    """
+    result, record = _execute_call(name, arguments, default_vault, context)
+    if record is not None:
+        record(bytes_in=_payload_size(arguments or {}), bytes_out=_payload_size(result))
     return result
 
 
+def _written_paths(result: dict) -> list[str] | None:
+    """Notes a write tool reports touching, or None when it may have touched others."""
+    if result.get("references_rewritten"):
+        return None  # move_note rewrote links in notes it does not list
+    paths = [result[key] for key in ("path", "from_path", "to_path", "from", "to") if isinstance(result.get(key), str)]
+    if not paths or not all(path.endswith(".md") for path in paths):
+        return None  # e.g. a scaffolded workspace or extension directory
+    return paths
+
+
+def _run_tool_call(
+    name: str,
+    arguments: dict | None,
+    default_vault: str,
+    context: _call_context.CallContext,
+    request_bytes: int | None = None,
+) -> tuple[dict[str, Any], str]:
+    """Run one call for the concurrent transports and encode its response.
+
+    Returns ``(result, text)`` where ``text`` is the tool result content the
+    transport sends. The perf sample counts ``len(text)`` as the response
+    size and ``request_bytes`` (the raw request, when the transport has it)
+    as the request size, so nothing is serialized just to be measured.
+    Reads run in parallel; calls in ``WRITE_TOOLS`` are serialized so two
+    writes never interleave on the same notes.
+    """
+    if name in WRITE_TOOLS:
+        with _WRITE_LOCK:
+            result, record = _execute_call(name, arguments, default_vault, context)
+    else:
+        result, record = _execute_call(name, arguments, default_vault, context)
+    text = json.dumps(result, indent=2, default=str)
+    if record is not None:
+        if request_bytes is None:
+            request_bytes = _payload_size(arguments or {})
+        record(bytes_in=request_bytes, bytes_out=len(text))
+    return result, text
+
+
 def _write_json(payload: dict[str, Any]) -> None:
     sys.stdout.write(json.dumps(payload, default=str) + "\n")
     sys.stdout.flush()
@@ -646,10 +844,58 @@ def _run_minimal_stdio(vault_path: str) -> int:
     The official `mcp` Python SDK is preferred when installed, but marketplace
     users should not need to run `pip install` before first setup. This fallback
     implements the JSON-RPC methods TARS needs: initialize, tools/list, and
-    tools/call.
+    tools/call. Tool calls run on a small worker pool so the reader stays free
+    to honour `notifications/cancelled` for in-flight requests and to stream
+    `notifications/progress` when the caller supplied a progress token.
     """
     default_vault = _resolve_default_vault(vault_path)
     _check_install_record(default_vault)
+    _telemetry.SINK.start()
+    _telemetry.rotate_in_background(default_vault)
+    write_lock = threading.Lock()
+    inflight: dict[Any, _call_context.CallContext] = {}
+    inflight_lock = threading.Lock()
+    pool = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_CALLS, thread_name_prefix="tars-tool")
+
+    def emit(payload: dict[str, Any]) -> None:
+        with write_lock:
+            _write_json(payload)
+
+    def progress_sink(token: Any) -> _call_context.ProgressSink:
+        def send(done: int, total: int | None, message: str | None) -> None:
+            params: dict[str, Any] = {"progressToken": token, "progress": done}
+            if total is not None:
+                params["total"] = total
+            if message:
+                params["message"] = message
+            emit({"jsonrpc": "2.0", "method": "notifications/progress", "params": params})
+
+        return send
+
+    def run_call(
+        request_id: Any, name: str, arguments: dict, ctx: _call_context.CallContext, request_bytes: int
+    ) -> None:
+        try:
+            result, text = _run_tool_call(name, arguments, default_vault, ctx, request_bytes)
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": {
+                    "content": [{"type": "text", "text": text}],
+                    "isError": result.get("status") == "error",
+                },
+            }
+        except Exception as exc:  # noqa: BLE001 - the client must always get an answer
+            print(f"tars-vault: tool {name} failed outside its handler: {exc!r}", file=sys.stderr)
+            response = _jsonrpc_error(request_id, -32603, f"Internal error in {name}: {type(exc).__name__}: {exc}")
+        finally:
+            with inflight_lock:
+                inflight.pop(request_id, None)
+        if ctx.cancelled:
+            # The client abandoned this request; MCP says not to answer it.
+            return
+        emit(response)
+
     try:
         for raw in sys.stdin:
             line = raw.strip()
@@ -658,7 +904,7 @@ def _run_minimal_stdio(vault_path: str) -> int:
             try:
                 request = json.loads(line)
             except json.JSONDecodeError:
-                _write_json(_jsonrpc_error(None, -32700, "Parse error"))
+                emit(_jsonrpc_error(None, -32700, "Parse error"))
                 continue
 
             method = request.get("method")
@@ -667,9 +913,15 @@ def _run_minimal_stdio(vault_path: str) -> int:
 
             if method == "notifications/initialized":
                 continue
+            if method == "notifications/cancelled":
+                with inflight_lock:
+                    ctx = inflight.get(params.get("requestId"))
+                if ctx is not None:
+                    ctx.cancel()
+                continue
             if method == "initialize":
                 protocol = params.get("protocolVersion") or "2024-11-05"
-                _write_json(
+                emit(
                     {
                         "jsonrpc": "2.0",
                         "id": request_id,
@@ -682,39 +934,60 @@ def _run_minimal_stdio(vault_path: str) -> int:
                 )
                 continue
             if method == "ping":
-                _write_json({"jsonrpc": "2.0", "id": request_id, "result": {}})
+                emit({"jsonrpc": "2.0", "id": request_id, "result": {}})
                 continue
             if method == "tools/list":
-                _write_json({"jsonrpc": "2.0", "id": request_id, "result": {"tools": _tool_specs()}})
+                emit({"jsonrpc": "2.0", "id": request_id, "result": {"tools": _tool_specs()}})
                 continue
             if method == "tools/call":
                 name = params.get("name")
                 arguments = params.get("arguments") or {}
-                result = _call_handler_sync(str(name or ""), arguments, default_vault)
-                _write_json(
-                    {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "content": [
-                                {"type": "text", "text": json.dumps(result, indent=2, default=str)}
-                            ],
-                            "isError": result.get("status") == "error",
-                        },
-                    }
-                )
+                token = (params.get("_meta") or {}).get("progressToken")
+                ctx = _call_context.CallContext(progress=progress_sink(token) if token is not None else None)
+                with inflight_lock:
+                    inflight[request_id] = ctx
+                pool.submit(run_call, request_id, str(name or ""), arguments, ctx, len(line.encode("utf-8")))
                 continue
 
             if request_id is not None:
-                _write_json(_jsonrpc_error(request_id, -32601, f"Method not found: {method}"))
+                emit(_jsonrpc_error(request_id, -32601, f"Method not found: {method}"))
     except KeyboardInterrupt:
+        with inflight_lock:
+            for ctx in inflight.values():
+                ctx.cancel()
         return 0
     except Exception as exc:
         print(f"tars-vault: fallback server exited with error: {exc}", file=sys.stderr)
         return 1
+    finally:
+        pool.shutdown(wait=True)
+        _perf.RECORDER.flush()
+        _telemetry.SINK.stop()
     return 0
 
 
+def _sdk_progress_sink(server: Any, loop: asyncio.AbstractEventLoop) -> _call_context.ProgressSink | None:
+    """Bridge worker-thread progress ticks onto the SDK session's event loop."""
+    try:
+        request = server.request_context
+    except LookupError:
+        return None
+    token = getattr(request.meta, "progressToken", None) if request.meta else None
+    if token is None:
+        return None
+    session = request.session
+
+    def send(done: int, total: int | None, message: str | None) -> None:
+        try:
+            coro = session.send_progress_notification(token, float(done), total, message=message)
+        except TypeError:
+            # Older SDKs predate the optional message field.
+            coro = session.send_progress_notification(token, float(done), total)
+        asyncio.run_coroutine_threadsafe(coro, loop)
+
+    return send
+
+
 def run_stdio(vault_path: str) -> int:
     """Run the MCP server on stdio. Blocks until the transport closes.
 
@@ -736,6 +1009,8 @@ def run_stdio(vault_path: str) -> int:
 
     default_vault = _resolve_default_vault(vault_path)
     _check_install_record(default_vault)
+    _telemetry.SINK.start()
+    _telemetry.rotate_in_background(default_vault)
     server = Server("tars-vault")
 
     @server.list_tools()
@@ -751,8 +1026,15 @@ def run_stdio(vault_path: str) -> int:
 
     @server.call_tool()
     async def _call_tool(name: str, arguments: dict | None) -> list[TextContent]:
-        result = await asyncio.to_thread(_call_handler_sync, name, arguments, default_vault)
-        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        ctx = _call_context.CallContext(progress=_sdk_progress_sink(server, asyncio.get_running_loop()))
+        try:
+            _, text = await asyncio.to_thread(_run_tool_call, name, arguments, default_vault, ctx)
+        except asyncio.CancelledError:
+            # The SDK cancels this task on notifications/cancelled; the worker
+            # thread keeps running until the tool reaches its next checkpoint.
+            ctx.cancel()
+            raise
+        return [TextContent(type="text", text=text)]
 
     async def _main() -> None:
         async with stdio_server() as (read_stream, write_stream):
@@ -776,4 +1058,7 @@ def run_stdio(vault_path: str) -> int:
     except Exception as exc:
         print(f"tars-vault: server exited with error: {exc}", file=sys.stderr)
         return 1
+    finally:
+        _perf.RECORDER.flush()
+        _telemetry.SINK.stop()
     return 0
@@ -1,15 +1,387 @@
-"""jsonl telemetry helper."""
-import json, os
-from datetime import datetime
+"""jsonl telemetry helper.
+
+``append_event`` writes straight to disk unless the background sink is
+running. The long-lived server starts ``SINK`` so event logging leaves the
+tool latency path: events go onto a bounded queue and a writer thread appends
+them in batches — one open/write per file when ``BATCH_MAX`` events are
+waiting or ``FLUSH_INTERVAL_SECONDS`` after the first one arrived. When the
+queue is full the event is dropped and counted rather than blocking the
+caller; the count is reported by ``runtime_info(perf=true)`` and written to
+the ``perf`` stream when the sink stops.
+
+Closed days are rotated into compressed segments (``.jsonl.zst`` when the
+optional ``zstandard`` package is installed, ``.jsonl.gz`` otherwise) and
+segments older than ``RETENTION_DAYS`` are deleted; the server runs
+``rotate`` in the background at start-up. ``iter_events`` streams a day
+range across live and compressed segments alike, so readers such as
+``scripts/telemetry-rollup.py`` never care which form a day is in. A segment
+that cannot be read back (a ``.zst`` day without ``zstandard``, a corrupt
+file) is reported through ``iter_segment``'s ``errors`` list rather than
+looking like an empty day.
+"""
+import atexit
+import gzip
+import io
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import IO, Iterator
+
+try:  # optional: better ratio and faster reads than gzip
+    import zstandard as _zstd
+except Exception:  # pragma: no cover - optional dependency
+    _zstd = None
+
+_READ_ERRORS: tuple[type[BaseException], ...] = (OSError, EOFError, ValueError)
+if _zstd is not None:
+    _READ_ERRORS += (_zstd.ZstdError,)
+
+QUEUE_MAX = 10_000
+BATCH_MAX = 256
+FLUSH_INTERVAL_SECONDS = 1.0
+RETENTION_DAYS = 365
+ROTATE_GRACE_SECONDS = 3600
+COMPRESSED_SUFFIXES = (".zst", ".gz")
+
+_SEGMENT_RE = re.compile(
+    r"^(?:(?P<stream>[a-z][a-z0-9_]*)-)?(?P<day>\d{4}-\d{2}-\d{2})\.jsonl(?P<suffix>\.zst|\.gz)?$"
+)
+
+_known_dirs: set[Path] = set()
+
+
+def telemetry_dir(vault: Path) -> Path:
+    return Path(vault) / "_system" / "telemetry"
+
+
+def _segment_name(day: date | str, stream: str | None) -> str:
+    day = day.isoformat() if isinstance(day, date) else day
+    return f"{stream}-{day}.jsonl" if stream else f"{day}.jsonl"
+
+
+def _target(vault: Path, stream: str | None) -> Path:
+    day = datetime.now().astimezone().strftime("%Y-%m-%d")
+    return telemetry_dir(vault) / _segment_name(day, stream)
+
+
+def _append_lines(target: Path, lines: list[str]) -> None:
+    """Append ``lines`` with one open; create the directory only once."""
+    if target.parent not in _known_dirs:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _known_dirs.add(target.parent)
+    try:
+        handle = target.open("a", encoding="utf-8")
+    except FileNotFoundError:
+        # Directory removed since we cached it (tests, workspace reset).
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle = target.open("a", encoding="utf-8")
+    with handle:
+        handle.write("".join(lines))
+
+
+class TelemetrySink:
+    """Bounded queue + writer thread for telemetry lines."""
+
+    def __init__(self, maxsize: int = QUEUE_MAX) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._drop_vault: Path | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="tars-telemetry", daemon=True)
+            self._thread.start()
+
+    def submit(self, vault: Path, target: Path, line: str) -> None:
+        try:
+            self._queue.put_nowait((target, line))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._drop_vault = Path(vault)
+            return
+        with self._lock:
+            self.accepted += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is on disk (or ``timeout``)."""
+        if not self.running:
+            return self._queue.unfinished_tasks == 0
+        done = threading.Event()
+        try:
+            self._queue.put((None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Drain the queue, stop the writer, and record any drops."""
+        thread = self._thread
+        if thread is None:
+            return
+        if thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            dropped, vault = self.dropped, self._drop_vault
+        if dropped and vault is not None:
+            try:
+                _append_lines(
+                    _target(vault, "perf"),
+                    [json.dumps({"event": "telemetry_dropped", "count": dropped}, separators=(",", ":")) + "\n"],
+                )
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "queued": self._queue.qsize(),
+                "accepted": self.accepted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+            }
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + FLUSH_INTERVAL_SECONDS
+            while len(batch) < BATCH_MAX and batch[-1][0] is not None:
+                try:
+                    nxt = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(nxt)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: list) -> None:
+        by_target: dict[Path, list[str]] = {}
+        markers = []
+        for target, payload in batch:
+            if target is None:
+                markers.append(payload)
+            else:
+                by_target.setdefault(target, []).append(payload)
+        written = 0
+        for target, lines in by_target.items():
+            try:
+                _append_lines(target, lines)
+                written += len(lines)
+            except OSError:
+                continue
+        with self._lock:
+            self.written += written
+            self.batches += 1
+        for _ in batch:
+            self._queue.task_done()
+        for marker in markers:
+            marker.set()
+
 
+SINK = TelemetrySink()
+atexit.register(SINK.stop)
 
-def append_event(vault: Path, event: dict) -> None:
-    """Append a single event to ``_system/telemetry/YYYY-MM-DD.jsonl``."""
+
+def append_event(vault: Path, event: dict, stream: str | None = None) -> None:
+    """Append a single event to ``_system/telemetry/YYYY-MM-DD.jsonl``.
+
+    ``stream`` routes machine-oriented records (e.g. ``perf``) to a sibling
+    ``<stream>-YYYY-MM-DD.jsonl`` file so the skill-event rollup stays clean.
+    The file day is fixed when the event is logged, not when it is written.
+    """
     if os.environ.get("TARS_DISABLE_TELEMETRY"):
         return
-    day = datetime.now().astimezone().strftime("%Y-%m-%d")
-    target = Path(vault) / "_system" / "telemetry" / f"{day}.jsonl"
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(event, separators=(",", ":")) + "\n")
+    target = _target(vault, stream)
+    line = json.dumps(event, separators=(",", ":")) + "\n"
+    if SINK.running:
+        SINK.submit(vault, target, line)
+        return
+    _append_lines(target, [line])
+
+
+# ---------------------------------------------------------------------------
+# Segments: rotation, retention, and the streaming reader
+# ---------------------------------------------------------------------------
+
+def segment_path(vault: Path, day: date, stream: str | None = None) -> Path | None:
+    """Return the stored segment for ``day``, live or compressed.
+
+    A live file wins over a compressed copy: both only coexist if a rotation
+    was interrupted, and the next rotation replaces the copy.
+    """
+    live = telemetry_dir(vault) / _segment_name(day, stream)
+    for candidate in (live, *(live.with_name(live.name + suffix) for suffix in COMPRESSED_SUFFIXES)):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def open_segment(path: Path) -> IO[str]:
+    """Open a segment for text reading, decompressing by suffix."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".zst":
+        if _zstd is None:
+            raise OSError(f"{path.name}: zstandard is not installed")
+        raw = path.open("rb")
+        return io.TextIOWrapper(_zstd.ZstdDecompressor().stream_reader(raw, closefd=True), encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def iter_segment(path: Path, errors: list[str] | None = None) -> Iterator[dict]:
+    """Yield the JSON object events in one segment, skipping bad lines.
+
+    A truncated or unreadable segment ends the stream early instead of
+    raising; telemetry readers report on whatever is intact. The failure is
+    appended to ``errors`` when given, so callers can tell "could not read"
+    from "no events" (and, say, not cache the result).
+    """
+    try:
+        with open_segment(path) as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict):
+                    yield event
+    except _READ_ERRORS as exc:
+        if errors is not None:
+            errors.append(f"{path.name}: {exc}")
+        return
+
+
+def iter_events(vault: Path, start: date, end: date, stream: str | None = None) -> Iterator[tuple[date, dict]]:
+    """Stream ``(day, event)`` pairs for ``start..end`` inclusive."""
+    cur = start
+    while cur <= end:
+        path = segment_path(vault, cur, stream)
+        if path is not None:
+            for event in iter_segment(path):
+                yield cur, event
+        cur += timedelta(days=1)
+
+
+def compress_segment(path: Path) -> Path | None:
+    """Compress one closed live segment in place; return the new path.
+
+    Returns None (leaving the live file untouched) if the file changed while
+    it was being compressed, so a late write is never lost.
+    """
+    suffix = ".zst" if _zstd is not None else ".gz"
+    dest = path.with_name(path.name + suffix)
+    tmp = path.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        before = path.stat()
+        with path.open("rb") as src, tmp.open("wb") as raw:
+            if _zstd is not None:
+                _zstd.ZstdCompressor(level=10).copy_stream(src, raw)
+            else:
+                with gzip.GzipFile(filename=path.name, mode="wb", fileobj=raw, mtime=0) as out:
+                    shutil.copyfileobj(src, out)
+        after = path.stat()
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            tmp.unlink()
+            return None
+        os.utime(tmp, ns=(before.st_atime_ns, before.st_mtime_ns))
+        os.replace(tmp, dest)
+        path.unlink()
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return None
+    return dest
+
+
+def rotate(vault: Path, *, today: date | None = None, retention_days: int = RETENTION_DAYS) -> dict:
+    """Compress closed days and delete segments past retention.
+
+    A day is closed once it is before ``today`` and its file has been quiet
+    for ``ROTATE_GRACE_SECONDS`` (the background sink may still be writing
+    events logged just before midnight).
+    """
+    base = telemetry_dir(vault)
+    summary = {"compressed": 0, "deleted": 0}
+    if not base.is_dir():
+        return summary
+    today = today or datetime.now().astimezone().date()
+    cutoff = today - timedelta(days=retention_days)
+    quiet_before = time.time() - ROTATE_GRACE_SECONDS
+    for path in sorted(base.iterdir()):
+        m = _SEGMENT_RE.match(path.name)
+        if m is None or not path.is_file():
+            continue
+        try:
+            day = date.fromisoformat(m.group("day"))
+        except ValueError:
+            continue
+        if day < cutoff:
+            try:
+                path.unlink()
+                summary["deleted"] += 1
+            except OSError:
+                pass
+            continue
+        if m.group("suffix") or day >= today:
+            continue
+        try:
+            if path.stat().st_mtime > quiet_before:
+                continue
+        except OSError:
+            continue
+        if compress_segment(path) is not None:
+            summary["compressed"] += 1
+    return summary
+
+
+_rotation_started: set[str] = set()
+
+
+def rotate_in_background(vault: Path) -> None:
+    """Run ``rotate`` once per workspace per process on a daemon thread."""
+    if not vault or os.environ.get("TARS_DISABLE_TELEMETRY"):
+        return
+    key = str(vault)
+    if key in _rotation_started:
+        return
+    _rotation_started.add(key)
+    threading.Thread(target=rotate, args=(Path(vault),), name="tars-telemetry-rotate", daemon=True).start()
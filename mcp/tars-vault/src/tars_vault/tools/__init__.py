@@ -31,6 +31,7 @@ from . import (
     scaffold_workspace,
     search_by_tag,
     semantic_search,
+    suggest_entities,
     update_frontmatter,
     validate_extension,
     workspace_map,
@@ -66,6 +67,7 @@ __all__ = [
     "scaffold_workspace",
     "search_by_tag",
     "semantic_search",
+    "suggest_entities",
     "update_frontmatter",
     "validate_extension",
     "workspace_map",
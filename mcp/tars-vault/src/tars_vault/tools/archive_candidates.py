@@ -1,17 +1,48 @@
-"""archive_candidates — Review-gated lifecycle archival dry-run."""
+"""archive_candidates — Review-gated lifecycle archival dry-run.
+
+The scan runs `scripts/archive.py` in a subprocess bounded by the call's
+deadline (60s when none is given) and killed promptly if the client cancels.
+"""
 from __future__ import annotations
 
 import json
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Any
 
 from .. import _common
+from .. import call_context
+from .. import tracing
 
 
 ROOT = Path(__file__).resolve().parents[5]
 VALID_CHECKS = {"all", "memory", "workflows", "inbox"}
+SCAN_TIMEOUT_SECONDS = 60.0
+_POLL_SECONDS = 0.25
+
+
+def _run_scan(cmd: list[str]) -> tuple[int, str, str] | None:
+    """Run the archive scan; None when the call budget ran out first."""
+    deadline = time.monotonic() + (call_context.remaining(SCAN_TIMEOUT_SECONDS) or 0.0)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=tracing.child_env())
+    while True:
+        left = deadline - time.monotonic()
+        try:
+            stdout, stderr = proc.communicate(timeout=max(min(_POLL_SECONDS, left), 0.0))
+            return proc.returncode, stdout, stderr
+        except subprocess.TimeoutExpired:
+            if time.monotonic() < deadline and call_context.checkpoint():
+                call_context.tick(message="Running archive scan")
+                continue
+            proc.kill()
+            proc.communicate()
+            ctx = call_context.current()
+            if ctx is None:
+                raise
+            ctx.mark_truncated("deadline")
+            return None
 
 
 def archive_candidates(**kwargs: Any) -> dict:
@@ -31,24 +62,24 @@ def archive_candidates(**kwargs: Any) -> dict:
     if not script.is_file():
         return _common.error("archive.py not found")
 
-    result = subprocess.run(
-        [sys.executable, str(script), "--vault", str(vault_p), "--json", "--check", check],
-        capture_output=True,
-        text=True,
-        timeout=60,
-    )
-    if result.returncode != 0:
-        return _common.error(result.stderr.strip() or "archive candidate scan failed")
+    scan = _run_scan([sys.executable, str(script), "--vault", str(vault_p), "--json", "--check", check])
+    if scan is None:
+        return _common.ok(checks=[], summary={}, active_limit=active_limit)
+    returncode, stdout, stderr = scan
+    if returncode != 0:
+        return _common.error(stderr.strip() or "archive candidate scan failed")
     try:
-        payload = json.loads(result.stdout)
+        payload = json.loads(stdout)
     except json.JSONDecodeError as exc:
         return _common.error(f"archive candidate scan returned invalid JSON: {exc}")
 
-    active_count = sum(
-        1
-        for path in vault_p.rglob("*.md")
-        if not str(path.relative_to(vault_p)).replace("\\", "/").startswith(("_system/", "archive/"))
-    )
+    active_count = 0
+    for path in vault_p.rglob("*.md"):
+        if not call_context.checkpoint():
+            break
+        call_context.tick(message="Counting active notes")
+        if not str(path.relative_to(vault_p)).replace("\\", "/").startswith(("_system/", "archive/")):
+            active_count += 1
     payload["active_file_count"] = active_count
     payload["active_limit"] = active_limit
     payload["over_active_limit"] = active_count > active_limit
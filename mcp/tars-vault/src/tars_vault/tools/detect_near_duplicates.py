@@ -22,6 +22,7 @@ from pathlib import Path
 from typing import Any
 
 from .. import _common
+from .. import call_context
 
 
 def _norm_name(name: str) -> str:
@@ -57,6 +58,9 @@ def detect_near_duplicates(**kwargs: Any) -> dict:
     by_body_prefix: dict[str, list[str]] = defaultdict(list)
 
     for md in target.rglob("*.md"):
+        if not call_context.checkpoint():
+            break
+        call_context.tick(message="Hashing notes")
         rel = str(md.relative_to(vault_p))
         try:
             text = md.read_text(encoding="utf-8")
@@ -5,6 +5,7 @@ import re
 from typing import Any
 
 from .. import _common
+from .. import call_context
 from ..activity_ledger import iter_markdown, note_date
 
 
@@ -40,7 +41,12 @@ def entity_timeline(**kwargs: Any) -> dict:
     needle = query.lower()
     entries: list[dict[str, Any]] = []
 
-    for md in iter_markdown(vault_p, include_archive=True):
+    notes = iter_markdown(vault_p, include_archive=True)
+    call_context.expect(len(notes))
+    for md in notes:
+        if not call_context.checkpoint():
+            break
+        call_context.tick(message="Searching notes")
         try:
             text = md.read_text(encoding="utf-8")
         except (OSError, UnicodeDecodeError):
@@ -6,9 +6,11 @@ workspace before use.
 """
 from __future__ import annotations
 
+import os
 import re
 import shutil
-from fnmatch import fnmatch
+import threading
+from fnmatch import translate
 from pathlib import Path
 from typing import Any
 
@@ -543,14 +545,117 @@ def _normalize_relpath(path: str) -> str:
     return str(path).replace("\\", "/").lstrip("/")
 
 
-def _path_matches(pattern: str, relpath: str) -> bool:
-    pattern = _normalize_relpath(pattern)
-    relpath = _normalize_relpath(relpath)
-    return fnmatch(relpath, pattern) or fnmatch(relpath.removesuffix(".md"), pattern.removesuffix(".md"))
-
-
-def _tag_matches(pattern: str, tag: str) -> bool:
-    return fnmatch(str(tag), str(pattern))
+def _glob_alternative(name: str, pattern: str) -> str:
+    """``fnmatch.translate`` wrapped in a named group, safe to join with others.
+
+    Python 3.10's translate emits ``(?P<gN>...)`` helper groups, which would
+    collide across patterns; they are renamed into this alternative's namespace.
+    """
+    body = translate(os.path.normcase(pattern))
+    body = re.sub(r"\(\?P([<=])(g\d+)", lambda m: f"(?P{m.group(1)}{name}_{m.group(2)}", body)
+    return f"(?P<{name}>{body})"
+
+
+class OwnershipMatcher:
+    """Enabled ``fail_closed`` ownership policies compiled for the write path.
+
+    All workspace-path globs become one alternation regex (plus a second that
+    matches ``.md``-stripped paths against ``.md``-stripped globs) and all tag
+    globs a third, so a check is a few ``re.match`` calls regardless of how many
+    extensions are enabled. Alternatives are ordered policy by policy, paths
+    before tags, which preserves the first-match-wins result of the original
+    loop: the lowest-ranked hit is the owner that blocks.
+    """
+
+    def __init__(self, policies: list[dict[str, Any]]) -> None:
+        self.policies = [p for p in policies if p.get("enforcement") == "fail_closed"]
+        self._ranks: dict[str, tuple[tuple[int, int, int], int, str]] = {}
+        paths: list[str] = []
+        stems: list[str] = []
+        tags: list[str] = []
+        for index, policy in enumerate(self.policies):
+            for j, pattern in enumerate(policy.get("workspace_paths", [])):
+                name = f"p{index}_{j}"
+                normalized = _normalize_relpath(str(pattern))
+                paths.append(_glob_alternative(name, normalized))
+                stems.append(_glob_alternative(name, normalized.removesuffix(".md")))
+                self._ranks[name] = ((index, 0, j), index, f"path:{pattern}")
+            for j, pattern in enumerate(policy.get("tags", [])):
+                name = f"t{index}_{j}"
+                tags.append(_glob_alternative(name, str(pattern)))
+                self._ranks[name] = ((index, 1, j), index, f"tag:{pattern}")
+        self._path_re = re.compile("|".join(paths)) if paths else None
+        self._stem_re = re.compile("|".join(stems)) if stems else None
+        self._tag_re = re.compile("|".join(tags)) if tags else None
+
+    def match(self, relpath: str, tags: list[str]) -> tuple[dict[str, Any], str] | None:
+        """Return ``(policy, matched_by)`` for the first owning policy, if any."""
+        hits: list[tuple[tuple[int, int, int], int, str]] = []
+        if relpath:
+            relpath = os.path.normcase(relpath)
+            for regex, subject in ((self._path_re, relpath), (self._stem_re, relpath.removesuffix(".md"))):
+                m = regex.match(subject) if regex is not None else None
+                if m is not None:
+                    hits.append(self._ranks[m.lastgroup])
+        if self._tag_re is not None:
+            for tag in tags:
+                m = self._tag_re.match(os.path.normcase(tag))
+                if m is not None:
+                    hits.append(self._ranks[m.lastgroup])
+        if not hits:
+            return None
+        _rank, index, matched_by = min(hits)
+        return self.policies[index], matched_by
+
+
+_MATCHER_LOCK = threading.Lock()
+_MATCHERS: dict[str, tuple[tuple[Path, ...], tuple[Any, ...], OwnershipMatcher]] = {}
+
+
+def _stat_signature(paths: tuple[Path, ...]) -> tuple[Any, ...]:
+    out: list[Any] = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            out.append(None)
+            continue
+        out.append((st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def _policy_inputs(vault: Path) -> tuple[Path, ...]:
+    """Files whose changes can alter ``ownership_policies(vault)``."""
+    inputs = [registry_path(vault)]
+    for ext_dir in registered_extension_dirs(vault).values():
+        inputs.extend((ext_dir, ext_dir / "extension.yaml"))
+        entrypoints = load_manifest(ext_dir).get("entrypoints")
+        instructions = entrypoints.get("instructions") if isinstance(entrypoints, dict) else None
+        target = _safe_entrypoint(ext_dir, str(instructions)) if instructions else None
+        if target is not None:
+            inputs.append(target)
+    return tuple(inputs)
+
+
+def ownership_matcher(vault: Path) -> OwnershipMatcher:
+    """Return the compiled matcher for ``vault``, rebuilt only when inputs change.
+
+    Validity is a handful of ``stat`` calls: the registry, each registered
+    extension directory and manifest, and each instructions entrypoint.
+    """
+    key = str(vault)
+    with _MATCHER_LOCK:
+        cached = _MATCHERS.get(key)
+    if cached is not None:
+        inputs, signature, matcher = cached
+        if _stat_signature(inputs) == signature:
+            return matcher
+    inputs = _policy_inputs(vault)
+    signature = _stat_signature(inputs)
+    matcher = OwnershipMatcher(ownership_policies(vault))
+    with _MATCHER_LOCK:
+        _MATCHERS[key] = (inputs, signature, matcher)
+    return matcher
 
 
 def blocking_workspace_owner(
@@ -563,30 +668,19 @@ def blocking_workspace_owner(
     """Return the fail-closed owner that blocks a workspace mutation, if any."""
     relpath = _normalize_relpath(path or "")
     tag_list = [str(tag) for tag in (tags or [])]
-    for policy in ownership_policies(vault):
-        if policy.get("enforcement") != "fail_closed":
-            continue
-        matched_by = ""
-        for pattern in policy.get("workspace_paths", []):
-            if relpath and _path_matches(str(pattern), relpath):
-                matched_by = f"path:{pattern}"
-                break
-        if not matched_by:
-            for pattern in policy.get("tags", []):
-                if any(_tag_matches(str(pattern), tag) for tag in tag_list):
-                    matched_by = f"tag:{pattern}"
-                    break
-        if matched_by:
-            return {
-                "extension_id": policy.get("extension_id"),
-                "name": policy.get("name"),
-                "capabilities": policy.get("capabilities", []),
-                "enforcement": policy.get("enforcement"),
-                "matched_by": matched_by,
-                "operation": operation,
-                "tool_contract": (policy.get("entrypoints") or {}).get("tool_contract", ""),
-            }
-    return None
+    hit = ownership_matcher(vault).match(relpath, tag_list)
+    if hit is None:
+        return None
+    policy, matched_by = hit
+    return {
+        "extension_id": policy.get("extension_id"),
+        "name": policy.get("name"),
+        "capabilities": policy.get("capabilities", []),
+        "enforcement": policy.get("enforcement"),
+        "matched_by": matched_by,
+        "operation": operation,
+        "tool_contract": (policy.get("entrypoints") or {}).get("tool_contract", ""),
+    }
 
 
 def owned_write_error(owner: dict[str, Any]) -> dict[str, Any]:
@@ -2,12 +2,15 @@
 
 Arguments (all via kwargs):
   vault:  required. Absolute vault path (auto-injected by the server).
-  text:   required. The reference text the caller wants to link to.
+  text:   the reference text the caller wants to link to.
+  texts:  alternatively, a list of reference texts to format in one call.
   kind:   optional. Entity kind hint: person, vendor, competitor, product,
           initiative, decision, org-context. Restricts alias lookups.
 
-Returns the dict produced by :func:`tars_vault.wikilink.format_wikilink`.
-See that module for the full status taxonomy.
+Exactly one of ``text`` / ``texts`` is required. ``text`` returns the dict
+produced by :func:`tars_vault.wikilink.format_wikilink`; ``texts`` returns
+``{status: "ok", results: [{text, ...}, ...]}`` with one such dict per input,
+in order. See that module for the full status taxonomy.
 """
 from __future__ import annotations
 
@@ -15,18 +18,29 @@ from typing import Any
 
 from .. import _common
 from ..wikilink import format_wikilink as _format_wikilink
+from ..wikilink import format_wikilinks as _format_wikilinks
+
+MAX_TEXTS = 500
 
 
 def format_wikilink(**kwargs: Any) -> dict:
     vault = kwargs.get("vault")
     text = kwargs.get("text")
+    texts = kwargs.get("texts")
     kind = kwargs.get("kind")
 
     if not vault:
         return _common.error("missing 'vault' path")
-    if text is None:
+    if text is not None and texts is not None:
+        return _common.error("pass either 'text' or 'texts', not both")
+    if texts is not None:
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            return _common.error("'texts' must be a list of strings")
+        if len(texts) > MAX_TEXTS:
+            return _common.error(f"'texts' accepts at most {MAX_TEXTS} entries")
+    elif text is None:
         return _common.error("missing 'text' argument")
-    if not isinstance(text, str):
+    elif not isinstance(text, str):
         return _common.error("'text' must be a string")
 
     try:
@@ -34,4 +48,7 @@ def format_wikilink(**kwargs: Any) -> dict:
     except ValueError as exc:
         return _common.error(str(exc))
 
+    if texts is not None:
+        results = _format_wikilinks(texts, vault=vault_p, kind=kind)
+        return _common.ok(results=[{"text": t, **r} for t, r in zip(texts, results)])
     return _format_wikilink(text, vault=vault_p, kind=kind)
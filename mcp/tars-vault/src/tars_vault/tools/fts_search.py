@@ -15,6 +15,12 @@ Arguments:
                  Wins over scope if set.
   limit:         optional. Default 10. Hard-capped to 50.
 
+On a sharded index the query runs against ``search.db`` and every shard the
+tier / source types allow, in parallel. Each database's bm25 scores are
+scaled by its best hit before the merge (``search_index.merge_fts``), so a
+row's ``score`` runs from -1.0 (a database's top hit) toward 0 and ``bm25``
+keeps the raw value.
+
 Returns:
   {"status": "ok",       "results": [...]}                — index present
   {"status": "no_index", "results": [], "reason": "..."}  — index missing
@@ -84,13 +90,13 @@ def fts_search(**kwargs: Any) -> dict:
     except (TypeError, ValueError):
         limit = 10
 
-    conn, _ = si.open_index(db_path, load_vec=False)
+    targets = si.search_targets(vault_path, tier=tier, source_types=source_types)
     try:
-        rows = si.fts_query(
-            conn, query, tier=tier, source_types=source_types, limit=limit
+        per_db = si.fan_out(
+            targets,
+            lambda conn, _vec: si.fts_query(conn, query, tier=tier, source_types=source_types, limit=limit),
         )
     except Exception as exc:
-        conn.close()
         return {"status": "error", "results": [], "reason": f"fts query failed: {exc}"}
-    conn.close()
+    rows = si.merge_fts(per_db, limit)
     return {"status": "ok", "results": rows, "count": len(rows)}
@@ -60,9 +60,19 @@ def refresh_integrations(**kwargs: Any) -> dict:
             f"{result.stderr.strip() or result.stdout.strip()}"
         )
 
+    # The script pretty-prints its payload; older builds emitted one line
+    # after log output, so fall back to the last line.
+    stdout = result.stdout.strip()
     try:
-        payload = json.loads(result.stdout.strip().splitlines()[-1])
-    except (json.JSONDecodeError, IndexError):
+        payload = json.loads(stdout)
+    except json.JSONDecodeError:
+        payload = None
+    if not isinstance(payload, dict):
+        try:
+            payload = json.loads(stdout.splitlines()[-1])
+        except (json.JSONDecodeError, IndexError):
+            payload = None
+    if not isinstance(payload, dict):
         return _common.error(
             f"discover-mcp-tools.py produced non-JSON output: "
             f"{result.stdout.strip()[:400]}"
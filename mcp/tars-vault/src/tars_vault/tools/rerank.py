@@ -1,19 +1,34 @@
-"""rerank — deterministic score-based rerank of merged hybrid results.
+"""rerank — cross-encoder or deterministic score-based rerank of hybrid results.
 
 Phase 4 implementation (PRD §6.5). PRD §6.5 notes an optional Haiku-backed
 LLM rerank. Running that from inside the MCP server means calling the
 Anthropic API with a key provisioned on the user's machine; until that wiring
-lands we ship a deterministic score-based rerank with recency and tier boosts.
-The orchestrating skill (`/answer`, `/meeting`) can still layer an LLM rerank
-on top by spawning a sub-agent — that path is unaffected.
+lands we ship a local rerank instead. The orchestrating skill (`/answer`,
+`/meeting`) can still layer an LLM rerank on top by spawning a sub-agent —
+that path is unaffected.
+
+With a ``query``, a ``vault``, and FastEmbed's ONNX cross-encoder
+(``CROSS_ENCODER_MODEL``) already in ``_system/embedding-cache`` (fetched by
+``build-search-index.py --reranker``; nothing is downloaded at query time),
+each (query, chunk text) pair is scored in batches of
+``CROSS_ENCODER_BATCH``. The sigmoid of that score replaces the hybrid score
+as the base the boosts multiply. If the model is missing or the pairs cannot
+all be scored within ``budget_ms`` (also capped by the call's deadline), the
+deterministic score-based rerank runs instead and ``fallback_reason`` says
+why.
 
 Arguments:
   candidates:   required list of result dicts (from fts_search / semantic_search)
                 each with at least: {path, score | hybrid_score, source_type, date}.
-  query:        optional string — reserved for a future LLM path; unused in
-                the deterministic reranker beyond echoing in telemetry.
+                ``results`` is accepted as an alias (a search response's key).
+  query:        optional string — enables the cross-encoder.
+  vault:        optional vault path — locates the model cache.
   top_k:        optional. Default 10. Hard-capped to 50.
   today:        optional "YYYY-MM-DD" for deterministic recency in tests.
+  cross_encoder: optional bool, default true. False forces the deterministic
+                path.
+  budget_ms:    optional cross-encoder latency budget; default
+                ``CROSS_ENCODER_BUDGET_MS``.
 
 Boosts (all applied multiplicatively over the hybrid score):
   * +1.15  same-day (date == today)
@@ -22,19 +37,33 @@ Boosts (all applied multiplicatively over the hybrid score):
   * +1.10  source_type in {"transcript", "journal"} (evidence trail)
 
 Returns:
-  {"status": "ok", "results": [...ranked...], "count": N, "mode": "deterministic"}
+  {"status": "ok", "results": [...ranked...], "count": N,
+   "mode": "cross_encoder" | "deterministic", "fallback_reason": "..."?}
 """
 from __future__ import annotations
 
+import math
+import threading
+import time
 from datetime import date, timedelta
+from pathlib import Path
 from typing import Any
 
+from .. import call_context
+
 
 MAX_K = 50
+CROSS_ENCODER_MODEL = "Xenova/ms-marco-MiniLM-L-6-v2"
+CROSS_ENCODER_BATCH = 16
+CROSS_ENCODER_BUDGET_MS = 1500
+CROSS_ENCODER_MAX_CHARS = 2000  # the model truncates at 512 tokens anyway
+
+_encoders: dict[str, Any] = {}
+_encoders_lock = threading.Lock()
 
 
 def rerank(**kwargs: Any) -> dict:
-    candidates = kwargs.get("candidates")
+    candidates = kwargs.get("candidates", kwargs.get("results"))
     if not isinstance(candidates, (list, tuple)):
         return {
             "status": "error",
@@ -50,26 +79,103 @@ def rerank(**kwargs: Any) -> dict:
     today_str = kwargs.get("today")
     today = _parse_date(today_str) if today_str else date.today()
 
+    rows = [row for row in candidates if isinstance(row, dict)]
+    query = kwargs.get("query")
+    vault = kwargs.get("vault")
+    logits, fallback_reason = None, None
+    if rows and query and isinstance(query, str) and vault and kwargs.get("cross_encoder", True):
+        budget_ms = kwargs.get("budget_ms", CROSS_ENCODER_BUDGET_MS)
+        try:
+            budget = max(float(budget_ms), 0.0) / 1000.0
+        except (TypeError, ValueError):
+            return {"status": "error", "results": [], "reason": "budget_ms must be a number"}
+        logits, fallback_reason = _cross_encode(Path(vault).expanduser(), query, rows, call_context.remaining(budget))
+
     enriched: list[dict] = []
-    for row in candidates:
-        if not isinstance(row, dict):
-            continue
-        base = _base_score(row)
+    for i, row in enumerate(rows):
+        base = _sigmoid(logits[i]) if logits is not None else _base_score(row)
         boost = _recency_boost(row.get("date"), today) * _source_boost(row.get("source_type"))
         final = base * boost
         entry = dict(row)
         entry["rerank_score"] = final
         entry["rerank_boost"] = boost
         entry["rerank_base"] = base
+        if logits is not None:
+            entry["cross_encoder_score"] = logits[i]
         enriched.append(entry)
 
     enriched.sort(key=lambda r: r["rerank_score"], reverse=True)
-    return {
+    out = {
         "status": "ok",
         "results": enriched[:top_k],
         "count": min(len(enriched), top_k),
-        "mode": "deterministic",
+        "mode": "cross_encoder" if logits is not None else "deterministic",
     }
+    if fallback_reason:
+        out["fallback_reason"] = fallback_reason
+    return out
+
+
+def _cross_encode(vault: Path, query: str, rows: list[dict], budget: float) -> tuple[list[float] | None, str | None]:
+    """Score every row against ``query`` within ``budget`` seconds.
+
+    Returns ``(scores, None)``, or ``(None, reason)`` when the model is not
+    cached locally or the next batch would overrun the budget (judged by the
+    slowest batch so far).
+    """
+    started = time.perf_counter()
+    encoder = _load_encoder(vault)
+    if encoder is None:
+        return None, f"cross-encoder {CROSS_ENCODER_MODEL} not available locally"
+    texts = [_rerank_text(row)[:CROSS_ENCODER_MAX_CHARS] for row in rows]
+    scores: list[float] = []
+    slowest = 0.0
+    try:
+        for i in range(0, len(texts), CROSS_ENCODER_BATCH):
+            if time.perf_counter() - started + slowest > budget:
+                return None, f"cross-encoder budget of {round(budget * 1000)} ms exhausted"
+            batch_started = time.perf_counter()
+            batch = texts[i:i + CROSS_ENCODER_BATCH]
+            scores.extend(float(s) for s in encoder.rerank(query, batch, batch_size=len(batch)))
+            slowest = max(slowest, time.perf_counter() - batch_started)
+    except Exception as exc:
+        return None, f"cross-encoder failed: {exc}"
+    return scores, None
+
+
+def _load_encoder(vault: Path):
+    """Load (once per process) the cached cross-encoder; None if not cached.
+
+    ``local_files_only`` keeps the query path off the network: a missing
+    model is reported, not downloaded.
+    """
+    cache = str(vault / "_system" / "embedding-cache")
+    with _encoders_lock:
+        if cache in _encoders:
+            return _encoders[cache]
+    try:
+        from fastembed.rerank.cross_encoder import TextCrossEncoder  # type: ignore
+    except Exception:
+        return None
+    try:
+        encoder = TextCrossEncoder(model_name=CROSS_ENCODER_MODEL, cache_dir=cache, local_files_only=True)
+    except Exception:
+        return None
+    with _encoders_lock:
+        _encoders[cache] = encoder
+    return encoder
+
+
+def _rerank_text(row: dict) -> str:
+    text = row.get("text") or row.get("snippet") or ""
+    title = row.get("title")
+    return f"{title}\n{text}" if title and title not in text else str(text)
+
+
+def _sigmoid(value: float) -> float:
+    if value < -60:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-value))
 
 
 def _base_score(row: dict) -> float:
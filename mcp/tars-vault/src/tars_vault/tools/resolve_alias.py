@@ -13,6 +13,8 @@ def _candidate(entry: alias_registry.AliasEntry) -> dict[str, Any]:
         "canonical": entry.canonical,
         "wikilink": f"[[{entry.canonical}]]",
         "kind": entry.kind,
+        "source": entry.source,
+        "path": entry.path,
         "contexts": [
             {"keyword": keyword, "canonical": canonical, "wikilink": f"[[{canonical}]]"}
             for keyword, canonical in entry.contexts
@@ -44,24 +46,25 @@ def resolve_alias(**kwargs: Any) -> dict:
             canonical=None,
             wikilink=None,
             candidates=[],
-            reason="No alias registry entry matched.",
+            reason="No alias registry entry or note alias matched.",
         )
 
     if context:
         needle = normalize_text(str(context)).lower()
         context_matches: list[dict[str, Any]] = []
-        for entry in matches:
-            for keyword, canonical in entry.contexts:
-                if keyword and keyword in needle:
-                    context_matches.append(
-                        {
-                            "alias": entry.alias,
-                            "canonical": canonical,
-                            "wikilink": f"[[{canonical}]]",
-                            "kind": entry.kind,
-                            "matched_context": keyword,
-                        }
-                    )
+        overrides = alias_registry.load_index(vault_p).overrides.get(matches[0].alias, [])
+        for keyword, canonical, entry in overrides:
+            if keyword and keyword in needle and any(entry is m for m in matches):
+                context_matches.append(
+                    {
+                        "alias": entry.alias,
+                        "canonical": canonical,
+                        "wikilink": f"[[{canonical}]]",
+                        "kind": entry.kind,
+                        "source": entry.source,
+                        "matched_context": keyword,
+                    }
+                )
         if len(context_matches) == 1:
             return _common.ok(resolution_status="resolved", **context_matches[0])
         if len(context_matches) > 1:
@@ -2,7 +2,9 @@
 
 This tool is intentionally light: if it can be called, the TARS local helper is
 connected. It reports required runtime state and optional search enhancements
-without mutating the workspace.
+without mutating the workspace. With ``perf=true`` it also returns the
+server's per-tool latency percentiles (see ``tars_vault.perf``) and the
+background telemetry sink's queue and drop counters.
 """
 from __future__ import annotations
 
@@ -12,6 +14,8 @@ from pathlib import Path
 from typing import Any
 
 from .. import _common
+from .. import perf as _perf
+from .. import telemetry as _telemetry
 
 
 def runtime_info(**kwargs: Any) -> dict:
@@ -51,6 +55,10 @@ def runtime_info(**kwargs: Any) -> dict:
 
     errors = [c for c in checks if c["status"] == "error"]
     warnings = [c for c in checks if c["status"] == "warning"]
+    extra: dict[str, Any] = {}
+    if kwargs.get("perf"):
+        extra["perf"] = _perf.RECORDER.report()
+        extra["perf"]["telemetry"] = _telemetry.SINK.stats()
     return _common.ok(
         helper="connected",
         required_runtime="ok" if not errors else "error",
@@ -58,4 +66,5 @@ def runtime_info(**kwargs: Any) -> dict:
         errors=len(errors),
         warnings=len(warnings),
         checks=checks,
+        **extra,
     )
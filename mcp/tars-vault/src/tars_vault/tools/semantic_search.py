@@ -2,9 +2,9 @@
 
 Phase 4 implementation (PRD §6.1, §6.5, §26.12).
 
-Runs FastEmbed (``BAAI/bge-small-en-v1.5`` by default, fallback
-``sentence-transformers/all-MiniLM-L6-v2``) on the query, KNN-searches
-``vec_chunks``, and linearly merges those hits with FTS5 results from the same
+Embeds the query with the model of the index's active embedding space (see
+``search_index`` — never a different model, which would compare vectors
+across spaces), KNN-searches that space, and linearly merges those hits with FTS5 results from the same
 scope using the hybrid 0.7 × semantic + 0.3 × FTS weighting specified in §6.1.
 
 Arguments:
@@ -14,7 +14,23 @@ Arguments:
                 Defaults to "all" (Tier B).
   top_k:        optional. Default 10. Hard-capped to 50.
   date_range:   optional {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}. Applied
-                post-query to chunk metadata.
+                inside the FTS and KNN queries, so a narrow window still
+                returns up to ``top_k`` matches from that window.
+  semantic_weight: optional 0..1 share of the semantic score in the merge
+                (FTS gets the rest). Defaults to ``SEMANTIC_WEIGHT``; exposed
+                so ``scripts/eval-search.py`` can measure alternatives.
+
+Without the sqlite-vec extension the KNN runs against the flat-file
+``vector_store`` (NumPy memmap) when the build wrote one; ``vector_backend``
+in the response says which was used and ``model`` names the space.
+
+On a sharded index (``build-search-index.py --layout sharded``) the query
+is embedded once and run in parallel against ``search.db`` and every
+``<source_type>-<year>`` shard the scope and ``date_range`` overlap; the
+per-shard FTS and KNN hits are merged before the hybrid merge.
+
+Every response carries ``timings_ms`` ({fts, embed, vector, merge}) so
+callers and the eval harness can attribute latency per stage.
 
 Returns:
   {"status": "ok",        "results": [...], "fallback": null}
@@ -25,15 +41,20 @@ Returns:
 """
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
 from typing import Any
 
 from .. import search_index as si
+from .. import vector_store as _vector_store
 
 
+_embedders: dict[tuple[str, str], Any] = {}
+_embedders_lock = threading.Lock()
+
 MAX_K = 50
 SEMANTIC_WEIGHT = 0.7
-FTS_WEIGHT = 0.3
 
 SCOPE_TO_SOURCE_TYPES = {
     "journal": ["journal"],
@@ -66,9 +87,21 @@ def semantic_search(**kwargs: Any) -> dict:
     except (TypeError, ValueError):
         top_k = 10
 
+    semantic_weight = kwargs.get("semantic_weight")
+    if semantic_weight is None:
+        semantic_weight = SEMANTIC_WEIGHT
+    try:
+        semantic_weight = max(0.0, min(float(semantic_weight), 1.0))
+    except (TypeError, ValueError):
+        return {"status": "error", "results": [], "reason": "semantic_weight must be a number between 0 and 1"}
+
     date_range = kwargs.get("date_range")
     if date_range is None and (kwargs.get("since") or kwargs.get("until")):
         date_range = {"start": kwargs.get("since"), "end": kwargs.get("until")}
+    if date_range is not None and not isinstance(date_range, dict):
+        return {"status": "error", "results": [], "reason": "date_range must be an object with start / end"}
+    date_start = (date_range or {}).get("start") or None
+    date_end = (date_range or {}).get("end") or None
 
     vault_path = Path(vault).expanduser()
     db_path = si.index_path(vault_path)
@@ -79,36 +112,76 @@ def semantic_search(**kwargs: Any) -> dict:
             "reason": f"index not built yet at {db_path} — run scripts/build-search-index.py --apply",
         }
 
-    conn, vec_enabled = si.open_index(db_path, load_vec=True)
+    timings = {"fts": 0.0, "embed": 0.0, "vector": 0.0, "merge": 0.0}
+    conn, vec_enabled = si.open_index(db_path, load_vec=True, read_only=True)
     try:
-        fts_rows = _safe_fts(conn, query, source_types, top_k * 2)
-        sem_rows: list[dict] = []
-        fallback = None
-        if vec_enabled:
-            try:
-                embedder = _load_embedder(vault_path)
-                if embedder is None:
-                    fallback = "fts_only"
-                else:
-                    query_vec = embedder.embed([query])[0]
-                    sem_rows = si.semantic_query(
-                        conn, query_vec,
-                        source_types=source_types, limit=top_k * 2,
-                    )
-            except Exception as exc:
-                fallback = "fts_only"
-                fallback_reason = f"semantic layer error: {exc}"
-        else:
-            fallback = "fts_only"
-            fallback_reason = "sqlite-vec extension unavailable"
+        space, store = _query_space(conn, vault_path, vec_enabled)
     finally:
         conn.close()
+    fallback = None
+    query_vec = None
+    backend = None if space is None else ("sqlite-vec" if vec_enabled else "numpy-mmap")
+    if backend:
+        try:
+            started = time.perf_counter()
+            embedder = _load_embedder(vault_path, space["model"])
+            if embedder is None:
+                fallback = "fts_only"
+                fallback_reason = f"embedding model {space['model']} (active space) could not be loaded"
+            else:
+                query_vec = list(next(iter(embedder.embed([query]))))
+                if len(query_vec) != int(space["dim"]):
+                    raise ValueError(f"query embedding has {len(query_vec)} dims, space has {space['dim']}")
+                timings["embed"] = _ms_since(started)
+        except Exception as exc:
+            query_vec = None
+            fallback = "fts_only"
+            fallback_reason = f"semantic layer error: {exc}"
+    else:
+        fallback = "fts_only"
+        fallback_reason = (
+            "index has no embedding space yet" if vec_enabled
+            else "sqlite-vec extension unavailable and no NumPy vector store"
+        )
 
-    if date_range:
-        fts_rows = _filter_date(fts_rows, date_range)
-        sem_rows = _filter_date(sem_rows, date_range)
-
-    merged = _merge(sem_rows, fts_rows, top_k)
+    def per_db(conn, vec_ok):
+        started = time.perf_counter()
+        fts = _safe_fts(conn, query, source_types, top_k * 2, date_start, date_end)
+        fts_ms = _ms_since(started)
+        sem: list[dict] = []
+        error = None
+        started = time.perf_counter()
+        # A shard whose active space is not the main DB's model (mid-migration,
+        # or built before a switch) cannot be compared against this query.
+        if query_vec is not None and (store is not None or (vec_ok and _same_space(conn, space))):
+            try:
+                sem = si.semantic_query(
+                    conn, query_vec,
+                    source_types=source_types, date_start=date_start, date_end=date_end,
+                    limit=top_k * 2, store=store,
+                )
+            except Exception as exc:
+                error = str(exc)
+        return fts, fts_ms, sem, _ms_since(started), error
+
+    targets = si.search_targets(
+        vault_path, source_types=source_types, date_start=date_start, date_end=date_end
+    )
+    per_target = si.fan_out(targets, per_db, load_vec=vec_enabled)
+    fts_rows = si.merge_fts((fts for fts, *_ in per_target), top_k * 2)
+    sem_rows = sorted((row for _, _, sem, *_ in per_target for row in sem), key=lambda row: row["distance"])[: top_k * 2]
+    timings["fts"] = max(result[1] for result in per_target)
+    if query_vec is not None:
+        timings["vector"] = max(result[3] for result in per_target)
+    errors = [result[4] for result in per_target if result[4]]
+    if errors:
+        sem_rows = []
+        fallback = "fts_only"
+        fallback_reason = f"semantic layer error: {errors[0]}"
+
+    started = time.perf_counter()
+    merged = _merge(sem_rows, fts_rows, top_k, semantic_weight)
+    timings["merge"] = _ms_since(started)
     if fallback == "fts_only":
         return {
             "status": "fts_only",
@@ -116,60 +189,82 @@ def semantic_search(**kwargs: Any) -> dict:
             "fallback": "fts_only",
             "reason": locals().get("fallback_reason", "semantic layer unavailable"),
             "count": len(merged),
+            "timings_ms": timings,
         }
-    return {"status": "ok", "results": merged, "fallback": None, "count": len(merged)}
+    return {
+        "status": "ok",
+        "results": merged,
+        "fallback": None,
+        "count": len(merged),
+        "vector_backend": backend,
+        "model": space["model"],
+        "timings_ms": timings,
+    }
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
 
 
-def _safe_fts(conn, query: str, source_types, limit: int) -> list[dict]:
+def _safe_fts(conn, query: str, source_types, limit: int, date_start=None, date_end=None) -> list[dict]:
     try:
         return si.fts_query(
-            conn, query, tier="B", source_types=source_types, limit=limit
+            conn, query, tier="B", source_types=source_types,
+            date_start=date_start, date_end=date_end, limit=limit,
         )
     except Exception:
         return []
 
 
-def _load_embedder(vault_path: Path):
-    """Lazy-load a FastEmbed model. Returns None if unavailable."""
+def _query_space(conn, vault_path: Path, vec_enabled: bool):
+    """``(space, store)`` queries must use; space None means FTS only."""
+    if vec_enabled:
+        return si.active_space(conn), None
+    dim = int(si.get_meta(conn, "flat_dim") or si.EMBED_DIM)
+    store = _vector_store.open_store(vault_path, dim)
+    if store is None:
+        return None, None
+    return {"model": si.get_meta(conn, "flat_model") or si.DEFAULT_MODEL, "dim": dim}, store
+
+
+def _same_space(conn, space: dict) -> bool:
+    own = si.active_space(conn)
+    return own is not None and own["model"] == space["model"] and int(own["dim"]) == int(space["dim"])
+
+
+def _load_embedder(vault_path: Path, model: str):
+    """Load (once per process) the FastEmbed model of the active space.
+
+    No fallback to another model: its vectors would live in a different
+    space than the index. Returns None if unavailable.
+    """
+    cache = vault_path / "_system" / "embedding-cache"
+    key = (str(cache), model)
+    with _embedders_lock:
+        if key in _embedders:
+            return _embedders[key]
     try:
         from fastembed import TextEmbedding  # type: ignore
     except Exception:
         return None
-    cache = vault_path / "_system" / "embedding-cache"
     try:
-        return TextEmbedding(model_name="BAAI/bge-small-en-v1.5", cache_dir=str(cache))
+        embedder = TextEmbedding(model_name=model, cache_dir=str(cache))
     except Exception:
-        try:
-            return TextEmbedding(
-                model_name="sentence-transformers/all-MiniLM-L6-v2",
-                cache_dir=str(cache),
-            )
-        except Exception:
-            return None
-
-
-def _filter_date(rows: list[dict], date_range: dict) -> list[dict]:
-    start = date_range.get("start")
-    end = date_range.get("end")
-    out: list[dict] = []
-    for row in rows:
-        date = row.get("date") or ""
-        if start and date < start:
-            continue
-        if end and date > end:
-            continue
-        out.append(row)
-    return out
-
-
-def _merge(sem: list[dict], fts: list[dict], top_k: int) -> list[dict]:
-    """Hybrid merge per PRD §6.1 (0.7 semantic + 0.3 FTS).
+        return None
+    with _embedders_lock:
+        _embedders[key] = embedder
+    return embedder
+
+
+def _merge(sem: list[dict], fts: list[dict], top_k: int, semantic_weight: float = SEMANTIC_WEIGHT) -> list[dict]:
+    """Hybrid merge per PRD §6.1 (0.7 semantic + 0.3 FTS by default).
 
     FTS5 bm25 is lower = better (we negate and min-max normalise). sqlite-vec
     distance is lower = better (likewise). Chunked Tier-B FTS may match a whole
     document; we key on (path, chunk_index). Documents without a chunk match
     from FTS are keyed on (path, None) and contribute their doc-level score.
     """
+    fts_weight = 1.0 - semantic_weight
     scores: dict[tuple[str, int | None], dict] = {}
 
     if sem:
@@ -180,7 +275,7 @@ def _merge(sem: list[dict], fts: list[dict], top_k: int) -> list[dict]:
                 **row,
                 "semantic_score": s,
                 "fts_score": 0.0,
-                "hybrid_score": SEMANTIC_WEIGHT * s,
+                "hybrid_score": semantic_weight * s,
             }
 
     if fts:
@@ -189,7 +284,7 @@ def _merge(sem: list[dict], fts: list[dict], top_k: int) -> list[dict]:
             key = (row["path"], None)
             if key in scores:
                 scores[key]["fts_score"] = s
-                scores[key]["hybrid_score"] += FTS_WEIGHT * s
+                scores[key]["hybrid_score"] += fts_weight * s
             else:
                 # Propagate FTS score to every chunk of this path already scored
                 # via semantic. If none, surface the doc-level FTS snippet alone.
@@ -197,7 +292,7 @@ def _merge(sem: list[dict], fts: list[dict], top_k: int) -> list[dict]:
                 if chunk_keys:
                     for k in chunk_keys:
                         scores[k]["fts_score"] = s
-                        scores[k]["hybrid_score"] += FTS_WEIGHT * s
+                        scores[k]["hybrid_score"] += fts_weight * s
                         scores[k].setdefault("snippet", row.get("snippet"))
                 else:
                     scores[key] = {
@@ -209,7 +304,7 @@ def _merge(sem: list[dict], fts: list[dict], top_k: int) -> list[dict]:
                         "snippet": row.get("snippet"),
                         "semantic_score": 0.0,
                         "fts_score": s,
-                        "hybrid_score": FTS_WEIGHT * s,
+                        "hybrid_score": fts_weight * s,
                     }
 
     ranked = sorted(scores.values(), key=lambda r: r["hybrid_score"], reverse=True)
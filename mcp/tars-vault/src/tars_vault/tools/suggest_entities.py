@@ -0,0 +1,55 @@
+"""suggest_entities — Autocomplete entity names from a typed prefix.
+
+One call replaces the guess → ``resolve_alias`` → ``format_wikilink`` →
+``search_by_tag`` round trip when an agent only half-knows a name. Backed by
+the in-memory ``entity_index`` (refreshed incrementally), so lookups do not
+walk the vault.
+
+Arguments:
+  vault:   required. Absolute vault path (auto-injected by the server).
+  prefix:  required. Start of a basename, ``tars-name``, frontmatter alias, or
+           alias-registry entry — or of any later word in one ("riv" finds
+           "Dan Rivera").
+  kind:    optional. person | vendor | competitor | product | initiative |
+           decision | org-context.
+  limit:   optional. Default 10. Hard-capped to 50.
+
+Ranking: exact name, then whole-word prefix ("dan" → "Dan Rivera"), then
+partial prefix ("Dana Scott"), then a later word; ties go to more inbound
+wikilinks, then the more recent note date.
+
+Returns:
+  {"status": "ok", "prefix": "...", "results": [{basename, wikilink, path,
+   kind, matched, match_source, inbound_links, date}], "count": N}
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from .. import _common, entity_index
+
+MAX_LIMIT = 50
+
+
+def suggest_entities(**kwargs: Any) -> dict:
+    vault = kwargs.get("vault")
+    prefix = kwargs.get("prefix")
+    kind = kwargs.get("kind")
+    if not vault:
+        return _common.error("missing 'vault'")
+    if not prefix or not isinstance(prefix, str) or not prefix.strip():
+        return _common.error("missing 'prefix'")
+    if kind and kind not in entity_index.ENTITY_FOLDERS.values():
+        return _common.error(f"kind must be one of {sorted(entity_index.ENTITY_FOLDERS.values())}")
+    try:
+        limit = max(1, min(int(kwargs.get("limit", 10)), MAX_LIMIT))
+    except (TypeError, ValueError):
+        limit = 10
+
+    try:
+        vault_p = _common.resolve_vault_path(vault)
+    except ValueError as exc:
+        return _common.error(str(exc))
+
+    results = entity_index.get_index(vault_p).suggest(prefix, kind=kind or None, limit=limit)
+    return _common.ok(prefix=prefix, results=results, count=len(results))
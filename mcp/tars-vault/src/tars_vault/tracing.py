@@ -0,0 +1,179 @@
+"""Lightweight trace spans across hooks, tool calls, and helper scripts.
+
+Opt-in: spans are recorded only when ``TARS_TRACE=1`` (or a trace id is
+already in the environment). Each finished span is one line in
+``_system/telemetry/traces-YYYY-MM-DD.jsonl``:
+
+    {"trace_id": "...", "span_id": "...", "parent_id": "...", "name": "tool.read_note",
+     "proc": "tars-vault", "ts_us": 1760000000000000, "dur_us": 1234,
+     "pid": 4242, "tid": 1, "status": "ok", "attrs": {...}}
+
+Propagation:
+
+  - across processes: ``TARS_TRACE_ID`` / ``TARS_PARENT_SPAN_ID`` in the
+    environment (``child_env()`` builds it for a subprocess);
+  - from a session: ``TARS_SESSION_ID`` in the environment, hashed by
+    ``trace_id_for_session()`` exactly as the hooks hash their event's
+    ``session_id``;
+  - into the server: a reserved ``_trace`` tool argument
+    (``{"trace_id": ..., "parent_span_id": ...}`` or ``{"session_id": ...}``)
+    that ``server`` pops before schema validation;
+  - within a process: a context variable, so nested ``span()`` blocks parent
+    themselves automatically.
+
+Hooks write the same record shape through ``hooks/_common.trace_span`` and
+derive the trace id from the session id with the same hash, so one session is
+one trace on both sides.
+``scripts/trace-export.py`` converts the records to Chrome trace-event JSON.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+from . import telemetry as _telemetry
+
+TRACE_ENV = "TARS_TRACE_ID"
+PARENT_ENV = "TARS_PARENT_SPAN_ID"
+SESSION_ENV = "TARS_SESSION_ID"
+ENABLE_ENV = "TARS_TRACE"
+STREAM = "traces"
+
+_current: ContextVar["Span | None"] = ContextVar("tars_trace_span", default=None)
+_process_trace_id: str | None = None
+
+
+def enabled() -> bool:
+    return os.environ.get(ENABLE_ENV) == "1" or bool(os.environ.get(TRACE_ENV))
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def trace_id_for_session(session_id: str) -> str:
+    """Trace id for a session; must match ``hooks/_common.trace_id_for_session``."""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+
+
+def _default_trace_id() -> str:
+    """Trace id from the environment or session, else one per process."""
+    global _process_trace_id
+    env_id = os.environ.get(TRACE_ENV)
+    if env_id:
+        return env_id
+    session_id = os.environ.get(SESSION_ENV)
+    if session_id:
+        return trace_id_for_session(session_id)
+    if _process_trace_id is None:
+        _process_trace_id = new_trace_id()
+    return _process_trace_id
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "proc", "attrs", "status", "vault", "_start_ns", "_wall_us")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, proc: str, attrs: dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.proc = proc
+        self.attrs = attrs
+        self.status = "ok"
+        self.vault: Path | None = None
+        self._wall_us = time.time_ns() // 1000
+        self._start_ns = time.perf_counter_ns()
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def record(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "proc": self.proc,
+            "ts_us": self._wall_us,
+            "dur_us": (time.perf_counter_ns() - self._start_ns) // 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+def current() -> Span | None:
+    return _current.get()
+
+
+@contextmanager
+def span(
+    vault: Path | str | None,
+    name: str,
+    *,
+    trace: dict[str, Any] | None = None,
+    proc: str = "tars-vault",
+    **attrs: Any,
+) -> Iterator[Span | None]:
+    """Record ``name`` as a span under the current (or given) trace.
+
+    ``trace`` carries an explicit ``trace_id`` / ``parent_span_id`` (the
+    ``_trace`` tool argument), or a ``session_id`` to hash. ``vault`` may be left None and assigned to
+    ``Span.vault`` once known (the server resolves it inside the span). Yields
+    None when tracing is off; a span that never learns its workspace is
+    dropped.
+    """
+    if not (enabled() or trace):
+        yield None
+        return
+    parent = _current.get()
+    trace = trace if isinstance(trace, dict) else {}
+    if trace.get("trace_id"):
+        trace_id = str(trace["trace_id"])
+        parent_id = str(trace.get("parent_span_id") or "") or None
+    elif trace.get("session_id"):
+        trace_id = trace_id_for_session(str(trace["session_id"]))
+        parent_id = str(trace.get("parent_span_id") or "") or None
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id = _default_trace_id()
+        parent_id = os.environ.get(PARENT_ENV) or None
+    current_span = Span(name, trace_id, parent_id, proc, dict(attrs))
+    current_span.vault = Path(vault) if vault else None
+    token = _current.set(current_span)
+    try:
+        yield current_span
+    except BaseException:
+        current_span.status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        if current_span.vault is not None:
+            try:
+                _telemetry.append_event(current_span.vault, current_span.record(), stream=STREAM)
+            except OSError:
+                pass
+
+
+def child_env(base: dict[str, str] | None = None) -> dict[str, str]:
+    """Environment for a subprocess that continues the current span."""
+    env = dict(os.environ if base is None else base)
+    active = _current.get()
+    if active is not None:
+        env[TRACE_ENV] = active.trace_id
+        env[PARENT_ENV] = active.span_id
+    return env
@@ -0,0 +1,185 @@
+"""Flat-file vector store for hosts without the sqlite-vec extension.
+
+Two files next to ``search.db``:
+
+  - ``_system/search-vectors.f32`` — contiguous float32 matrix, one row per
+    chunk, as many columns as the model's dimension (``meta.flat_dim``);
+  - ``_system/search-vectors.ids`` — int64 ``chunks.id`` per matrix row.
+
+``scripts/build-search-index.py`` appends to them when embeddings are
+available but sqlite-vec is not (writing needs only the stdlib ``array``
+module). ``semantic_search`` memory-maps the matrix with NumPy and answers a
+query with one matrix-vector product plus ``argpartition``. Distances are L2,
+matching what sqlite-vec reports, so the hybrid merge is unchanged.
+
+The store holds one model's vectors (``meta.flat_model``); the builder
+removes and refills it when the model changes.
+
+Rows whose chunk was deleted stay in the files until ``compact`` rewrites
+them; ``search_index.semantic_query`` already skips ids with no chunk row.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .search_index import EMBED_DIM
+
+try:
+    import numpy as _np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _np = None
+
+VECTORS_RELATIVE = "_system/search-vectors.f32"
+IDS_RELATIVE = "_system/search-vectors.ids"
+
+_cache_lock = threading.Lock()
+_cache: dict[str, tuple[tuple, "VectorStore"]] = {}
+
+
+def vectors_path(vault: Path) -> Path:
+    return Path(vault) / VECTORS_RELATIVE
+
+
+def ids_path(vault: Path) -> Path:
+    return Path(vault) / IDS_RELATIVE
+
+
+def numpy_available() -> bool:
+    return _np is not None
+
+
+# ---------------------------------------------------------------------------
+# Writing (stdlib only)
+# ---------------------------------------------------------------------------
+
+def append(vault: Path, ids: Sequence[int], vectors: Sequence[Sequence[float]], dim: int = EMBED_DIM) -> None:
+    """Append ``vectors`` (one per chunk id) to the store."""
+    if len(ids) != len(vectors):
+        raise ValueError("vector count must match id count")
+    if not ids:
+        return
+    flat = array("f")
+    for vec in vectors:
+        if len(vec) != dim:
+            raise ValueError(f"expected {dim}-dim vectors, got {len(vec)}")
+        flat.extend(vec)
+    vec_file, id_file = vectors_path(vault), ids_path(vault)
+    vec_file.parent.mkdir(parents=True, exist_ok=True)
+    # Vectors first: a reader trusts min(rows in both files), so a crash
+    # between the two writes leaves an unreferenced tail, not a bad id.
+    with vec_file.open("ab") as fh:
+        flat.tofile(fh)
+    with id_file.open("ab") as fh:
+        array("q", ids).tofile(fh)
+
+
+def stored_ids(vault: Path) -> list[int]:
+    id_file = ids_path(vault)
+    if not id_file.is_file():
+        return []
+    ids = array("q")
+    ids.frombytes(id_file.read_bytes()[: id_file.stat().st_size // 8 * 8])
+    return ids.tolist()
+
+
+def compact(vault: Path, live_ids: Iterable[int], dim: int = EMBED_DIM) -> int:
+    """Drop rows whose id is not in ``live_ids``. Returns rows removed."""
+    ids = stored_ids(vault)
+    live = set(live_ids)
+    keep = [i for i, chunk_id in enumerate(ids) if chunk_id in live]
+    if len(keep) == len(ids):
+        return 0
+    vec_file = vectors_path(vault)
+    row_bytes = dim * 4
+    data = vec_file.read_bytes() if vec_file.is_file() else b""
+    keep = [i for i in keep if (i + 1) * row_bytes <= len(data)]
+    tmp_vec = vec_file.with_suffix(".f32.tmp")
+    tmp_ids = ids_path(vault).with_suffix(".ids.tmp")
+    with tmp_vec.open("wb") as fh:
+        for i in keep:
+            fh.write(data[i * row_bytes:(i + 1) * row_bytes])
+    with tmp_ids.open("wb") as fh:
+        array("q", [ids[i] for i in keep]).tofile(fh)
+    os.replace(tmp_vec, vec_file)
+    os.replace(tmp_ids, ids_path(vault))
+    return len(ids) - len(keep)
+
+
+def remove(vault: Path) -> None:
+    for path in (vectors_path(vault), ids_path(vault)):
+        path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Searching (NumPy)
+# ---------------------------------------------------------------------------
+
+class VectorStore:
+    """Memory-mapped matrix plus precomputed squared row norms."""
+
+    def __init__(self, ids, matrix) -> None:
+        self.ids = ids
+        self.matrix = matrix
+        self.norms = _np.einsum("ij,ij->i", matrix, matrix)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(
+        self, query_vector: Sequence[float], k: int, allowed_ids: Iterable[int] | None = None
+    ) -> list[tuple[int, float]]:
+        """Exact L2 KNN: ``[(chunk_id, distance), ...]`` nearest first.
+
+        ``allowed_ids`` restricts the candidates (the caller's date / source
+        filter, resolved in SQL) before ranking, so filtered searches still
+        return ``k`` hits when that many qualify.
+        """
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+        q = _np.asarray(query_vector, dtype=_np.float32)
+        dist2 = self.norms - 2.0 * (self.matrix @ q) + float(q @ q)
+        if allowed_ids is not None:
+            mask = _np.isin(self.ids, _np.fromiter(allowed_ids, dtype=_np.int64))
+            n = int(mask.sum())
+            if n == 0:
+                return []
+            dist2 = _np.where(mask, dist2, _np.inf)
+        k = min(k, n)
+        top = _np.argpartition(dist2, k - 1)[:k] if k < len(dist2) else _np.arange(len(dist2))
+        top = top[_np.argsort(dist2[top])]
+        return [(int(self.ids[i]), float(_np.sqrt(max(dist2[i], 0.0)))) for i in top]
+
+
+def open_store(vault: Path, dim: int = EMBED_DIM) -> VectorStore | None:
+    """Map the store for ``vault``; None without NumPy or without files.
+
+    Mapped stores are cached per file size and mtime, so a long-lived server
+    pays for the norm pass once per index build rather than per query.
+    """
+    if _np is None:
+        return None
+    vec_file, id_file = vectors_path(vault), ids_path(vault)
+    try:
+        vec_stat, id_stat = vec_file.stat(), id_file.stat()
+    except OSError:
+        return None
+    key = str(vec_file)
+    stamp = (dim, vec_stat.st_size, vec_stat.st_mtime_ns, id_stat.st_size, id_stat.st_mtime_ns)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    rows = min(vec_stat.st_size // (dim * 4), id_stat.st_size // 8)
+    if rows == 0:
+        return None
+    matrix = _np.memmap(vec_file, dtype=_np.float32, mode="r", shape=(rows, dim))
+    ids = _np.fromfile(id_file, dtype=_np.int64, count=rows)
+    store = VectorStore(ids, matrix)
+    with _cache_lock:
+        _cache[key] = (stamp, store)
+    return store
@@ -6,48 +6,139 @@ Skills should never hand-form ``[[...]]`` from raw text. They call
 
 The pipeline is documented in the v3.2 plan §R8 and is intentionally
 deterministic: same vault state + same input always returns the same dict.
+
+Vault state is a process-wide snapshot of the entity folders only: the
+basename map, the ``aliases:`` frontmatter of entity notes, and the alias
+registry. Each call stats the entity directories and the registry;
+``invalidate(vault)`` (the server calls it after every write tool) and the
+``entity_index.FULL_RESCAN_SECONDS`` timer re-stat the entity notes, and only
+changed notes are re-read. Notes outside the
+entity folders are never read, so a call costs a few ``stat``s however large
+the vault is. :func:`format_wikilinks` resolves a list of names against one
+refresh.
 """
 from __future__ import annotations
 
+import os
+import threading
+import time
 from pathlib import Path
 from typing import Any
 
-from . import alias_registry
+from . import _common, alias_registry, entity_index
 from .sanitize import normalize_text, sanitize_basename
 
 
-# Folders we scan when the alias registry has no entry — these are the
+# Folders we look in when the alias registry has no entry — these are the
 # canonical homes for entity notes per CLAUDE.md.
-_ENTITY_FOLDERS: tuple[str, ...] = (
-    "memory/people",
-    "memory/vendors",
-    "memory/competitors",
-    "memory/products",
-    "memory/initiatives",
-    "memory/decisions",
-    "memory/org-context",
-)
-
-
-def _vault_basenames(vault: Path) -> dict[str, list[str]]:
-    """Map normalized-lowercase basename → [actual basenames] across entity folders.
-
-    Two real files might share a normalized form (case variants, smart-quote
-    variants); we keep both so the caller can decide whether it's a
-    disambiguation case or a true single match.
-    """
-    out: dict[str, list[str]] = {}
-    for folder in _ENTITY_FOLDERS:
-        root = vault / folder
-        if not root.is_dir():
-            continue
-        for md in root.rglob("*.md"):
-            base = md.stem
-            key = normalize_text(base).lower()
-            if not key:
-                continue
-            out.setdefault(key, []).append(base)
-    return out
+_ENTITY_FOLDERS: tuple[str, ...] = tuple(entity_index.ENTITY_FOLDERS)
+
+
+class _EntityNames:
+    """Basenames and frontmatter aliases of one vault's entity notes."""
+
+    def __init__(self, vault: Path) -> None:
+        self.vault = vault
+        self._lock = threading.Lock()
+        self._notes: dict[str, tuple[tuple[int, int], tuple[str, ...]]] = {}  # rel → (stamp, aliases)
+        self._dirs: list[Path] = []
+        self._stamp: tuple | None = None
+        self._stale = True
+        self._scanned_at = 0.0
+        # Normalized-lowercase basename → [actual basenames]. Two real files
+        # might share a normalized form (case or smart-quote variants); both
+        # are kept so the caller can tell disambiguation from a single match.
+        self.basenames: dict[str, list[str]] = {}
+        self.aliases = alias_registry.AliasIndex()
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def refresh(self) -> None:
+        with self._lock:
+            registry = alias_registry.registry_path(self.vault)
+            stamp = _stamps(self._dirs + [registry])
+            expired = time.monotonic() - self._scanned_at > entity_index.FULL_RESCAN_SECONDS
+            if not (self._stale or expired) and stamp == self._stamp:
+                return
+            self._stale = False
+            self._scanned_at = time.monotonic()
+            self._scan()
+            self._stamp = _stamps(self._dirs + [registry])
+
+    def _scan(self) -> None:
+        notes: dict[str, tuple[tuple[int, int], tuple[str, ...]]] = {}
+        dirs: list[Path] = []
+        for folder in _ENTITY_FOLDERS:
+            dirs.append(self.vault / folder)
+            for dirpath, dirnames, filenames in os.walk(self.vault / folder):
+                dirnames[:] = [d for d in dirnames if d not in entity_index.SKIP_DIR_NAMES]
+                dirs.extend(Path(dirpath, d) for d in dirnames)
+                for name in filenames:
+                    if not name.endswith(".md"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    rel = os.path.relpath(path, self.vault).replace(os.sep, "/")
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    known = self._notes.get(rel)
+                    notes[rel] = known if known is not None and known[0] == stamp else (stamp, _read_aliases(path))
+        basenames: dict[str, list[str]] = {}
+        for rel in sorted(notes):
+            stem = Path(rel).stem
+            key = normalize_text(stem).lower()
+            if key:
+                basenames.setdefault(key, []).append(stem)
+        pairs = [(rel, aliases) for rel, (_, aliases) in sorted(notes.items()) if aliases]
+        kinds = {rel: entity_index.entity_kind(rel) or "" for rel, _ in pairs}
+        self._notes = notes
+        self._dirs = dirs
+        self.basenames = basenames
+        self.aliases = alias_registry.build_index(alias_registry.load_entries(self.vault), pairs, kinds)
+
+
+def _read_aliases(path: str) -> tuple[str, ...]:
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return ()
+    if not text.startswith("---"):
+        return ()
+    return entity_index.parse_aliases(_common.split_frontmatter(text)[0] or {})
+
+
+def _stamps(paths: list[Path]) -> tuple:
+    out = []
+    for path in paths:
+        try:
+            out.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+_SNAPSHOTS: dict[str, _EntityNames] = {}
+_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def _snapshot(vault: Path) -> _EntityNames:
+    with _SNAPSHOTS_LOCK:
+        names = _SNAPSHOTS.get(str(vault))
+        if names is None:
+            names = _SNAPSHOTS[str(vault)] = _EntityNames(vault)
+    names.refresh()
+    return names
+
+
+def invalidate(vault: Path) -> None:
+    """Re-stat ``vault``'s entity notes on the next call (after a write tool)."""
+    with _SNAPSHOTS_LOCK:
+        names = _SNAPSHOTS.get(str(vault))
+    if names is not None:
+        names.invalidate()
 
 
 def _build_link(basename: str, display_text: str) -> str:
@@ -57,13 +148,33 @@ def _build_link(basename: str, display_text: str) -> str:
     return f"[[{basename}]]"
 
 
+def _from_aliases(entries: list[alias_registry.AliasEntry], display: str) -> dict[str, Any]:
+    # Multiple ambiguous entries → caller chooses.
+    if len(entries) > 1:
+        return {
+            "status": "disambiguation_needed",
+            "candidates": [
+                {"basename": e.canonical, "source": e.source, "kind": e.kind}
+                for e in entries
+            ],
+        }
+    canonical = entries[0].canonical
+    return {
+        "status": "resolved",
+        "link": _build_link(canonical, display),
+        "basename": canonical,
+        "display": display,
+        "source": entries[0].source,
+    }
+
+
 def format_wikilink(text: str, *, vault: str | Path, kind: str | None = None) -> dict[str, Any]:
     """Resolve ``text`` into an Obsidian-safe wikilink.
 
     Returns one of:
 
     * ``{status: "resolved", link, basename, display, source}`` — high-confidence match.
-      ``source`` is one of ``"alias-registry" | "vault-file" | "new"`` and tells the
+      ``source`` is one of ``"alias-registry" | "frontmatter" | "vault-file" | "new"`` and tells the
       caller whether the returned basename is already a real file.
     * ``{status: "disambiguation_needed", candidates: [...]}`` — multiple
       registry entries or vault files match. ``candidates`` items are
@@ -73,6 +184,19 @@ def format_wikilink(text: str, *, vault: str | Path, kind: str | None = None) ->
     * ``{status: "error", reason}`` — input was empty or unsalvageable after
       sanitization (only happens for whitespace / pure-symbol input).
     """
+    return format_wikilinks([text], vault=vault, kind=kind)[0]
+
+
+def format_wikilinks(texts: list[str], *, vault: str | Path, kind: str | None = None) -> list[dict[str, Any]]:
+    """:func:`format_wikilink` for each of ``texts``, in order, against one vault snapshot."""
+    vault_p = Path(vault).expanduser().resolve()
+    names = _snapshot(vault_p)
+    return [_format(text, names.aliases, names.basenames, kind) for text in texts]
+
+
+def _format(
+    text: str, aliases: alias_registry.AliasIndex, files_map: dict[str, list[str]], kind: str | None
+) -> dict[str, Any]:
     if not isinstance(text, str):
         return {"status": "error", "reason": "text must be a string"}
 
@@ -87,31 +211,13 @@ def format_wikilink(text: str, *, vault: str | Path, kind: str | None = None) ->
             "reason": "text reduces to empty after stripping illegal characters",
         }
 
-    vault_p = Path(vault).expanduser().resolve()
-
     # 1. Alias registry — exact (normalized) lookup.
-    entries = alias_registry.lookup(vault_p, display, kind_hint=kind)
-    if entries:
-        # Multiple ambiguous entries → caller chooses.
-        if len(entries) > 1:
-            return {
-                "status": "disambiguation_needed",
-                "candidates": [
-                    {"basename": e.canonical, "source": "alias-registry", "kind": e.kind}
-                    for e in entries
-                ],
-            }
-        canonical = entries[0].canonical
-        return {
-            "status": "resolved",
-            "link": _build_link(canonical, display),
-            "basename": canonical,
-            "display": display,
-            "source": "alias-registry",
-        }
+    entries = alias_registry.index_lookup(aliases, display, kind_hint=kind)
+    registry = [e for e in entries if e.source == "alias-registry"]
+    if registry:
+        return _from_aliases(registry, display)
 
     # 2. Vault file lookup — match by normalized basename across entity folders.
-    files_map = _vault_basenames(vault_p)
     key = normalize_text(display).lower()
     matches = files_map.get(key, [])
     if len(matches) == 1:
@@ -143,7 +249,12 @@ def format_wikilink(text: str, *, vault: str | Path, kind: str | None = None) ->
             ],
         }
 
-    # 3. No match — return a new-entity proposal so the caller can decide
+    # 3. Note ``aliases:`` frontmatter — after basenames, so a note's own
+    # name beats another note claiming it as an alias.
+    if entries:
+        return _from_aliases(entries, display)
+
+    # 4. No match — return a new-entity proposal so the caller can decide
     # whether to create the underlying note or fall back to plain text.
     return {
         "status": "new_entity",
@@ -8,6 +8,7 @@ Run: python3 mcp/tars-vault/tests/test_search_index.py
 """
 from __future__ import annotations
 
+import json
 import sqlite3
 import sys
 from pathlib import Path
@@ -17,6 +18,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
 from tars_vault import search_index as si  # noqa: E402
+from tars_vault import vector_store  # noqa: E402
 from tars_vault.tools import fts_search, semantic_search, rerank  # noqa: E402
 
 
@@ -126,6 +128,102 @@ def test_schema_and_fts_roundtrip(tmp_path: Path) -> None:
         conn.close()
 
 
+def test_embedding_space_migration_and_cutover(tmp_path: Path) -> None:
+    conn = _fresh_db(tmp_path)
+    try:
+        note = si.NoteRecord(path="journal/2026-04/a.md", title="A", body="one", tier="B", source_type="journal")
+        ids = si.upsert_chunks(conn, note, si.chunk_body(note.body), None, vec_enabled=False)
+        # Plain tables stand in for vec0 spaces: the bookkeeping is the same.
+        for table in ("space_old", "space_new"):
+            conn.execute(f"CREATE TABLE {table}(embedding BLOB, source_type TEXT, date TEXT)")
+        si.set_meta(conn, "vec_spaces", json.dumps({
+            "model-old": {"table": "space_old", "dim": 4, "status": "active"},
+            "model-new": {"table": "space_new", "dim": 8, "status": "building"},
+        }))
+        conn.commit()
+        _assert(si.active_space(conn)["model"] == "model-old", "old space serves during the migration")
+        _assert(si.pending_space_ids(conn, "space_new") == ids, "every chunk pending in the new space")
+
+        si.insert_space_vectors(conn, "space_new", si.chunk_rows(conn, ids), [[0.5] * 8 for _ in ids])
+        conn.commit()
+        _assert(si.pending_space_ids(conn, "space_new") == [], "new space covers all chunks")
+        si.cutover(conn, "model-new")
+        _assert(si.active_space(conn)["model"] == "model-new", "cutover flips the active space")
+        _assert(si.vec_spaces(conn)["model-old"]["status"] == "retired", "old space retired, not dropped yet")
+
+        _assert(si.drop_retired_spaces(conn) == ["model-old"], "retired space dropped on the next build")
+        _assert(not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'space_old'").fetchone(), "table gone")
+    finally:
+        conn.close()
+
+
+def test_quantized_space_on_fresh_index_and_new_shard(tmp_path: Path) -> None:
+    """vec0 paths; a no-op on hosts without a loadable sqlite-vec."""
+    import importlib.util
+
+    probe, vec_ok = si.open_index(tmp_path / "probe.db")
+    probe.close()
+    if not vec_ok:
+        return
+    spec = importlib.util.spec_from_file_location("build_search_index", ROOT.parents[1] / "scripts" / "build-search-index.py")
+    build = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(build)
+
+    vault = tmp_path / "vault"
+    conn, _ = si.open_index(si.index_path(vault))
+    ix = build.IndexSet(vault, conn, sharded=True, vec_enabled=True)
+    try:
+        si.init_schema(conn, vec_enabled=True, quantization="int8")
+        ix.quantization = "int8"
+        ix.prepare = lambda shard: si.ensure_active_space(shard, "test/model", 4)
+        space = si.ensure_active_space(conn, "test/model", 4)
+        _assert(si._table_exists(conn, f"{space['table']}_q"), "first space gets its quantized copy")
+
+        notes = [
+            si.NoteRecord(path="memory/people/a.md", title="A", body="alpha", tier="B", source_type="memory"),
+            si.NoteRecord(path="archive/transcripts/2027-01/b.md", title="B", body="beta", tier="B",
+                          source_type="transcript", date="2027-01-05"),
+        ]
+        for note, vec in zip(notes, ([1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0])):
+            target = ix.writer(ix.name_for(note))
+            si.upsert_chunks(target, note, si.chunk_body(note.body), [vec], vec_enabled=True)
+        ix.commit()
+        _assert(ix.dirty == {si.MAIN_SHARD, "transcript-2027"}, f"note routed to a new shard: {ix.dirty}")
+        shard = ix.get("transcript-2027")
+        _assert(si.index_quantization(shard) == "int8", "shard inherits the quantization mode")
+        hits = si.semantic_query(shard, [0.0, 1.0, 0.0, 0.0], limit=1)
+        _assert([h["path"] for h in hits] == ["archive/transcripts/2027-01/b.md"], f"quantized KNN on shard: {hits}")
+        _assert(hits[0]["distance"] < 1e-6, "rescored with exact float32 distance")
+    finally:
+        ix.close()
+
+
+def test_wal_writer_does_not_block_read_only_queries(tmp_path: Path) -> None:
+    db_path = tmp_path / "search.db"
+    writer, _ = si.open_index(db_path, load_vec=False)
+    si.init_schema(writer, vec_enabled=False)
+    first = si.NoteRecord(path="journal/2026-04/a.md", title="A", body="delta", tier="B", source_type="journal")
+    si.upsert_note_fts(writer, first)
+    writer.commit()
+    _assert(writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal", "writer switches the index to WAL")
+    # An open write transaction (an in-progress build batch) ...
+    si.upsert_note_fts(writer, si.NoteRecord(path="journal/2026-04/b.md", title="B", body="delta",
+                                             tier="B", source_type="journal"))
+    reader, _ = si.open_index(db_path, load_vec=False, read_only=True)
+    try:
+        # ... leaves readers on the last committed snapshot.
+        _assert([r["path"] for r in si.fts_query(reader, "delta")] == [first.path], "reader sees committed rows")
+        try:
+            reader.execute("DELETE FROM fts_notes")
+        except sqlite3.OperationalError:
+            pass
+        else:
+            raise AssertionError("read-only connection must refuse writes")
+    finally:
+        reader.close()
+        writer.close()
+
+
 def test_delete_path_clears_fts(tmp_path: Path) -> None:
     conn = _fresh_db(tmp_path)
     try:
@@ -140,6 +238,93 @@ def test_delete_path_clears_fts(tmp_path: Path) -> None:
         conn.close()
 
 
+def test_quantization_mode_defaults_and_validates(tmp_path: Path) -> None:
+    conn = _fresh_db(tmp_path)
+    try:
+        _assert(si.index_quantization(conn) == "none", "unquantized by default")
+        try:
+            si.init_schema(conn, vec_enabled=False, quantization="int4")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown quantization mode must raise")
+        si.init_schema(conn, vec_enabled=False, quantization="int8")
+        _assert(si.index_quantization(conn) == "none", "no vec layer, nothing to quantize")
+    finally:
+        conn.close()
+
+
+def test_flat_vector_store_append_compact_and_search(tmp_path: Path) -> None:
+    dim = si.EMBED_DIM
+    vectors = [[1.0 if j == i else 0.0 for j in range(dim)] for i in range(3)]
+    vector_store.append(tmp_path, [11, 12, 13], vectors)
+    _assert(vector_store.stored_ids(tmp_path) == [11, 12, 13], "ids appended in order")
+    _assert(vector_store.compact(tmp_path, [11, 13]) == 1, "one stale row dropped")
+    _assert(vector_store.stored_ids(tmp_path) == [11, 13], "compaction keeps live ids")
+    _assert(vector_store.vectors_path(tmp_path).stat().st_size == 2 * dim * 4, "matrix rewritten")
+
+    store = vector_store.open_store(tmp_path)
+    if not vector_store.numpy_available():
+        _assert(store is None, "no NumPy, no store")
+        return
+    hits = store.search(vectors[2], 2)
+    _assert([h[0] for h in hits] == [13, 11], f"nearest first: {hits}")
+    _assert(abs(hits[0][1]) < 1e-6 and abs(hits[1][1] - 2 ** 0.5) < 1e-5, f"L2 distances: {hits}")
+
+
+def test_semantic_query_uses_injected_store(tmp_path: Path) -> None:
+    conn = _fresh_db(tmp_path)
+    try:
+        note = si.NoteRecord(path="journal/2026-04/a.md", title="A", body="one", tier="B", source_type="journal")
+        ids = si.upsert_chunks(conn, note, si.chunk_body(note.body), None, vec_enabled=False)
+
+        class _Store:
+            allowed = None
+
+            def search(self, query_vector, k, allowed_ids=None):
+                self.allowed = allowed_ids
+                return [(999, 0.1), (ids[0], 0.5)]
+
+        store = _Store()
+        rows = si.semantic_query(conn, [0.0] * si.EMBED_DIM, source_types=["journal"], limit=5, store=store)
+        _assert([(r["path"], r["distance"]) for r in rows] == [(note.path, 0.5)],
+                f"stale ids skipped, metadata joined: {rows}")
+        _assert(store.allowed == ids, f"source filter resolved to chunk ids before ranking: {store.allowed}")
+        si.semantic_query(conn, [0.0] * si.EMBED_DIM, date_start="2027-01-01", limit=5, store=store)
+        _assert(store.allowed == [], "undated chunks fall outside a date window")
+    finally:
+        conn.close()
+
+
+def test_bulk_delete_and_rename_keep_surviving_chunks(tmp_path: Path) -> None:
+    conn = _fresh_db(tmp_path)
+    try:
+        notes = [
+            si.NoteRecord(path=f"journal/2026-04/n{i}.md", title=f"N{i}", body=f"gamma note {i}",
+                          tier="B", source_type="journal")
+            for i in range(3)
+        ]
+        for note in notes:
+            si.upsert_note_fts(conn, note)
+            si.upsert_chunks(conn, note, si.chunk_body(note.body), None, vec_enabled=False)
+        conn.commit()
+        kept_id = conn.execute("SELECT id FROM chunks WHERE path = ?", (notes[2].path,)).fetchone()[0]
+
+        si.delete_paths(conn, [notes[0].path, notes[1].path], vec_enabled=False)
+        moved = si.NoteRecord(path="archive/transcripts/2026-04/n2.md", title="N2", body=notes[2].body,
+                              tier="B", source_type="transcript")
+        _assert(si.rename_path(conn, notes[2].path, moved) == 1, "rename carries the chunk over")
+        conn.commit()
+
+        _assert(si.indexed_paths(conn) == {moved.path}, f"only the moved note remains: {si.indexed_paths(conn)}")
+        row = conn.execute("SELECT id, source_type FROM chunks WHERE path = ?", (moved.path,)).fetchone()
+        _assert(tuple(row) == (kept_id, "transcript"), f"chunk id (vec rowid) preserved: {tuple(row)}")
+        si.optimize(conn, vacuum=True)
+        _assert([r["path"] for r in si.fts_query(conn, "gamma", limit=5)] == [moved.path], "FTS follows rename")
+    finally:
+        conn.close()
+
+
 # ---------------------------------------------------------------------------
 # Tool contracts
 # ---------------------------------------------------------------------------
@@ -233,6 +418,122 @@ def test_semantic_search_fallback_when_vec_unavailable(tmp_path: Path) -> None:
         _assert(out["fallback"] == "fts_only", "fallback flag set")
 
 
+def test_semantic_merge_honours_weight_and_reports_timings(tmp_path: Path) -> None:
+    sem = [{"path": "a.md", "chunk_index": 0, "distance": 0.1}, {"path": "b.md", "chunk_index": 0, "distance": 0.9}]
+    fts = [{"path": "b.md", "score": -9.0, "snippet": "b"}, {"path": "a.md", "score": -1.0, "snippet": "a"}]
+    semantic_first = semantic_search._merge(sem, fts, 2, semantic_weight=0.9)
+    keyword_first = semantic_search._merge(sem, fts, 2, semantic_weight=0.1)
+    _assert([r["path"] for r in semantic_first] == ["a.md", "b.md"], f"w=0.9: {semantic_first}")
+    _assert([r["path"] for r in keyword_first] == ["b.md", "a.md"], f"w=0.1: {keyword_first}")
+
+    vault = tmp_path / "vault"
+    (vault / "_system").mkdir(parents=True)
+    conn, _ = si.open_index(si.index_path(vault), load_vec=False)
+    si.init_schema(conn, vec_enabled=False)
+    conn.commit()
+    conn.close()
+    out = semantic_search.semantic_search(query="x", vault=str(vault), semantic_weight=0.4)
+    _assert(set(out["timings_ms"]) == {"fts", "embed", "vector", "merge"}, f"timings: {out}")
+    bad = semantic_search.semantic_search(query="x", vault=str(vault), semantic_weight="heavy")
+    _assert(bad["status"] == "error", f"weight validation: {bad}")
+
+
+def test_semantic_search_date_range_is_filtered_in_query(tmp_path: Path) -> None:
+    vault = tmp_path / "vault"
+    (vault / "_system").mkdir(parents=True)
+    conn, _ = si.open_index(si.index_path(vault), load_vec=False)
+    si.init_schema(conn, vec_enabled=False)
+    for i in range(20):
+        si.upsert_note_fts(conn, si.NoteRecord(path=f"journal/2026-01/j{i}.md", title="J", body="vendor renewal",
+                                               tier="B", source_type="journal", date="2026-01-10"))
+    for i in range(3):
+        si.upsert_note_fts(conn, si.NoteRecord(path=f"journal/2026-04/a{i}.md", title="A",
+                                               body="vendor renewal " + "filler " * 50,
+                                               tier="B", source_type="journal", date="2026-04-0{}".format(i + 1)))
+    conn.commit()
+    conn.close()
+
+    out = semantic_search.semantic_search(query="vendor", vault=str(vault), top_k=3,
+                                          date_range={"start": "2026-04-01", "end": "2026-04-30"})
+    dates = sorted(r["date"] for r in out["results"])
+    _assert(dates == ["2026-04-01", "2026-04-02", "2026-04-03"],
+            f"window filled despite better-ranked rows outside it: {out['results']}")
+
+
+def test_sharded_index_routes_and_fans_out(tmp_path: Path) -> None:
+    _assert(si.shard_name("journal", "2024-03-02") == "journal-2024", "dated Tier B note gets a year shard")
+    _assert(si.shard_name("journal", None) == si.MAIN_SHARD, "undated note stays in search.db")
+    _assert(si.shard_name("memory", "2024-03-02") == si.MAIN_SHARD, "Tier A stays in search.db")
+
+    vault = tmp_path / "vault"
+    notes = {
+        si.MAIN_SHARD: si.NoteRecord(path="memory/people/jane.md", title="Jane", body="vendor renewal owner",
+                                     tier="A", source_type="memory"),
+        "journal-2024": si.NoteRecord(path="journal/2024-03/old.md", title="Old", body="vendor renewal",
+                                      tier="B", source_type="journal", date="2024-03-02"),
+        "transcript-2026": si.NoteRecord(path="archive/transcripts/2026-04/call.md", title="Call",
+                                         body="vendor renewal", tier="B", source_type="transcript",
+                                         date="2026-04-02"),
+    }
+    for name, note in notes.items():
+        conn, _ = si.open_index(si.shard_path(vault, name) if name else si.index_path(vault), load_vec=False)
+        si.init_schema(conn, vec_enabled=False)
+        si.upsert_note_fts(conn, note)
+        conn.commit()
+        conn.close()
+
+    stems = lambda paths: sorted(p.stem for p in paths)  # noqa: E731
+    _assert(stems(si.search_targets(vault, tier="A")) == ["search"], "Tier A never touches shards")
+    _assert(stems(si.search_targets(vault, source_types=["journal"])) == ["journal-2024", "search"],
+            "scope prunes shards by source type")
+    _assert(stems(si.search_targets(vault, date_start="2025-01-01")) == ["search", "transcript-2026"],
+            "date range prunes shards by year")
+
+    out = fts_search.fts_search(query="vendor renewal", vault=str(vault))
+    _assert(sorted(r["path"] for r in out["results"]) == sorted(n.path for n in notes.values()),
+            f"fts hits merged across shards: {out}")
+    out = semantic_search.semantic_search(query="vendor renewal", vault=str(vault),
+                                          date_range={"start": "2024-01-01", "end": "2024-12-31"})
+    _assert([r["path"] for r in out["results"]] == ["journal/2024-03/old.md"], f"hybrid over shards: {out}")
+
+    si.remove_index(vault)
+    _assert(not si.index_path(vault).exists() and not si.list_shards(vault), "remove_index clears every shard")
+
+
+def test_fts_merge_scales_each_shard_by_its_best_hit() -> None:
+    # A common term scores near 0 in a shard full of it and far below 0 in
+    # one where it is rare; raw bm25 would bury the first shard's best hit.
+    dense = [{"path": "a.md", "score": -0.4}, {"path": "b.md", "score": -0.1}]
+    sparse = [{"path": "c.md", "score": -8.0}, {"path": "d.md", "score": -1.0}]
+    rows = si.merge_fts([sparse, dense, []], 3)
+    _assert([r["path"] for r in rows] == ["c.md", "a.md", "b.md"], f"per-shard scaling: {rows}")
+    _assert([r["score"] for r in rows] == [-1.0, -1.0, -0.25], f"scaled scores: {rows}")
+    _assert([r["bm25"] for r in rows] == [-8.0, -0.4, -0.1], f"raw bm25 kept: {rows}")
+
+
+def test_build_drops_shards_left_empty(tmp_path: Path) -> None:
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("build_search_index", ROOT.parents[1] / "scripts" / "build-search-index.py")
+    build = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(build)
+
+    vault = tmp_path / "vault"
+    call = vault / "archive" / "transcripts" / "2026-04" / "call.md"
+    call.parent.mkdir(parents=True)
+    call.write_text("---\ntars-date: 2026-04-02\n---\n# Call\nvendor renewal\n")
+    (vault / "memory" / "people").mkdir(parents=True)
+    (vault / "memory" / "people" / "jane.md").write_text("# Jane\nvendor owner\n")
+
+    summary = build.run(vault, apply_writes=True, model=None, layout="sharded")
+    _assert(summary["shards_written"] == ["transcript-2026"], f"note routed to its year shard: {summary}")
+    call.unlink()
+    summary = build.run(vault, apply_writes=True, model=None)
+    _assert(summary["removed"] == 1 and summary["shards_removed"] == ["transcript-2026"], f"GC: {summary}")
+    _assert(not si.list_shards(vault), "emptied shard file deleted")
+    _assert(si.search_targets(vault) == [si.index_path(vault)], "no fan-out to a deleted shard")
+
+
 def test_semantic_search_invalid_scope(tmp_path: Path) -> None:
     out = semantic_search.semantic_search(query="x", vault=str(tmp_path), scope="bogus")
     _assert(out["status"] == "error" and "scope" in out["reason"], f"scope validation: {out}")
@@ -281,6 +582,37 @@ def test_rerank_source_boost() -> None:
             f"transcript boost should win: {out['results']}")
 
 
+def test_rerank_cross_encoder_batches_and_falls_back(tmp_path: Path) -> None:
+    class FakeEncoder:
+        def __init__(self) -> None:
+            self.batches: list[int] = []
+
+        def rerank(self, query, documents, batch_size=64):
+            self.batches.append(len(documents))
+            return [10.0 if query in doc else -10.0 for doc in documents]
+
+    candidates = [{"path": f"n{i}", "hybrid_score": 1.0 - i / 100, "text": "filler", "source_type": "context"}
+                  for i in range(20)]
+    candidates.append({"path": "hit", "hybrid_score": 0.1, "text": "vendor renewal terms", "source_type": "context"})
+    cache_key = str(tmp_path / "_system" / "embedding-cache")
+
+    missing = rerank.rerank(results=candidates, query="vendor renewal", vault=str(tmp_path), today="2026-04-17")
+    _assert(missing["mode"] == "deterministic" and missing["fallback_reason"], f"no cached model: {missing}")
+    _assert(missing["results"][0]["path"] == "n0", "results alias feeds the deterministic rerank")
+
+    encoder = FakeEncoder()
+    rerank._encoders[cache_key] = encoder
+    try:
+        out = rerank.rerank(candidates=candidates, query="vendor renewal", vault=str(tmp_path), today="2026-04-17")
+        _assert(out["mode"] == "cross_encoder" and out["results"][0]["path"] == "hit", f"cross-encoder order: {out}")
+        _assert(encoder.batches == [rerank.CROSS_ENCODER_BATCH, 21 - rerank.CROSS_ENCODER_BATCH],
+                f"scored in batches: {encoder.batches}")
+        late = rerank.rerank(candidates=candidates, query="vendor renewal", vault=str(tmp_path), budget_ms=0)
+        _assert(late["mode"] == "deterministic" and "budget" in late["fallback_reason"], f"budget fallback: {late}")
+    finally:
+        rerank._encoders.pop(cache_key, None)
+
+
 def test_rerank_invalid_input() -> None:
     out = rerank.rerank(candidates="nope")
     _assert(out["status"] == "error", f"string candidates must error, got {out}")
@@ -40,6 +40,7 @@ EXPECTED_TOOLS = {
     "scaffold_workspace",
     "search_by_tag",
     "semantic_search",
+    "suggest_entities",
     "update_frontmatter",
     "validate_extension",
     "workspace_map",
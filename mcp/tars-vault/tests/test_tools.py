@@ -29,6 +29,7 @@ from tars_vault.tools.context_gaps import context_gaps
 from tars_vault.tools.create_note import create_note
 from tars_vault.tools.detect_near_duplicates import detect_near_duplicates
 from tars_vault.tools.entity_timeline import entity_timeline
+from tars_vault.tools.extension_common import blocking_workspace_owner, ownership_matcher
 from tars_vault.tools.install_extension import install_extension
 from tars_vault.tools.list_extensions import list_extensions
 from tars_vault.tools.move_note import move_note
@@ -43,11 +44,13 @@ from tars_vault.tools.scan_secrets import scan_secrets
 from tars_vault.tools.scaffold_extension import scaffold_extension
 from tars_vault.tools.scaffold_workspace import scaffold_workspace
 from tars_vault.tools.search_by_tag import search_by_tag
+from tars_vault.tools.suggest_entities import suggest_entities
 from tars_vault.tools.update_frontmatter import update_frontmatter
 from tars_vault.tools.validate_extension import validate_extension
 from tars_vault.tools.workspace_map import workspace_map
 from tars_vault.tools.write_note_from_content import write_note_from_content
 from tars_vault.server import _call_handler_sync
+from tars_vault.telemetry import TelemetrySink
 
 
 class ToolTests(unittest.TestCase):
@@ -268,12 +271,291 @@ class ToolTests(unittest.TestCase):
         self.assertEqual(r["status"], "ok")
         self.assertEqual(r["canonical"], "Data Platform")
 
+    def test_resolve_alias_indexes_note_frontmatter_aliases(self) -> None:
+        from tars_vault import alias_registry, entity_index
+        from tars_vault.wikilink import format_wikilink
+
+        people = self.vault / "memory" / "people"
+        (self.vault / "_system" / "alias-registry.md").write_text(
+            "## Ambiguous Names\n| Short Name | Default Resolution | Context Override |\n|---|---|---|\n"
+            "| Sam | [[Sam Product]] | security -> [[Sam Security]] |\n"
+        )
+        (people / "Priya Natarajan.md").write_text("---\naliases: [PN, Priya N]\n---\n")
+        (people / "Sam Security.md").write_text("---\naliases: [Sam]\n---\n")
+        (people / "Pat Nolan.md").write_text("---\naliases: [Pat]\n---\n")
+        (people / "Pat.md").write_text("# Pat\n")
+
+        r = resolve_alias(vault=str(self.vault), name="priya n")
+        self.assertEqual((r["resolution_status"], r["canonical"]), ("resolved", "Priya Natarajan"))
+        self.assertEqual((r["source"], r["path"], r["kind"]), ("frontmatter", "memory/people/Priya Natarajan.md", "person"))
+        self.assertEqual(resolve_alias(vault=str(self.vault), name="Sam")["canonical"], "Sam Product",
+                         "a registry context override covers the note's alias")
+        self.assertEqual(format_wikilink("PN", vault=self.vault)["link"], "[[Priya Natarajan|PN]]")
+        self.assertEqual(format_wikilink("Pat", vault=self.vault)["source"], "vault-file",
+                         "a note's own basename beats another note's alias")
+        self.assertEqual(alias_registry.load_index(self.vault.resolve()).conflicts, [])
+
+        (self.vault / "journal" / "2026-04" / "standup.md").write_text("---\naliases: [PN]\n---\n")
+        entity_index.invalidate(self.vault.resolve())  # what the server does after a write tool
+        r = resolve_alias(vault=str(self.vault), name="PN")
+        self.assertEqual(r["resolution_status"], "ambiguous")
+        conflicts = alias_registry.load_index(self.vault.resolve()).conflicts
+        self.assertEqual(conflicts, [{
+            "alias": "pn", "canonicals": ["Priya Natarajan", "standup"],
+            "paths": ["journal/2026-04/standup.md", "memory/people/Priya Natarajan.md"],
+        }])
+
+    def test_format_wikilink_bulk_form_sees_entity_folder_changes(self) -> None:
+        people = self.vault / "memory" / "people"
+        (people / "Sam O'Neil.md").write_text("# Sam\n")
+        (people / "Sam O\u2019Neil.md").write_text("# Sam\n")
+        (self.vault / "memory" / "vendors").mkdir()
+        (self.vault / "memory" / "vendors" / "Acme Corp.md").write_text("# Acme\n")
+
+        r = _call_handler_sync(
+            "format_wikilink", {"vault": str(self.vault), "texts": ["Acme Corp", "Sam O'Neil", "Zed", "  "]}, ""
+        )
+        self.assertEqual(r["status"], "ok", r)
+        self.assertEqual([x["text"] for x in r["results"]], ["Acme Corp", "Sam O'Neil", "Zed", "  "])
+        self.assertEqual([x["status"] for x in r["results"]],
+                         ["resolved", "disambiguation_needed", "new_entity", "error"])
+
+        (people / "Zed.md").write_text("# Zed\n")  # no write tool: the folder mtime alone invalidates
+        r = _call_handler_sync("format_wikilink", {"vault": str(self.vault), "text": "zed"}, "")
+        self.assertEqual((r["status"], r["link"], r["source"]), ("resolved", "[[Zed|zed]]", "vault-file"))
+        r = _call_handler_sync("format_wikilink", {"vault": str(self.vault), "text": "a", "texts": ["b"]}, "")
+        self.assertEqual(r["status"], "error")
+
+    def test_format_wikilink_reads_only_entity_folders(self) -> None:
+        from unittest import mock
+
+        from tars_vault import entity_index
+
+        (self.vault / "memory" / "people" / "Zed.md").write_text("# Zed\n")
+        (self.vault / "journal" / "2026-04" / "zed-notes.md").write_text("---\naliases: [Zee]\n---\n")
+        with mock.patch.object(entity_index, "get_index", side_effect=AssertionError("full-vault index")):
+            r = _call_handler_sync("format_wikilink", {"vault": str(self.vault), "texts": ["Zed", "Zee"]}, "")
+            self.assertEqual([x["status"] for x in r["results"]], ["resolved", "new_entity"])
+
+            # An edit leaves the folder mtime alone; the write tool's notification reveals the alias.
+            r = _call_handler_sync(
+                "update_frontmatter", {"vault": str(self.vault), "file": "memory/people/Zed.md",
+                                       "property": "aliases", "value": ["Zee"]}, ""
+            )
+            self.assertEqual(r["status"], "ok", r)
+            r = _call_handler_sync("format_wikilink", {"vault": str(self.vault), "text": "Zee"}, "")
+            self.assertEqual((r["link"], r["source"]), ("[[Zed|Zee]]", "frontmatter"))
+
+    def test_suggest_entities_ranks_prefix_matches_and_tracks_writes(self) -> None:
+        people = self.vault / "memory" / "people"
+        (people / "Dan Rivera.md").write_text("---\ntars-name: Daniel Rivera\naliases: [DR]\n---\n# Dan\n")
+        (people / "Dana Scott.md").write_text("---\ntags: [tars/person]\n---\n# Dana\n")
+        (self.vault / "journal" / "2026-04" / "sync.md").write_text("Met [[Dana Scott]] and [[Dana Scott|Dana]].\n")
+        (self.vault / "journal" / "2026-04" / "plan.md").write_text("With [[Dana Scott]].\n")
+        (self.vault / "_system" / "alias-registry.md").write_text(
+            "## Team Abbreviations\n| Abbreviation | Canonical |\n|---|---|\n| danteam | Data Nexus |\n"
+        )
+
+        r = suggest_entities(vault=str(self.vault), prefix="Dan")
+        self.assertEqual(r["status"], "ok")
+        self.assertEqual([x["basename"] for x in r["results"]], ["Dan Rivera", "Dana Scott", "Data Nexus"])
+        self.assertEqual(r["results"][1]["inbound_links"], 2)
+        self.assertEqual(r["results"][2]["match_source"], "alias-registry")
+        r = suggest_entities(vault=str(self.vault), prefix="da")
+        self.assertEqual(r["results"][0]["basename"], "Dana Scott", "in-degree breaks prefix ties")
+        r = suggest_entities(vault=str(self.vault), prefix="riv", kind="person")
+        self.assertEqual(r["results"][0]["matched"], "Dan Rivera")
+        r = suggest_entities(vault=str(self.vault), prefix="dr")
+        self.assertEqual((r["results"][0]["basename"], r["results"][0]["match_source"]), ("Dan Rivera", "alias"))
+
+        created = _call_handler_sync(
+            "create_note",
+            {"vault": str(self.vault), "path": "memory/people/Danielle Park.md",
+             "frontmatter": {"tags": ["tars/person"]}, "body": "Works with [[Dan Rivera]]."},
+            "",
+        )
+        self.assertEqual(created["status"], "ok", created)
+        r = _call_handler_sync("suggest_entities", {"vault": str(self.vault), "prefix": "daniel"}, "")
+        self.assertEqual([x["basename"] for x in r["results"]], ["Dan Rivera", "Danielle Park"])
+        self.assertEqual(r["results"][0]["inbound_links"], 1, "write tools refresh link counts")
+        self.assertEqual(suggest_entities(vault=str(self.vault), prefix="x", kind="robot")["status"], "error")
+
+    def test_write_tools_recheck_only_the_notes_they_touch(self) -> None:
+        from unittest import mock
+
+        from tars_vault import entity_index
+
+        (self.vault / "memory" / "people" / "Dan Rivera.md").write_text("# Dan\n")
+        (self.vault / "journal" / "2026-04" / "sync.md").write_text("Standup.\n")
+        self.assertEqual(resolve_alias(vault=str(self.vault), name="DR")["resolution_status"], "unresolved")
+
+        with mock.patch.object(entity_index.EntityIndex, "_sweep", side_effect=AssertionError("full-vault sweep")):
+            r = _call_handler_sync(
+                "append_note", {"vault": str(self.vault), "file": "journal/2026-04/sync.md", "content": "Met [[Dan Rivera]]."}, ""
+            )
+            self.assertEqual(r["status"], "ok", r)
+            r = _call_handler_sync(
+                "update_frontmatter", {"vault": str(self.vault), "file": "journal/2026-04/sync.md",
+                                       "property": "aliases", "value": ["DR"]}, ""
+            )
+            self.assertEqual(r["status"], "ok", r)
+            r = resolve_alias(vault=str(self.vault), name="DR")
+            self.assertEqual((r["canonical"], r["source"]), ("sync", "frontmatter"))
+            r = _call_handler_sync("suggest_entities", {"vault": str(self.vault), "prefix": "dan"}, "")
+            self.assertEqual(r["results"][0]["inbound_links"], 1)
+
+    def test_fallback_transport_answers_failed_calls_and_serializes_writes(self) -> None:
+        import io
+        import threading
+        import time
+        from unittest import mock
+
+        from tars_vault import server
+
+        active = {"writes": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def fake_call(name, arguments, default_vault, context=None):
+            if name == "read_note":
+                raise RuntimeError("span setup failed")
+            with lock:
+                active["writes"] += 1
+                active["peak"] = max(active["peak"], active["writes"])
+            time.sleep(0.02)
+            with lock:
+                active["writes"] -= 1
+            return {"status": "ok"}, None
+
+        calls = [{"jsonrpc": "2.0", "id": i, "method": "tools/call",
+                  "params": {"name": "create_note", "arguments": {}}} for i in range(4)]
+        calls.append({"jsonrpc": "2.0", "id": 99, "method": "tools/call",
+                      "params": {"name": "read_note", "arguments": {}}})
+        stdin = io.StringIO("".join(json.dumps(c) + "\n" for c in calls))
+        stdout = io.StringIO()
+        with mock.patch.object(server, "_execute_call", fake_call), \
+                mock.patch.object(server, "_resolve_default_vault", lambda path: path), \
+                mock.patch.object(server, "_check_install_record", lambda vault: None), \
+                mock.patch.object(server._telemetry, "rotate_in_background", lambda vault: None), \
+                mock.patch("sys.stdin", stdin), mock.patch("sys.stdout", stdout), \
+                mock.patch("sys.stderr", io.StringIO()):
+            self.assertEqual(server._run_minimal_stdio(str(self.vault)), 0)
+
+        responses = {r["id"]: r for r in map(json.loads, stdout.getvalue().splitlines())}
+        self.assertEqual(sorted(responses), [0, 1, 2, 3, 99])
+        self.assertEqual(responses[99]["error"]["code"], -32603)
+        self.assertIn("span setup failed", responses[99]["error"]["message"])
+        self.assertEqual(active["peak"], 1, "write tools never overlap")
+
+    def test_fallback_transport_records_the_bytes_it_sends(self) -> None:
+        import io
+        from unittest import mock
+
+        from tars_vault import perf, server
+
+        request = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                              "params": {"name": "read_note", "arguments": {"file": "missing"}}})
+        stdout = io.StringIO()
+        perf.RECORDER.reset()
+
+        def no_extra_encoding(payload):
+            raise AssertionError("transport calls must not re-serialize payloads to measure them")
+
+        with mock.patch.object(server, "_payload_size", no_extra_encoding), \
+                mock.patch.object(server, "_check_install_record", lambda vault: None), \
+                mock.patch.object(server._telemetry, "rotate_in_background", lambda vault: None), \
+                mock.patch("sys.stdin", io.StringIO(request + "\n")), mock.patch("sys.stdout", stdout), \
+                mock.patch("sys.stderr", io.StringIO()):
+            self.assertEqual(server._run_minimal_stdio(str(self.vault)), 0)
+
+        response = json.loads(stdout.getvalue())
+        stats = perf.RECORDER.report()["tools"]["read_note"]
+        self.assertEqual(stats["bytes_in"], len(request))
+        self.assertEqual(stats["bytes_out"], len(response["result"]["content"][0]["text"]))
+        perf.RECORDER.reset()
+
     def test_runtime_info_reports_helper_state_without_mutation(self) -> None:
         r = runtime_info(vault=str(self.vault))
         self.assertEqual(r["status"], "ok")
         self.assertEqual(r["helper"], "connected")
         self.assertIn("checks", r)
 
+    def test_runtime_info_perf_reports_tool_latency_percentiles(self) -> None:
+        from tars_vault import perf
+
+        perf.RECORDER.reset()
+        for _ in range(3):
+            _call_handler_sync("read_note", {"vault": str(self.vault), "file": "missing"}, "")
+        r = _call_handler_sync("runtime_info", {"vault": str(self.vault), "perf": True}, "")
+        self.assertEqual(r["status"], "ok")
+        stats = r["perf"]["tools"]["read_note"]
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["errors"], {"ToolError": 3})
+        self.assertGreater(stats["bytes_in"], 0)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertTrue(r["perf"]["slowest"])
+        perf.RECORDER.flush()
+        if os.environ.get("TARS_DISABLE_TELEMETRY"):
+            return
+        written = list((self.vault / "_system" / "telemetry").glob("perf-*.jsonl"))
+        self.assertEqual(len(written), 1)
+        self.assertIn('"tool_perf"', written[0].read_text())
+
+    def test_latency_histogram_percentiles_within_bucket_resolution(self) -> None:
+        from tars_vault.perf import LatencyHistogram
+
+        h = LatencyHistogram()
+        for value in range(1, 10001):
+            h.record(value * 100)
+        for pct, exact in ((50, 500_000), (95, 950_000), (99, 990_000)):
+            self.assertLessEqual(abs(h.percentile(pct) - exact) / exact, 0.07)
+        self.assertEqual(h.percentile(100), 1_000_000)
+
+    def test_deadline_returns_truncated_partial_results(self) -> None:
+        (self.vault / "memory" / "people" / "dana.md").write_text("---\ntags: [tars/person]\n---\nDana\n")
+        full = _call_handler_sync("entity_timeline", {"vault": str(self.vault), "query": "Dana"}, "")
+        self.assertEqual(full["count"], 1)
+        self.assertNotIn("truncated", full)
+        r = _call_handler_sync("entity_timeline", {"vault": str(self.vault), "query": "Dana", "deadline_ms": 0}, "")
+        self.assertEqual(r["status"], "ok")
+        self.assertTrue(r["truncated"])
+        self.assertEqual(r["truncated_reason"], "deadline")
+        self.assertEqual(r["count"], 0)
+        r = _call_handler_sync("context_gaps", {"vault": str(self.vault), "deadline_ms": 0}, "")
+        self.assertTrue(r["truncated"])
+        self.assertFalse((self.vault / "_system" / "activity-ledger.yaml").exists())
+
+    def test_cancelled_call_stops_iteration(self) -> None:
+        from tars_vault.call_context import CallContext
+
+        (self.vault / "contexts" / "artifacts").mkdir(parents=True)
+        (self.vault / "contexts" / "artifacts" / "a.md").write_text("same\n")
+        (self.vault / "contexts" / "artifacts" / "b.md").write_text("same\n")
+        ctx = CallContext()
+        ctx.cancel()
+        r = _call_handler_sync("detect_near_duplicates", {"vault": str(self.vault)}, "", ctx)
+        self.assertTrue(r["truncated"])
+        self.assertEqual(r["truncated_reason"], "cancelled")
+        self.assertEqual(r["cluster_count"], 0)
+
+    def test_vault_sweeps_report_monotonic_progress(self) -> None:
+        from tars_vault import call_context
+
+        for i in range(3):
+            (self.vault / "memory" / "people" / f"p{i}.md").write_text("---\ntags: [tars/person]\n---\nx\n")
+        sent: list[tuple[int, int | None, str | None]] = []
+        ctx = call_context.CallContext(progress=lambda done, total, msg: sent.append((done, total, msg)))
+        original = call_context.PROGRESS_INTERVAL_SECONDS
+        call_context.PROGRESS_INTERVAL_SECONDS = 0.0
+        try:
+            r = _call_handler_sync("context_gaps", {"vault": str(self.vault)}, "", ctx)
+        finally:
+            call_context.PROGRESS_INTERVAL_SECONDS = original
+        self.assertEqual(r["status"], "ok")
+        done = [item[0] for item in sent]
+        self.assertEqual(done, sorted(set(done)))
+        self.assertEqual(sent[-1][0], sent[-1][1])
+        self.assertIn("Reading notes", {item[2] for item in sent})
+
     # --- search / classify / dedupe ---
 
     def test_search_by_tag(self) -> None:
@@ -705,6 +987,105 @@ class ToolTests(unittest.TestCase):
         self.assertTrue(r["blocked"])
         self.assertIn("tag:tars/task", r["matched_by"])
 
+    def test_telemetry_sink_batches_writes_and_counts_drops(self) -> None:
+        sink = TelemetrySink(maxsize=3)
+        target = self.vault / "_system" / "telemetry" / "perf-test.jsonl"
+        for i in range(5):
+            sink.submit(self.vault, target, json.dumps({"i": i}) + "\n")
+        self.assertEqual(sink.stats()["dropped"], 2)
+
+        sink.start()
+        self.assertTrue(sink.flush())
+        self.assertEqual(sink.stats()["written"], 3)
+        sink.stop()
+        self.assertFalse(sink.running)
+
+        self.assertEqual([json.loads(line) for line in target.read_text().splitlines()], [{"i": 0}, {"i": 1}, {"i": 2}])
+        drops = list((self.vault / "_system" / "telemetry").glob("perf-????-??-??.jsonl"))
+        self.assertEqual(len(drops), 1)
+        self.assertIn('"telemetry_dropped"', drops[0].read_text())
+
+    def test_trace_argument_records_tool_span_under_callers_trace(self) -> None:
+        if os.environ.get("TARS_DISABLE_TELEMETRY"):
+            self.skipTest("telemetry disabled")
+        traces = self.vault / "_system" / "telemetry"
+        _call_handler_sync("read_note", {"vault": str(self.vault), "file": "missing"}, "")
+        self.assertEqual(list(traces.glob("traces-*.jsonl")), [])
+
+        trace = {"trace_id": "a" * 32, "parent_span_id": "b" * 16}
+        r = _call_handler_sync("read_note", {"vault": str(self.vault), "file": "missing", "_trace": trace}, "")
+        self.assertNotIn("unknown argument", r.get("reason", ""))
+        (written,) = traces.glob("traces-*.jsonl")
+        (span,) = [json.loads(line) for line in written.read_text().splitlines()]
+        self.assertEqual((span["trace_id"], span["parent_id"]), ("a" * 32, "b" * 16))
+        self.assertEqual(span["name"], "tool.read_note")
+        self.assertEqual(span["status"], "error")
+        self.assertGreaterEqual(span["dur_us"], 0)
+
+    def test_hook_and_tool_spans_share_the_session_trace(self) -> None:
+        import importlib.util
+        from unittest import mock
+
+        if os.environ.get("TARS_DISABLE_TELEMETRY"):
+            self.skipTest("telemetry disabled")
+        spec = importlib.util.spec_from_file_location("tars_hooks_common", REPO / "hooks" / "_common.py")
+        hooks_common = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(hooks_common)
+
+        traces = self.vault / "_system" / "telemetry"
+        env = {"TARS_TRACE": "1", "TARS_SESSION_ID": "session-42"}
+        with mock.patch.dict(os.environ, env):
+            os.environ.pop("TARS_TRACE_ID", None)
+            with hooks_common.trace_span("hook.pre_tool_use", {"session_id": "session-42"}, vault=self.vault):
+                pass
+            _call_handler_sync("read_note", {"vault": str(self.vault), "file": "missing"}, "")
+        _call_handler_sync(
+            "read_note", {"vault": str(self.vault), "file": "missing", "_trace": {"session_id": "session-42"}}, ""
+        )
+        (written,) = traces.glob("traces-*.jsonl")
+        spans = [json.loads(line) for line in written.read_text().splitlines()]
+        self.assertEqual([span["proc"] for span in spans], ["hook", "tars-vault", "tars-vault"])
+        self.assertEqual(len({span["trace_id"] for span in spans}), 1)
+        self.assertEqual(spans[0]["trace_id"], hooks_common.trace_id_for_session("session-42"))
+
+    def test_profile_argument_writes_bounded_reports(self) -> None:
+        from tars_vault import profiling
+
+        r = _call_handler_sync("search_by_tag", {"vault": str(self.vault), "tag": "tars/person", "profile": "all"}, "")
+        self.assertEqual(r["status"], "ok")
+        prof = r["profile"]
+        if prof.get("skipped"):
+            self.skipTest(prof["skipped"])
+        self.assertEqual(prof["mode"], "all")
+        self.assertTrue((self.vault / prof["pstats"]).is_file())
+        report = (self.vault / prof["report"]).read_text()
+        self.assertIn("## cProfile", report)
+        self.assertIn("## tracemalloc", report)
+
+        bad = _call_handler_sync("search_by_tag", {"vault": str(self.vault), "tag": "x", "profile": "gpu"}, "")
+        self.assertEqual(bad["status"], "error")
+
+        out_dir = self.vault / profiling.PROFILE_DIR
+        for i in range(profiling.RETENTION + 5):
+            (out_dir / f"20000101T0000{i:02d}000000Z-old.txt").write_text("x")
+        profiling._prune(out_dir)
+        stems = {path.stem for path in out_dir.iterdir()}
+        self.assertEqual(len(stems), profiling.RETENTION)
+        self.assertIn(Path(prof["report"]).stem, stems)
+
+    def test_ownership_matcher_is_reused_until_manifest_changes(self) -> None:
+        self._install_owned_tasks_extension(paths="tasks/**/*.md")
+        owner = blocking_workspace_owner(self.vault, path="tasks/2026/review", tags=[])
+        self.assertEqual(owner["matched_by"], "path:tasks/**/*.md")
+        matcher = ownership_matcher(self.vault)
+        self.assertIs(ownership_matcher(self.vault), matcher)
+
+        self._install_owned_tasks_extension(paths="projects/**", tags="tars/project")
+        self.assertIsNot(ownership_matcher(self.vault), matcher)
+        self.assertIsNone(blocking_workspace_owner(self.vault, path="tasks/2026/review.md", tags=["tars/task"]))
+        owner = blocking_workspace_owner(self.vault, path="memory/x.md", tags=["tars/note", "tars/project"])
+        self.assertEqual(owner["matched_by"], "tag:tars/project")
+
     def test_extension_owned_existing_note_blocks_append_update_move_archive(self) -> None:
         self._install_owned_tasks_extension()
         task = self.vault / "tasks" / "owned.md"
@@ -36,6 +36,7 @@ import argparse
 import json
 import re
 import sys
+from contextlib import nullcontext
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -46,6 +47,12 @@ try:
 except ImportError:
     HAS_YAML = False
 
+try:  # optional: continue the caller's trace (TARS_TRACE_ID) as a child span
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mcp" / "tars-vault" / "src"))
+    from tars_vault import tracing as _tracing
+except Exception:
+    _tracing = None
+
 
 def _parse_yaml_scalar(value: str) -> Any:
     raw = value.strip()
@@ -424,6 +431,14 @@ def main(argv: list[str] | None = None) -> int:
         print(f"error: vault path not a directory: {vault}", file=sys.stderr)
         return 3
 
+    span = _tracing.span(vault, "script.archive", proc="archive.py", check=args.check) if _tracing else nullcontext()
+    with span:
+        output = _collect(args, vault)
+    print(json.dumps(output, indent=2, default=str))
+    return 0
+
+
+def _collect(args: argparse.Namespace, vault: Path) -> dict[str, Any]:
     output: dict[str, Any] = {
         "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
         "vault": str(vault),
@@ -451,9 +466,7 @@ def main(argv: list[str] | None = None) -> int:
         output["checks"].append("inbox")
         output["inbox"] = inbox
         output["summary"]["inbox_cleanup_candidates"] = len(inbox)
-
-    print(json.dumps(output, indent=2, default=str))
-    return 0
+    return output
 
 
 if __name__ == "__main__":
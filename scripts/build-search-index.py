@@ -7,16 +7,57 @@ Tier B: FTS5 + sqlite-vec over ``journal/``, ``archive/transcripts/``,
 
 Writes ``_system/search.db`` and ``_system/search-index-state.json`` inside the
 vault. Per PRD §6.4 the build is incremental — SHA-256 per file gates re-work.
+The index runs in WAL mode and the build commits every ``COMMIT_EVERY_FILES``
+files or ``COMMIT_EVERY_SECONDS``, so ``fts_search`` / ``semantic_search``
+(read-only connections) keep answering from committed rows during a rebuild.
+
+Each run also reconciles the index against the walk: rows for notes that no
+longer exist are deleted in bulk, and a note that reappears under a new path
+with the same SHA-256 (a rename or move) keeps its chunks and embeddings —
+only the FTS row and path columns are rewritten. After deletions, or every
+``OPTIMIZE_INTERVAL_DAYS``, FTS5 segments are merged and ``PRAGMA optimize``
+runs; ``VACUUM`` follows on ``--vacuum`` or once free pages pass
+``VACUUM_FREE_RATIO`` of the file.
 
 Contract per PRD §26.15:
   --vault <path>   required
   --dry-run        report what would change, no writes
   --apply          write the index
   --json           emit machine-readable status
+  --vacuum         VACUUM the index after the build (reclaims disk)
+  --model NAME     FastEmbed model; default: the index's active space, or
+                   BAAI/bge-small-en-v1.5 for a new index
+  --quantize MODE  none | int8 | binary — add a quantized vector copy for a
+                   fast first-pass KNN, rescored against float32. Omitted:
+                   keep the index's current mode. Switching re-derives the
+                   copy from stored vectors; nothing is re-embedded.
+  --reranker       also download the cross-encoder ``rerank`` uses, so
+                   queries never need the network
+  --layout MODE    single | sharded — ``sharded`` puts dated Tier B notes in
+                   ``_system/search/<source_type>-<year>.db``. Omitted: keep
+                   the current layout. Switching rebuilds the index.
 Exit codes: 0 OK, 1 interrupted, 2 error, 3 invalid state.
 
 Graceful degradation: if ``fastembed`` or ``sqlite-vec`` fails to import, the
 script still builds the FTS5 layer. Semantic fallback signalled via meta.
+Embedding spaces: vectors live in a per-model space recorded in the index
+``meta`` (see ``tars_vault.search_index``). ``--model`` naming a model other
+than the active one starts a migration: new and changed notes keep going to
+the active space, which keeps serving queries, while each run embeds a
+bounded slice of ``chunks.text`` into the new space; once it covers every
+chunk the script cuts over atomically. Later runs without ``--model``
+resume an unfinished migration.
+
+When FastEmbed works but sqlite-vec does not, embeddings go to the flat-file
+``tars_vault.vector_store`` instead (searched with NumPy by
+``semantic_search``). Each state entry records which backend holds its
+vectors, so notes are re-embedded once when the backend changes.
+
+Sharded layout: each state entry records its shard, so a note whose date
+or type moves it is deleted from the old shard. Only shards written this
+run are optimized; a past year's shard is untouched once its notes settle.
+A shard written this run that ends up with no notes is deleted.
+The flat-file store is single-layout only (chunk ids are per database).
 """
 from __future__ import annotations
 
@@ -37,11 +78,19 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT / "mcp" / "tars-vault" / "src"))
 
 from tars_vault import search_index as si  # noqa: E402
+from tars_vault import vector_store  # noqa: E402
+from tars_vault.tools.rerank import CROSS_ENCODER_MODEL  # noqa: E402
 
 
-DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
+DEFAULT_MODEL = si.DEFAULT_MODEL
 FALLBACK_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 RUN_BUDGET_SECONDS = 600  # 10-minute cap per run (PRD §6.4 bounded).
+COMMIT_EVERY_FILES = 50  # bounded write transactions keep the WAL small and
+COMMIT_EVERY_SECONDS = 2.0  # searches see progress during a long rebuild
+MIGRATION_BATCH = 64
+OPTIMIZE_INTERVAL_DAYS = 7
+VACUUM_FREE_RATIO = 0.25
+LAYOUTS = ("single", "sharded")
 
 
 class IndexError(Exception):
@@ -58,9 +107,13 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--apply", action="store_true")
     parser.add_argument("--json", action="store_true")
+    parser.add_argument("--vacuum", action="store_true")
+    parser.add_argument("--quantize", choices=si.QUANTIZATION_MODES, default=None)
+    parser.add_argument("--layout", choices=LAYOUTS, default=None)
+    parser.add_argument("--reranker", action="store_true")
     parser.add_argument(
-        "--model", default=DEFAULT_MODEL,
-        help="FastEmbed model name (default: BAAI/bge-small-en-v1.5)",
+        "--model", default=None,
+        help="FastEmbed model name (default: the active space's model, else BAAI/bge-small-en-v1.5)",
     )
     return parser
 
@@ -112,11 +165,13 @@ class Embedder:
     """Loads FastEmbed lazily. On import failure, ``available`` is False and
     callers must fall back to FTS-only mode."""
 
-    def __init__(self, model: str, cache_dir: Path) -> None:
+    def __init__(self, model: str, cache_dir: Path, *, allow_fallback: bool = True) -> None:
         self.model_name = model
         self.cache_dir = cache_dir
+        self.allow_fallback = allow_fallback
         self.available = False
         self._impl = None
+        self._dimension: int | None = None
         self._load()
 
     def _load(self) -> None:
@@ -129,7 +184,9 @@ class Embedder:
         try:
             self._impl = TextEmbedding(model_name=self.model_name, cache_dir=str(self.cache_dir))
         except Exception as exc:
-            if self.model_name != FALLBACK_MODEL:
+            # Falling back is only safe before a space exists; afterwards the
+            # fallback's vectors would not be comparable with the index.
+            if self.allow_fallback and self.model_name != FALLBACK_MODEL:
                 try:
                     self._impl = TextEmbedding(model_name=FALLBACK_MODEL, cache_dir=str(self.cache_dir))
                     self.model_name = FALLBACK_MODEL
@@ -147,6 +204,12 @@ class Embedder:
             raise IndexError(f"embedder unavailable: {self._reason}")
         return [list(map(float, v)) for v in self._impl.embed(texts)]
 
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = len(self.embed(["dimension probe"])[0])
+        return self._dimension
+
     @property
     def reason(self) -> str:
         return getattr(self, "_reason", "")
@@ -156,6 +219,24 @@ class Embedder:
 # Per-file indexing
 # ---------------------------------------------------------------------------
 
+def note_record(vault: Path, file_path: Path) -> si.NoteRecord | None:
+    relative = file_path.relative_to(vault).as_posix()
+    tier = si.classify_tier(relative)
+    if tier is None:
+        return None
+    text = file_path.read_text(encoding="utf-8", errors="replace")
+    frontmatter_raw, body = si.split_frontmatter(text)
+    return si.NoteRecord(
+        path=relative,
+        title=si.extract_title(file_path, body),
+        tags=si.extract_tags(frontmatter_raw),
+        body=body,
+        tier=tier,
+        source_type=si.source_type_for(relative),
+        date=si.extract_date(frontmatter_raw, relative),
+    )
+
+
 def index_file(
     conn: sqlite3.Connection,
     vault: Path,
@@ -163,27 +244,15 @@ def index_file(
     embedder: Embedder | None,
     *,
     vec_enabled: bool,
+    flat_store: bool = False,
+    dim: int = si.EMBED_DIM,
+    record: si.NoteRecord | None = None,
 ) -> dict:
     relative = file_path.relative_to(vault).as_posix()
-    tier = si.classify_tier(relative)
-    if tier is None:
+    record = record or note_record(vault, file_path)
+    if record is None:
         return {"path": relative, "status": "skipped"}
-    text = file_path.read_text(encoding="utf-8", errors="replace")
-    frontmatter_raw, body = si.split_frontmatter(text)
-    title = si.extract_title(file_path, body)
-    tags = si.extract_tags(frontmatter_raw)
-    date = si.extract_date(frontmatter_raw, relative)
-    source_type = si.source_type_for(relative)
-
-    record = si.NoteRecord(
-        path=relative,
-        title=title,
-        tags=tags,
-        body=body,
-        tier=tier,
-        source_type=source_type,
-        date=date,
-    )
+    tier, body = record.tier, record.body
 
     si.delete_path(conn, relative, vec_enabled=vec_enabled)
     si.upsert_note_fts(conn, record)
@@ -193,10 +262,12 @@ def index_file(
         chunks = si.chunk_body(body)
         chunk_count = len(chunks)
         embeddings = None
-        if chunks and embedder is not None and embedder.available and vec_enabled:
+        if chunks and embedder is not None and embedder.available and (vec_enabled or flat_store):
             embeddings = embedder.embed([c.text for c in chunks])
         if chunks:
-            si.upsert_chunks(conn, record, chunks, embeddings, vec_enabled=vec_enabled)
+            chunk_ids = si.upsert_chunks(conn, record, chunks, embeddings, vec_enabled=vec_enabled)
+            if flat_store and embeddings is not None:
+                vector_store.append(vault, chunk_ids, embeddings, dim)
     return {"path": relative, "status": "indexed", "tier": tier, "chunks": chunk_count}
 
 
@@ -204,79 +275,384 @@ def index_file(
 # Main
 # ---------------------------------------------------------------------------
 
-def run(vault: Path, *, apply_writes: bool, model: str) -> dict:
+class IndexSet:
+    """``search.db`` plus the shard DBs a sharded build opens on demand.
+
+    Shards get the main index's schema, quantization mode, and (through
+    ``prepare``) its active embedding space. ``dirty`` names the shards
+    written this run.
+    """
+
+    def __init__(self, vault: Path, main: sqlite3.Connection, *, sharded: bool, vec_enabled: bool) -> None:
+        self.vault = vault
+        self.sharded = sharded
+        self.vec_enabled = vec_enabled
+        self.quantization: str | None = None
+        self.prepare = None
+        self.conns: dict[str, sqlite3.Connection] = {si.MAIN_SHARD: main}
+        self.dirty: set[str] = set()
+
+    def name_for(self, record: si.NoteRecord) -> str:
+        return si.shard_name(record.source_type, record.date) if self.sharded else si.MAIN_SHARD
+
+    def get(self, name: str) -> sqlite3.Connection:
+        conn = self.conns.get(name)
+        if conn is None:
+            conn, _ = si.open_index(si.shard_path(self.vault, name), load_vec=self.vec_enabled)
+            si.init_schema(conn, vec_enabled=self.vec_enabled, quantization=self.quantization)
+            if self.prepare is not None:
+                self.prepare(conn)
+            conn.commit()
+            self.conns[name] = conn
+        return conn
+
+    def writer(self, name: str) -> sqlite3.Connection:
+        self.dirty.add(name)
+        return self.get(name)
+
+    def open_all(self) -> None:
+        for name in si.list_shards(self.vault):
+            self.get(name)
+
+    def commit(self) -> None:
+        for conn in self.conns.values():
+            conn.commit()
+
+    def drop_empty(self) -> list[str]:
+        """Delete the shards written this run that no longer hold a note."""
+        dropped = []
+        for name in sorted(self.dirty):
+            conn = self.conns.get(name)
+            if name and conn is not None and si.is_empty(conn):
+                conn.close()
+                del self.conns[name]
+                self.dirty.discard(name)
+                si.remove_shard(self.vault, name)
+                dropped.append(name)
+        return dropped
+
+    def close(self) -> None:
+        for conn in self.conns.values():
+            conn.close()
+
+
+def fetch_reranker(vault: Path) -> str:
+    """Download the ``rerank`` cross-encoder into the embedding cache."""
+    try:
+        from fastembed.rerank.cross_encoder import TextCrossEncoder  # type: ignore
+    except Exception as exc:
+        return f"unavailable: fastembed cross-encoder import failed: {exc}"
+    cache = vault / "_system" / "embedding-cache"
+    cache.mkdir(parents=True, exist_ok=True)
+    try:
+        TextCrossEncoder(model_name=CROSS_ENCODER_MODEL, cache_dir=str(cache))
+    except Exception as exc:
+        return f"unavailable: {exc}"
+    return "ready"
+
+
+def match_renames(
+    candidates: list[tuple[Path, str]],
+    vault: Path,
+    orphans: set[str],
+    files_state: dict,
+) -> list[tuple[str, Path, str]]:
+    """Pair new candidates with orphaned state entries of the same SHA + tier.
+
+    Returns ``(old_path, file_path, sha)``; matched candidates are removed
+    from ``candidates`` and matched paths from ``orphans``.
+    """
+    by_sha: dict[tuple[str, str], list[str]] = {}
+    for old in sorted(orphans):
+        entry = files_state.get(old) or {}
+        if entry.get("sha") and entry.get("tier"):
+            by_sha.setdefault((entry["sha"], entry["tier"]), []).append(old)
+    renames: list[tuple[str, Path, str]] = []
+    remaining: list[tuple[Path, str]] = []
+    for file_path, sha in candidates:
+        tier = si.classify_tier(file_path.relative_to(vault).as_posix())
+        olds = by_sha.get((sha, tier or ""))
+        if olds:
+            old = olds.pop(0)
+            orphans.discard(old)
+            renames.append((old, file_path, sha))
+        else:
+            remaining.append((file_path, sha))
+    candidates[:] = remaining
+    return renames
+
+
+def _optimize_due(state: dict, removed: int) -> bool:
+    if removed:
+        return True
+    last = state.get("last_optimize")
+    if not last:
+        return True
+    try:
+        return time.time() - time.mktime(time.strptime(last, "%Y-%m-%dT%H:%M:%S")) >= OPTIMIZE_INTERVAL_DAYS * 86400
+    except (TypeError, ValueError):
+        return True
+
+
+def migrate_space(conns: list[sqlite3.Connection], vault: Path, model: str, deadline: float) -> dict:
+    """Embed a slice of chunks into ``model``'s space; cut over when complete.
+
+    With shards, every database migrates and none cuts over until all of
+    them have the new space filled.
+    """
+    embedder = Embedder(model, cache_dir=vault / "_system" / "embedding-cache", allow_fallback=False)
+    if not embedder.available:
+        return {"model": model, "status": "unavailable", "reason": embedder.reason}
+    building = [(conn, si.begin_migration(conn, model, embedder.dimension)) for conn in conns]
+    building = [(conn, space) for conn, space in building if space is not None]
+    if not building:
+        return {"model": model, "status": "active"}
+    embedded = remaining = 0
+    for conn, space in building:
+        pending = si.pending_space_ids(conn, space["table"])
+        while pending and time.monotonic() < deadline:
+            batch, pending = pending[:MIGRATION_BATCH], pending[MIGRATION_BATCH:]
+            rows = si.chunk_rows(conn, batch)
+            si.insert_space_vectors(conn, space["table"], rows, embedder.embed([row["text"] for row in rows]))
+            conn.commit()
+            embedded += len(rows)
+        remaining += len(pending)
+    if remaining:
+        return {"model": model, "status": "building", "embedded": embedded, "remaining": remaining}
+    for conn, _ in building:
+        si.cutover(conn, model)
+    return {"model": model, "status": "cutover", "embedded": embedded, "remaining": 0}
+
+
+def run(
+    vault: Path,
+    *,
+    apply_writes: bool,
+    model: str | None,
+    vacuum: bool = False,
+    quantize: str | None = None,
+    layout: str | None = None,
+) -> dict:
     db_path = si.index_path(vault)
     state_path = si.state_path(vault)
     state = si.load_state(state_path)
+    current_layout = state.get("layout", "single")
+    layout = layout or current_layout
+    relayout = layout != current_layout
+    if relayout:
+        # Notes would land in different databases; start over rather than
+        # migrate rows between files.
+        if apply_writes:
+            si.remove_index(vault)
+            vector_store.remove(vault)
+        state = {}
+    state["layout"] = layout
     files_state: dict = state.setdefault("files", {})
 
     candidates: list[tuple[Path, str]] = []
+    walked: set[str] = set()
     for file_path in walk_markdown(vault):
         relative = file_path.relative_to(vault).as_posix()
         if si.classify_tier(relative) is None:
             continue
+        walked.add(relative)
         sha = si.file_sha256(file_path)
         prior = files_state.get(relative, {})
         if prior.get("sha") == sha:
             continue
         candidates.append((file_path, sha))
 
+    orphans = set(files_state) - walked
+    renames = match_renames(candidates, vault, orphans, files_state)
+
     summary = {
         "vault": str(vault),
         "db_path": str(db_path),
         "state_path": str(state_path),
         "mode": "apply" if apply_writes else "dry-run",
+        "layout": layout,
+        "relayout": relayout,
         "candidate_files": len(candidates),
         "indexed": 0,
         "chunks": 0,
-        "skipped_unchanged": len(files_state),
+        "renamed": len(renames),
+        "removed": len(orphans),
+        "optimized": False,
+        "vacuumed": False,
+        "skipped_unchanged": len(files_state) - len(orphans) - len(renames),
         "vec_enabled": False,
         "embedder_available": False,
         "embedder_reason": "",
         "model": model,
+        "quantization": quantize,
         "budget_exhausted": False,
     }
 
     if not apply_writes:
         summary["note"] = "dry-run — no writes. Use --apply to build."
         summary["candidates_sample"] = [p.relative_to(vault).as_posix() for p, _ in candidates[:20]]
+        summary["removed_sample"] = sorted(orphans)[:20]
+        summary["renamed_sample"] = [
+            {"from": old, "to": p.relative_to(vault).as_posix()} for old, p, _ in renames[:20]
+        ]
         return summary
 
     conn, vec_enabled = si.open_index(db_path, load_vec=True)
-    si.init_schema(conn, vec_enabled=vec_enabled)
+    si.init_schema(conn, vec_enabled=vec_enabled, quantization=quantize)
     summary["vec_enabled"] = vec_enabled
-
-    embedder = None
+    summary["quantization"] = si.index_quantization(conn) if vec_enabled else "none"
+    ix = IndexSet(vault, conn, sharded=layout == "sharded", vec_enabled=vec_enabled)
+    ix.quantization = summary["quantization"]
+
+    # The active space's model serves and receives new notes; ``target`` is
+    # where a migration is headed (itself when there is none).
+    active = si.active_space(conn) if vec_enabled else None
+    building = si.building_space(conn) if vec_enabled else None
     if vec_enabled:
-        embedder = Embedder(model, cache_dir=vault / "_system" / "embedding-cache")
-        summary["embedder_available"] = embedder.available
-        summary["embedder_reason"] = embedder.reason
-        summary["model"] = embedder.model_name
-    if not vec_enabled or (embedder is not None and not embedder.available):
+        serve_model = active["model"] if active else (model or DEFAULT_MODEL)
+        target_model = model or (building["model"] if building else serve_model)
+    else:
+        serve_model = target_model = model or si.get_meta(conn, "flat_model") or DEFAULT_MODEL
+    embedder = Embedder(serve_model, cache_dir=vault / "_system" / "embedding-cache", allow_fallback=active is None)
+    if vec_enabled and embedder.available and active is None:
+        active = si.ensure_active_space(conn, embedder.model_name, embedder.dimension)
+        target_model = model if model and model != embedder.model_name else active["model"]
+    if vec_enabled and embedder.available:
+        ix.prepare = lambda shard: si.ensure_active_space(shard, embedder.model_name, embedder.dimension)
+    summary["embedder_available"] = embedder.available
+    summary["embedder_reason"] = embedder.reason
+    summary["model"] = embedder.model_name
+    vector_backend = None
+    if embedder.available and (vec_enabled or not ix.sharded):
+        vector_backend = "sqlite-vec" if vec_enabled else "flat"
+    requeue_all = False
+    if vector_backend == "flat" and si.get_meta(conn, "flat_model") != embedder.model_name:
+        # The flat store holds one model's vectors; a new model refills it.
+        vector_store.remove(vault)
+        si.set_meta(conn, "flat_model", embedder.model_name)
+        si.set_meta(conn, "flat_dim", str(embedder.dimension))
+        conn.commit()
+        requeue_all = True
+    summary["vector_backend"] = vector_backend
+    if vector_backend is None and embedder.available:
+        summary.setdefault("note", "sqlite-vec unavailable and the sharded layout has no flat store — FTS-only index")
+    elif vector_backend is None:
         summary.setdefault("note", "semantic layer disabled — FTS-only index")
+    elif vector_backend == "flat":
+        summary.setdefault("note", "sqlite-vec unavailable — vectors in flat-file store (NumPy search)")
 
     started = time.monotonic()
     try:
+        # Group deletions by the database holding each note.
+        doomed: dict[str, set[str]] = {}
+        for old in orphans:
+            doomed.setdefault(files_state[old].get("shard", si.MAIN_SHARD), set()).add(old)
+        renamed_from = {old for old, _, _ in renames}
+        for old, file_path, sha in renames:
+            record = note_record(vault, file_path)
+            entry = files_state.pop(old)
+            shard = entry.get("shard", si.MAIN_SHARD)
+            if ix.name_for(record) != shard:
+                doomed.setdefault(shard, set()).add(old)  # moved shards; re-index there
+                candidates.append((file_path, sha))
+                continue
+            if si.rename_path(ix.writer(shard), old, record) == 0 and entry.get("chunks"):
+                candidates.append((file_path, sha))  # chunks were lost; re-embed
+                continue
+            files_state[record.path] = dict(entry, sha=sha)
+        # Rows the state map never recorded (e.g. a run killed before
+        # save_state) are orphans too when their note is gone.
+        for name in {si.MAIN_SHARD, *doomed}:
+            doomed.setdefault(name, set()).update(si.indexed_paths(ix.get(name)) - walked - renamed_from)
+        removed = 0
+        for name, paths in doomed.items():
+            if paths:
+                si.delete_paths(ix.writer(name), paths, vec_enabled=vec_enabled)
+                removed += len(paths)
+            for old in paths:
+                files_state.pop(old, None)
+        summary["removed"] = removed
+        ix.commit()
+
+        if vector_backend:
+            # Unchanged notes whose vectors live in another backend (or were
+            # never embedded) are re-embedded once.
+            queued = {p.relative_to(vault).as_posix() for p, _ in candidates}
+            for rel, entry in sorted(files_state.items()):
+                if (rel in walked and rel not in queued and entry.get("tier") == "B" and entry.get("chunks")
+                        and (requeue_all or entry.get("vectors", "sqlite-vec") != vector_backend)):
+                    candidates.append((vault / rel, entry["sha"]))
+            summary["candidate_files"] = len(candidates)
+
+        pending, last_commit = 0, time.monotonic()
         for file_path, sha in candidates:
+            if pending >= COMMIT_EVERY_FILES or (pending and time.monotonic() - last_commit > COMMIT_EVERY_SECONDS):
+                ix.commit()
+                pending, last_commit = 0, time.monotonic()
             if time.monotonic() - started > RUN_BUDGET_SECONDS:
                 summary["budget_exhausted"] = True
                 break
+            record = note_record(vault, file_path)
+            if record is None:
+                continue
+            shard = ix.name_for(record)
+            prior_shard = files_state.get(record.path, {}).get("shard", si.MAIN_SHARD)
+            if record.path in files_state and prior_shard != shard:
+                si.delete_path(ix.writer(prior_shard), record.path, vec_enabled=vec_enabled)
             result = index_file(
-                conn, vault, file_path, embedder,
-                vec_enabled=vec_enabled and (embedder is None or embedder.available),
+                ix.writer(shard), vault, file_path, embedder,
+                vec_enabled=vec_enabled and embedder.available,
+                flat_store=vector_backend == "flat",
+                dim=embedder.dimension if vector_backend == "flat" else si.EMBED_DIM,
+                record=record,
             )
             if result.get("status") == "indexed":
+                pending += 1
                 summary["indexed"] += 1
                 summary["chunks"] += result.get("chunks", 0)
                 files_state[result["path"]] = {
                     "sha": sha,
                     "tier": result["tier"],
                     "chunks": result["chunks"],
+                    "vectors": vector_backend,
                     "indexed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    **({"shard": shard} if shard else {}),
                 }
-        conn.commit()
+        ix.commit()
+        if ix.sharded:
+            summary["shards_removed"] = ix.drop_empty()
+
+        if vector_backend == "flat" and (summary["indexed"] or removed):
+            live = [row[0] for row in conn.execute("SELECT id FROM chunks")]
+            summary["vector_store_compacted"] = vector_store.compact(vault, live, embedder.dimension)
+        elif vector_backend == "sqlite-vec":
+            vector_store.remove(vault)
+
+        if active is not None and target_model != active["model"] and not summary["budget_exhausted"]:
+            ix.open_all()
+            summary["migration"] = migrate_space(
+                list(ix.conns.values()), vault, target_model, started + RUN_BUDGET_SECONDS
+            )
+
+        # search.db is always considered; a shard only when written this run
+        # (or on an explicit --vacuum), so settled years are left alone.
+        due = _optimize_due(state, removed)
+        if vacuum:
+            ix.open_all()
+        for name, shard_conn in ix.conns.items():
+            if name and name not in ix.dirty and not vacuum:
+                continue
+            shard_vacuum = vacuum or si.free_page_ratio(shard_conn) >= VACUUM_FREE_RATIO
+            if shard_vacuum or due:
+                si.optimize(shard_conn, vacuum=shard_vacuum)
+                summary["optimized"] = True
+                summary["vacuumed"] = summary["vacuumed"] or shard_vacuum
+        if summary["optimized"]:
+            state["last_optimize"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if ix.sharded:
+            summary["shards_written"] = sorted(name for name in ix.dirty if name)
     finally:
-        conn.close()
+        ix.close()
         si.save_state(state_path, state)
 
     return summary
@@ -299,10 +675,13 @@ def main(argv: list[str]) -> int:
             return 3
 
     try:
-        summary = run(vault, apply_writes=apply_writes, model=args.model)
+        summary = run(vault, apply_writes=apply_writes, model=args.model, vacuum=args.vacuum,
+                      quantize=args.quantize, layout=args.layout)
     except IndexError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
+    if args.reranker and apply_writes:
+        summary["reranker"] = fetch_reranker(vault)
 
     if args.json:
         print(json.dumps(summary, indent=2))
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""eval-search — offline retrieval quality + latency evaluation.
+
+Runs a labelled query set through ``fts_search`` / ``semantic_search`` /
+``rerank`` under several configurations and reports recall@k, MRR and nDCG@k
+next to per-stage latency (p50 / p95), so weight, pool-size, and index-format
+changes can be judged on data rather than by feel.
+
+Query file: JSON list or JSONL, one object per query:
+
+    {"query": "vendor renewal", "relevant": ["journal/2026-01/x.md", ...], "scope": "all"}
+
+``relevant`` holds vault-relative paths; results are compared per path
+(chunks of one note count once). ``scope`` is optional.
+
+Configurations (``--configs``, comma-separated):
+  fts                       fts_search over every tier
+  hybrid:w=0.7              semantic_search with semantic_weight 0.7
+  hybrid:w=0.7:pool=5       ... passing top_k=5 instead of k (smaller pool)
+  hybrid:w=0.7:rerank       ... followed by the deterministic rerank
+  hybrid:w=0.7:ce           ... followed by the cross-encoder rerank (falls
+                            back to deterministic without a cached model)
+Without fastembed / sqlite-vec, hybrid configs run FTS-only and the report
+marks them ``fallback: fts_only``.
+
+Contract:
+  --vault <path>       vault to evaluate (index built if missing)
+  --queries <file>     labelled query set
+  --synthetic N        instead: generate an N-note synthetic vault in
+                       <--vault>/synthetic-N with derived labels (needs a
+                       source checkout); --vault itself is never modified
+  --k N                cutoff for recall / nDCG; default 10
+  --configs LIST       default: fts + hybrid at w=0.3/0.5/0.7 + rerank + pool=5
+  --rebuild            rebuild the index before evaluating
+  --json               machine-readable output (default: text table)
+Exit codes: 0 OK, 2 error, 3 invalid state.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "mcp" / "tars-vault" / "src"))
+
+from tars_vault import search_index as _si  # noqa: E402
+from tars_vault.tools.fts_search import fts_search  # noqa: E402
+from tars_vault.tools.rerank import rerank  # noqa: E402
+from tars_vault.tools.semantic_search import semantic_search  # noqa: E402
+
+DEFAULT_CONFIGS = "fts,hybrid:w=0.3,hybrid:w=0.5,hybrid:w=0.7,hybrid:w=0.7:rerank,hybrid:w=0.7:pool=5"
+SYNTHETIC_QUERIES = 30
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="eval-search")
+    parser.add_argument("--vault", required=True)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--queries")
+    source.add_argument("--synthetic", type=int)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--configs", default=DEFAULT_CONFIGS)
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    return parser
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def load_queries(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        items = json.loads(text)
+    else:
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    queries = []
+    for item in items:
+        if isinstance(item, dict) and item.get("query") and item.get("relevant"):
+            queries.append({"query": str(item["query"]), "relevant": [str(p) for p in item["relevant"]],
+                            "scope": str(item.get("scope") or "all")})
+    return queries
+
+
+_DISCUSSED_RE = re.compile(r"^- Discussed (?P<topic>.+?) with (?P<links>.+)\.$")
+
+
+def synthetic_queries(vault: Path, n_notes: int) -> list[dict[str, Any]]:
+    """Generate a benchmark vault and label ``topic + person`` queries.
+
+    A journal is relevant to "<topic> <person>" when one of its bullets
+    discusses that topic with that person.
+    """
+    sys.path.insert(0, str(REPO_ROOT))
+    try:
+        from tests.regression.run_benchmarks import generate_vault
+    except ImportError as exc:
+        raise SystemExit(f"error: --synthetic needs tests/regression from a source checkout ({exc})")
+    generate_vault(vault, n_notes)
+    pairs: dict[tuple[str, str], set[str]] = {}
+    for path in sorted((vault / "journal").rglob("*.md")):
+        rel = path.relative_to(vault).as_posix()
+        for line in path.read_text(encoding="utf-8").splitlines():
+            m = _DISCUSSED_RE.match(line)
+            if not m:
+                continue
+            for person in re.findall(r"\[\[([^\]]+)\]\]", m.group("links")):
+                if not person.startswith("Initiative "):
+                    pairs.setdefault((m.group("topic"), person), set()).add(rel)
+    usable = sorted((key for key, docs in pairs.items() if 2 <= len(docs) <= 15), key=lambda k: (k[1], k[0]))
+    step = max(1, len(usable) // SYNTHETIC_QUERIES)
+    return [
+        {"query": f"{topic} {person}", "relevant": sorted(pairs[(topic, person)]), "scope": "all"}
+        for topic, person in usable[::step][:SYNTHETIC_QUERIES]
+    ]
+
+
+def ensure_index(vault: Path, rebuild: bool) -> None:
+    db = _si.index_path(vault)
+    if rebuild and db.exists():
+        _si.remove_index(vault)
+        _si.state_path(vault).unlink(missing_ok=True)
+    if db.is_file():
+        return
+    subprocess.run(
+        [sys.executable, str(REPO_ROOT / "scripts" / "build-search-index.py"), "--vault", str(vault), "--apply", "--json"],
+        check=True,
+        capture_output=True,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+def parse_config(spec: str) -> dict[str, Any]:
+    parts = [p.strip() for p in spec.split(":") if p.strip()]
+    if not parts or parts[0] not in {"fts", "hybrid"}:
+        raise SystemExit(f"error: unknown config {spec!r} (expected fts or hybrid[:w=..][:pool=..][:rerank|:ce])")
+    config: dict[str, Any] = {"name": spec, "kind": parts[0], "weight": None, "pool": None, "rerank": False}
+    for part in parts[1:]:
+        if part == "rerank":
+            config["rerank"] = True
+        elif part == "ce":
+            config["rerank"] = "ce"
+        elif part.startswith("w="):
+            config["weight"] = float(part[2:])
+        elif part.startswith("pool="):
+            config["pool"] = int(part[5:])
+        else:
+            raise SystemExit(f"error: unknown config option {part!r} in {spec!r}")
+    return config
+
+
+def run_query(vault: Path, config: dict[str, Any], query: dict[str, Any], k: int) -> tuple[list[str], dict[str, float], str | None]:
+    """Return (ranked unique paths, stage timings in ms, fallback)."""
+    stages: dict[str, float] = {}
+    fallback = None
+    started = time.perf_counter()
+    if config["kind"] == "fts":
+        scope = None if query["scope"] == "all" else query["scope"]
+        result = fts_search(vault=str(vault), query=query["query"], scope=scope, limit=k)
+        stages["fts"] = (time.perf_counter() - started) * 1000
+    else:
+        args: dict[str, Any] = {"vault": str(vault), "query": query["query"], "scope": query["scope"],
+                                "top_k": config["pool"] or k}
+        if config["weight"] is not None:
+            args["semantic_weight"] = config["weight"]
+        result = semantic_search(**args)
+        stages.update(result.get("timings_ms") or {})
+        fallback = result.get("fallback")
+        if config["rerank"] and result.get("results"):
+            started = time.perf_counter()
+            result = rerank(candidates=result["results"], query=query["query"], top_k=k,
+                            vault=str(vault), cross_encoder=config["rerank"] == "ce")
+            stages["rerank"] = (time.perf_counter() - started) * 1000
+            if config["rerank"] == "ce" and result.get("mode") != "cross_encoder":
+                fallback = fallback or "deterministic_rerank"
+    stages["total"] = sum(v for key, v in stages.items() if key != "total")
+    if result.get("status") == "error":
+        raise RuntimeError(f"{config['name']}: {result.get('reason')}")
+    ranked: list[str] = []
+    for row in result.get("results") or []:
+        path = row.get("path")
+        if path and path not in ranked:
+            ranked.append(path)
+    return ranked[:k], stages, fallback
+
+
+def score(ranked: list[str], relevant: set[str], k: int) -> dict[str, float]:
+    hits = [1.0 if path in relevant else 0.0 for path in ranked[:k]]
+    recall = sum(hits) / len(relevant) if relevant else 0.0
+    mrr = next((1.0 / (i + 1) for i, hit in enumerate(hits) if hit), 0.0)
+    dcg = sum(hit / math.log2(i + 2) for i, hit in enumerate(hits))
+    ideal = sum(1.0 / math.log2(i + 2) for i in range(min(len(relevant), k)))
+    return {"recall": recall, "mrr": mrr, "ndcg": dcg / ideal if ideal else 0.0}
+
+
+def _pct(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(len(ordered) * pct / 100) - 1))]
+
+
+def evaluate(vault: Path, queries: list[dict[str, Any]], configs: list[dict[str, Any]], k: int) -> list[dict[str, Any]]:
+    report = []
+    for config in configs:
+        metrics: dict[str, list[float]] = {"recall": [], "mrr": [], "ndcg": []}
+        stage_times: dict[str, list[float]] = {}
+        fallbacks = set()
+        for query in queries:
+            ranked, stages, fallback = run_query(vault, config, query, k)
+            for name, value in score(ranked, set(query["relevant"]), k).items():
+                metrics[name].append(value)
+            for stage, ms in stages.items():
+                stage_times.setdefault(stage, []).append(ms)
+            if fallback:
+                fallbacks.add(fallback)
+        report.append({
+            "config": config["name"],
+            f"recall@{k}": round(statistics.fmean(metrics["recall"]), 4),
+            "mrr": round(statistics.fmean(metrics["mrr"]), 4),
+            f"ndcg@{k}": round(statistics.fmean(metrics["ndcg"]), 4),
+            "latency_ms": {
+                stage: {"p50": round(_pct(values, 50), 3), "p95": round(_pct(values, 95), 3)}
+                for stage, values in stage_times.items()
+            },
+            "fallback": ",".join(sorted(fallbacks)) or None,
+        })
+    return report
+
+
+def render_text(report: list[dict[str, Any]], k: int, n_queries: int) -> str:
+    lines = [f"{n_queries} queries, k={k}", ""]
+    header = f"{'config':28s} {'recall@k':>9s} {'mrr':>7s} {'ndcg@k':>7s} {'p50 ms':>8s} {'p95 ms':>8s}  note"
+    lines += [header, "-" * len(header)]
+    for row in report:
+        total = row["latency_ms"].get("total", {"p50": 0.0, "p95": 0.0})
+        lines.append(
+            f"{row['config']:28s} {row[f'recall@{k}']:9.3f} {row['mrr']:7.3f} {row[f'ndcg@{k}']:7.3f} "
+            f"{total['p50']:8.2f} {total['p95']:8.2f}  {row['fallback'] or ''}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> int:
+    args = build_parser().parse_args(argv)
+    vault = Path(args.vault).expanduser().resolve()
+    if args.k < 1:
+        print("error: --k must be >= 1", file=sys.stderr)
+        return 2
+    configs = [parse_config(spec) for spec in args.configs.split(",") if spec.strip()]
+    if args.synthetic:
+        vault = vault / f"synthetic-{args.synthetic}"
+        try:
+            queries = synthetic_queries(vault, args.synthetic)
+        except FileExistsError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 3
+        args.rebuild = True
+    else:
+        if not vault.is_dir():
+            print(f"error: vault path not a directory: {vault}", file=sys.stderr)
+            return 3
+        queries = load_queries(Path(args.queries).expanduser())
+    if not queries:
+        print("error: no labelled queries", file=sys.stderr)
+        return 3
+    try:
+        ensure_index(vault, args.rebuild)
+    except subprocess.CalledProcessError as exc:
+        print(f"error: index build failed: {exc.stderr.decode('utf-8', 'replace')[:300]}", file=sys.stderr)
+        return 2
+    try:
+        report = evaluate(vault, queries, configs, args.k)
+    except RuntimeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps({"k": args.k, "queries": len(queries), "configs": report}, indent=2))
+    else:
+        print(render_text(report, args.k, len(queries)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -16,6 +16,12 @@ import shutil
 from pathlib import Path
 from datetime import datetime, date
 
+try:  # shared alias index (registry + note frontmatter) from the MCP server
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mcp" / "tars-vault" / "src"))
+    from tars_vault import alias_registry as _alias_registry
+except Exception:
+    _alias_registry = None
+
 try:
     import yaml
     HAS_YAML = True
@@ -239,8 +245,17 @@ def check_staleness(vault_path):
 
 
 def check_duplicate_aliases(vault_path):
-    """Find aliases that map to multiple notes."""
+    """Find aliases that map to multiple notes.
+
+    Uses the server's alias index when importable, so an alias the registry
+    already settles (default or context override) is not reported.
+    """
     vault = Path(vault_path)
+    if _alias_registry is not None:
+        return [
+            {"alias": c["alias"], "notes": c["canonicals"], "paths": c["paths"]}
+            for c in _alias_registry.load_index(vault.resolve()).conflicts
+        ]
     alias_map = {}
 
     for md_file in vault.rglob("*.md"):
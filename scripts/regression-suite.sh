@@ -12,6 +12,8 @@
 #   3. scenario_matrix                   (SessionStart against 9 scenarios)
 #   4. adversarial probes                (PRD-04/05/06/07/15/16/17 contracts)
 #   5. perf gate                         (SessionStart <300ms median)
+#  5b. tool/script benchmarks            (only when TARS_BENCH_BASELINE names a
+#                                         previous run_benchmarks JSON)
 #   6. notice-string lint                (already in run-all.sh; re-asserted)
 #   7. qa_reverify                       (every C*/M* finding from the audit)
 #
@@ -100,6 +102,11 @@ run_layer "L4 adversarial" \
 run_layer "L5 perf" \
     "$PYTHON_BIN -m tests.regression.run_perf_gates --base $OUT_DIR/perf-vault > $OUT_DIR/perf.json"
 
+if [[ -n "${TARS_BENCH_BASELINE:-}" ]]; then
+    run_layer "L5b benchmarks" \
+        "$PYTHON_BIN -m tests.regression.run_benchmarks --base $OUT_DIR/bench-vaults --baseline $TARS_BENCH_BASELINE > $OUT_DIR/benchmarks.json"
+fi
+
 run_layer "L6 notice-strings" "$PYTHON_BIN tests/test_notice_strings.py"
 
 run_layer "L7 qa-reverify" \
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """telemetry-rollup — aggregate _system/telemetry/*.jsonl over a window.
 
-Stdlib-only. Pure (no writes). Two callers consume the output:
+Stdlib-only. The only write is its own sidecar cache. Two callers consume
+the output:
 
   - /briefing footer prints `--format text` on the configured weekly-rollup
     weekday (default Monday).
@@ -18,24 +19,46 @@ Aggregations:
     where source_hit_tier is empty)
   - daily activity totals (event count per day in the window)
 
+Days are read through ``tars_vault.telemetry``, which streams live
+``YYYY-MM-DD.jsonl`` files and rotated ``.jsonl.gz`` / ``.jsonl.zst``
+segments alike. Per-day aggregates for closed days are cached in
+``_system/telemetry/rollup-cache.json`` keyed by each segment's size and mtime,
+so only today's file and files that changed since the last run are parsed;
+a 365-day rollup costs about the same as a one-day one. A segment that cannot
+be read (e.g. ``.jsonl.zst`` without ``zstandard``) is never cached and is
+listed under ``window.unreadable_days``.
+
 Contract:
   --vault <path>   required
   --days N         window size in days; default 7. Inclusive of today.
   --format text|json   default text
   --since YYYY-MM-DD   override window start (mutually exclusive with --days)
   --until YYYY-MM-DD   override window end
+  --no-cache       parse every file and leave the sidecar cache untouched
+  --events TYPE[,TYPE]  instead of the rollup, print the window's raw events
+                   of those types (``all`` for every type) as JSON lines,
+                   each with its ``day``; for /lint checks that need
+                   per-event detail from rotated days
 Exit codes: 0 OK, 1 interrupted, 2 error, 3 invalid state.
 """
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from collections import Counter, defaultdict
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+# Segments are read through tars_vault.telemetry so live and compressed
+# (.jsonl.gz / .jsonl.zst) days stream the same way.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "mcp" / "tars-vault" / "src"))
+
+from tars_vault import telemetry as _telemetry  # noqa: E402
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="telemetry-rollup")
@@ -44,6 +67,8 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--since", help="window start YYYY-MM-DD (overrides --days)")
     parser.add_argument("--until", help="window end YYYY-MM-DD (default today)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the per-day aggregate cache")
+    parser.add_argument("--events", help="print raw events of these comma-separated types (or 'all') as JSON lines")
     return parser
 
 
@@ -59,27 +84,9 @@ def _resolve_window(args: argparse.Namespace) -> tuple[date, date]:
     return start, end
 
 
-def _iter_events(vault: Path, start: date, end: date):
-    base = vault / "_system" / "telemetry"
-    if not base.is_dir():
-        return
-    cur = start
-    while cur <= end:
-        path = base / f"{cur.isoformat()}.jsonl"
-        if path.is_file():
-            try:
-                with path.open("r", encoding="utf-8") as handle:
-                    for line in handle:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            yield cur, json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-            except OSError:
-                pass
-        cur += timedelta(days=1)
+CACHE_NAME = "rollup-cache.json"
+CACHE_VERSION = 3  # 3: drop totals cached from segments that failed to decode
+_COUNTERS = ("events_by_type", "skills_loaded", "vault_writes", "source_tiers", "misses")
 
 
 def _classify_vault_write(event: dict) -> str:
@@ -104,38 +111,135 @@ def _classify_vault_write(event: dict) -> str:
     return "other"
 
 
-def aggregate(vault: Path, start: date, end: date) -> dict[str, Any]:
-    skill_events: Counter = Counter()
-    vault_writes: Counter = Counter()
-    daily_totals: Counter = Counter()
-    source_tier_mix: Counter = Counter()
-    miss_signals: Counter = Counter()
-    skills_loaded: Counter = Counter()
-    total_events = 0
-    days_with_data: set[str] = set()
-
-    for day, event in _iter_events(vault, start, end):
-        total_events += 1
-        day_str = day.isoformat()
-        daily_totals[day_str] += 1
-        days_with_data.add(day_str)
+def _aggregate_day(path: Path) -> dict[str, Any]:
+    """Count one day file. Plain dicts so the result can be cached as JSON."""
+    counters: dict[str, Counter] = {name: Counter() for name in _COUNTERS}
+    total = 0
+    errors: list[str] = []
+    for event in _telemetry.iter_segment(path, errors):
+        total += 1
         event_type = str(event.get("event") or "")
-        skill_events[event_type] += 1
+        counters["events_by_type"][event_type] += 1
         if event_type == "skill_loaded":
             name = str(event.get("skill") or event.get("name") or "")
             if name:
-                skills_loaded[name] += 1
+                counters["skills_loaded"][name] += 1
         elif event_type == "vault_write":
-            vault_writes[_classify_vault_write(event)] += 1
+            counters["vault_writes"][_classify_vault_write(event)] += 1
         elif event_type == "answer_delivered":
             tiers = event.get("source_hit_tier")
             if isinstance(tiers, list):
                 if not tiers:
-                    miss_signals["answer_no_source"] += 1
+                    counters["misses"]["answer_no_source"] += 1
                 for t in tiers:
-                    source_tier_mix[str(t)] += 1
+                    counters["source_tiers"][str(t)] += 1
         if event.get("miss") is True:
-            miss_signals[event_type or "unknown"] += 1
+            counters["misses"][event_type or "unknown"] += 1
+    out: dict[str, Any] = {name: dict(counter) for name, counter in counters.items()}
+    out["total"] = total
+    if errors:
+        out["unreadable"] = errors[0]
+    return out
+
+
+def _load_cache(base: Path) -> dict[str, Any]:
+    try:
+        data = json.loads((base / CACHE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    days = data.get("days")
+    return days if isinstance(days, dict) else {}
+
+
+def _save_cache(base: Path, days: dict[str, Any]) -> None:
+    target = base / CACHE_NAME
+    tmp = base / f".{CACHE_NAME}.{os.getpid()}.tmp"
+    try:
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "days": days}, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _cached_day_exists(vault: Path, key: str) -> bool:
+    try:
+        return _telemetry.segment_path(vault, date.fromisoformat(key)) is not None
+    except ValueError:
+        return False
+
+
+def _day_aggregates(vault: Path, start: date, end: date, use_cache: bool = True):
+    """Yield ``(day, aggregate)`` for each day file in the window.
+
+    Closed days (before today) are served from the sidecar cache while the
+    file's size and mtime match; everything else is parsed.
+    """
+    base = vault / "_system" / "telemetry"
+    if not base.is_dir():
+        return
+    today = datetime.now().astimezone().date()
+    cache = _load_cache(base) if use_cache else {}
+    dirty = False
+    cur = start
+    while cur <= end:
+        path = _telemetry.segment_path(vault, cur)
+        try:
+            st = path.stat() if path is not None else None
+        except OSError:
+            st = None
+        if path is None or st is None:
+            cur += timedelta(days=1)
+            continue
+        key = cur.isoformat()
+        signature = [path.name, st.st_size, st.st_mtime_ns]
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get("sig") == signature and cur < today:
+            agg = entry.get("agg") or {}
+        else:
+            agg = _aggregate_day(path)
+            if use_cache and cur < today and not agg.get("unreadable"):
+                cache[key] = {"sig": signature, "agg": agg}
+                dirty = True
+        yield cur, agg
+        cur += timedelta(days=1)
+    if use_cache:
+        stale = [key for key in cache if not _cached_day_exists(vault, key)]
+        for name in stale:
+            del cache[name]
+        if dirty or stale:
+            _save_cache(base, cache)
+
+
+def aggregate(vault: Path, start: date, end: date, use_cache: bool = True) -> dict[str, Any]:
+    counters: dict[str, Counter] = {name: Counter() for name in _COUNTERS}
+    daily_totals: Counter = Counter()
+    total_events = 0
+    days_with_data: set[str] = set()
+    unreadable: dict[str, str] = {}
+
+    for day, agg in _day_aggregates(vault, start, end, use_cache):
+        if agg.get("unreadable"):
+            unreadable[day.isoformat()] = agg["unreadable"]
+        count = int(agg.get("total") or 0)
+        if not count:
+            continue
+        total_events += count
+        day_str = day.isoformat()
+        daily_totals[day_str] += count
+        days_with_data.add(day_str)
+        for name in _COUNTERS:
+            counters[name].update(agg.get(name) or {})
+
+    skill_events = counters["events_by_type"]
+    skills_loaded = counters["skills_loaded"]
+    vault_writes = counters["vault_writes"]
+    source_tier_mix = counters["source_tiers"]
+    miss_signals = counters["misses"]
 
     days_in_window = (end - start).days + 1
     return {
@@ -145,6 +249,7 @@ def aggregate(vault: Path, start: date, end: date) -> dict[str, Any]:
             "until": end.isoformat(),
             "days": days_in_window,
             "days_with_data": sorted(days_with_data),
+            "unreadable_days": unreadable,
         },
         "totals": {
             "events": total_events,
@@ -159,6 +264,18 @@ def aggregate(vault: Path, start: date, end: date) -> dict[str, Any]:
     }
 
 
+def iter_raw_events(vault: Path, start: date, end: date, types: set[str] | None, errors: list[str]):
+    """Yield the window's events (optionally of ``types``), each with its ``day``."""
+    cur = start
+    while cur <= end:
+        path = _telemetry.segment_path(vault, cur)
+        if path is not None:
+            for event in _telemetry.iter_segment(path, errors):
+                if types is None or event.get("event") in types:
+                    yield {"day": cur.isoformat(), **event}
+        cur += timedelta(days=1)
+
+
 def render_text(report: dict[str, Any]) -> str:
     w = report["window"]
     totals = report["totals"]
@@ -167,6 +284,8 @@ def render_text(report: dict[str, Any]) -> str:
         f"Telemetry rollup — {w['since']} → {w['until']} "
         f"({w['days']}d, {totals['active_days']}d active, {totals['events']} events)"
     )
+    if w.get("unreadable_days"):
+        lines.append(f"  unreadable: {', '.join(w['unreadable_days'].values())}")
     if totals["events"] == 0:
         lines.append("  (no telemetry recorded in this window)")
         return "\n".join(lines)
@@ -209,7 +328,15 @@ def main(argv: list[str]) -> int:
     except SystemExit as exc:
         print(str(exc), file=sys.stderr)
         return 2
-    report = aggregate(vault, start, end)
+    if args.events:
+        types = {t.strip() for t in args.events.split(",") if t.strip()}
+        errors: list[str] = []
+        for event in iter_raw_events(vault, start, end, None if "all" in types else types, errors):
+            print(json.dumps(event, ensure_ascii=False))
+        for error in errors:
+            print(f"warning: unreadable segment {error}", file=sys.stderr)
+        return 0
+    report = aggregate(vault, start, end, use_cache=not args.no_cache)
     if args.format == "json":
         print(json.dumps(report, indent=2))
     else:
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""trace-export — convert recorded trace spans to Chrome trace-event JSON.
+
+Reads ``_system/telemetry/traces-YYYY-MM-DD.jsonl`` (live or rotated
+segments) written when ``TARS_TRACE=1``: hook invocations, tars-vault tool
+calls, and helper scripts such as ``archive.py``. The output loads in
+``chrome://tracing`` or https://ui.perfetto.dev as a flame graph, one row per
+process and thread.
+
+Contract:
+  --vault <path>     required
+  --days N           window size in days; default 1. Inclusive of today.
+  --trace ID         keep only spans of one trace (a session's hooks share one)
+  --list             print trace ids with span counts and total time instead
+  --out PATH         write to PATH instead of stdout
+Exit codes: 0 OK, 1 interrupted, 2 error, 3 invalid state.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "mcp" / "tars-vault" / "src"))
+
+from tars_vault import telemetry as _telemetry  # noqa: E402
+from tars_vault import tracing as _tracing  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="trace-export")
+    parser.add_argument("--vault", required=True)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--trace", default=None)
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--out", default=None)
+    return parser
+
+
+def load_spans(vault: Path, days: int, trace_id: str | None = None) -> list[dict[str, Any]]:
+    end = datetime.now().astimezone().date()
+    start = end - timedelta(days=max(days, 1) - 1)
+    spans = []
+    for _day, record in _telemetry.iter_events(vault, start, end, stream=_tracing.STREAM):
+        if not isinstance(record.get("ts_us"), int) or not record.get("name"):
+            continue
+        if trace_id and record.get("trace_id") != trace_id:
+            continue
+        spans.append(record)
+    spans.sort(key=lambda r: r["ts_us"])
+    return spans
+
+
+def to_chrome(spans: list[dict[str, Any]]) -> dict[str, Any]:
+    """Complete ("X") events plus process-name metadata, timestamps in µs."""
+    events: list[dict[str, Any]] = []
+    named: set[int] = set()
+    for record in spans:
+        pid = int(record.get("pid") or 0)
+        if pid not in named:
+            named.add(pid)
+            events.append(
+                {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{record.get('proc') or 'tars'} ({pid})"}}
+            )
+        args = dict(record.get("attrs") or {})
+        args.update(
+            trace_id=record.get("trace_id"),
+            span_id=record.get("span_id"),
+            parent_id=record.get("parent_id"),
+            status=record.get("status"),
+        )
+        events.append(
+            {
+                "name": record["name"],
+                "cat": record.get("proc") or "tars",
+                "ph": "X",
+                "ts": record["ts_us"],
+                "dur": max(int(record.get("dur_us") or 0), 1),
+                "pid": pid,
+                "tid": int(record.get("tid") or 0),
+                "args": args,
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summarize(spans: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    counts: Counter = Counter()
+    total_us: dict[str, int] = defaultdict(int)
+    first: dict[str, int] = {}
+    for record in spans:
+        trace_id = str(record.get("trace_id") or "")
+        counts[trace_id] += 1
+        total_us[trace_id] += int(record.get("dur_us") or 0)
+        first.setdefault(trace_id, record["ts_us"])
+    return [
+        {
+            "trace_id": trace_id,
+            "spans": counts[trace_id],
+            "span_ms": round(total_us[trace_id] / 1000, 1),
+            "started": datetime.fromtimestamp(first[trace_id] / 1_000_000).astimezone().isoformat(timespec="seconds"),
+        }
+        for trace_id in sorted(first, key=first.get)
+    ]
+
+
+def main(argv: list[str]) -> int:
+    args = build_parser().parse_args(argv)
+    vault = Path(args.vault).expanduser().resolve()
+    if not vault.is_dir():
+        print(f"error: vault path not a directory: {vault}", file=sys.stderr)
+        return 3
+    if args.days < 1:
+        print("error: --days must be >= 1", file=sys.stderr)
+        return 2
+    spans = load_spans(vault, args.days, args.trace)
+    payload: Any = summarize(spans) if args.list else to_chrome(spans)
+    text = json.dumps(payload, indent=2 if args.list else None)
+    if args.out:
+        Path(args.out).expanduser().write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main(sys.argv[1:]))
+    except KeyboardInterrupt:
+        sys.exit(1)
@@ -0,0 +1,420 @@
+"""Layer 5b: scalable benchmarks for every MCP tool and the workspace scripts.
+
+Generates deterministic synthetic vaults (people, initiatives, decisions,
+tasks, journals with dense wikilinks, long transcripts) at each requested
+size, then times:
+
+  - every tool in ``TOOL_REGISTRY``, in-process through ``_call_handler_sync``
+    (first call reported separately as ``cold_ms``);
+  - ``build-search-index``, ``health-check``, ``archive`` and
+    ``heal-wikilinks`` as subprocesses, the way skills run them.
+
+Results are JSON for trend tracking. A tool call that returns
+``status: "error"``, or a script that times out or exits above its documented
+findings code, fails the run and is left out of the baseline comparison (its
+timing would measure the error path, not the work). With ``--baseline`` the run also fails when a median regresses
+by more than ``--tolerance`` (relative) *and* ``--min-delta-ms`` (absolute,
+to ignore noise on sub-millisecond tools).
+
+Usage:
+    python3 -m tests.regression.run_benchmarks [--sizes 1000,10000,100000]
+        [--base /tmp/tars-bench] [--runs 3] [--tools a,b] [--skip-scripts]
+        [--baseline prev.json] [--tolerance 0.5] [--min-delta-ms 25]
+        [--out results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "mcp" / "tars-vault" / "src"))
+
+from tars_vault import server as srv  # noqa: E402
+
+GENERATOR_VERSION = 1
+DEFAULT_SEED = 1729
+ANCHOR_DAY = date(2026, 1, 15)
+# Written into every generated vault; only directories carrying it are replaced.
+MARKER_RELATIVE = "_system/.tars-synthetic-vault"
+
+# Share of notes per kind; journals take the remainder.
+MIX = {"person": 0.08, "initiative": 0.04, "decision": 0.05, "task": 0.30, "transcript": 0.03}
+
+FIRST = ["Alex", "Blair", "Casey", "Dana", "Eli", "Frankie", "Gray", "Harper", "Indy", "Jules",
+         "Kai", "Lee", "Morgan", "Noor", "Oakley", "Parker", "Quinn", "Reese", "Sage", "Toni"]
+LAST = ["Adams", "Brooks", "Chen", "Diaz", "Evans", "Flores", "Garcia", "Hughes", "Ito", "Jones",
+        "Khan", "Lopez", "Moore", "Nakamura", "Okafor", "Patel", "Quint", "Rossi", "Singh", "Tran"]
+TOPICS = ["roadmap", "pricing", "hiring", "migration", "vendor review", "budget", "launch",
+          "security audit", "onboarding", "latency", "renewal", "data retention", "forecast"]
+
+SCRIPTS: dict[str, list[str]] = {
+    "build-search-index": ["--apply", "--json"],
+    "health-check": ["--json"],
+    "archive": ["--json"],
+    "heal-wikilinks": ["--dry-run", "--json"],
+}
+# Highest exit code that still means "ran to completion" (health-check exits
+# 1 when it has critical findings); anything above, or a timeout, is an error.
+SCRIPT_FINDINGS_EXIT: dict[str, int] = {"health-check": 1}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic vault
+# ---------------------------------------------------------------------------
+
+def _person_name(i: int) -> str:
+    name = f"{FIRST[i % len(FIRST)]} {LAST[(i // len(FIRST)) % len(LAST)]}"
+    return name if i < len(FIRST) * len(LAST) else f"{name} {i}"
+
+
+def _frontmatter(fields: dict[str, Any]) -> str:
+    lines = ["---"]
+    for key, value in fields.items():
+        if isinstance(value, list):
+            lines.append(f"{key}: [{', '.join(value)}]")
+        else:
+            lines.append(f"{key}: {value}")
+    lines.append("---")
+    return "\n".join(lines) + "\n"
+
+
+def generate_vault(root: Path, n_notes: int, seed: int = DEFAULT_SEED) -> dict[str, Any]:
+    """Write a deterministic ``n_notes`` vault under ``root`` (replacing it).
+
+    ``root`` must be missing, empty, or a vault this function generated
+    earlier; anything else raises ``FileExistsError`` rather than deleting
+    someone's notes.
+    """
+    if root.exists():
+        if any(root.iterdir()) and not (root / MARKER_RELATIVE).is_file():
+            raise FileExistsError(f"refusing to replace {root}: not empty and not a generated vault")
+        shutil.rmtree(root)
+    rng = random.Random(seed)
+    counts = {kind: max(1, int(n_notes * share)) for kind, share in MIX.items()}
+    counts["journal"] = max(1, n_notes - sum(counts.values()))
+    people = [_person_name(i) for i in range(counts["person"])]
+    initiatives = [f"Initiative {i:05d} {TOPICS[i % len(TOPICS)].title()}" for i in range(counts["initiative"])]
+
+    def links(k: int) -> str:
+        picks = rng.sample(people, min(k, len(people))) + rng.sample(initiatives, min(max(k // 3, 1), len(initiatives)))
+        return ", ".join(f"[[{name}]]" for name in picks)
+
+    def day(offset_max: int = 400) -> str:
+        return (ANCHOR_DAY - timedelta(days=rng.randrange(offset_max))).isoformat()
+
+    def write(rel: str, text: str) -> None:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    (root / "_system").mkdir(parents=True)
+    write(MARKER_RELATIVE, f"generator {GENERATOR_VERSION} seed {seed}\n")
+    write("_system/workflows.yaml", "workflows: []\n")
+    for i, name in enumerate(people):
+        created = day()
+        write(
+            f"memory/people/{name}.md",
+            _frontmatter({"tags": ["tars/person"], "aliases": [name.split()[0]], "tars-summary": f"{TOPICS[i % len(TOPICS)]} lead",
+                          "tars-staleness": "seasonal", "tars-created": created, "tars-modified": created})
+            + f"\n## Role and context\n\nWorks on {TOPICS[i % len(TOPICS)]} with {links(3)}.\n",
+        )
+    for i, name in enumerate(initiatives):
+        created = day()
+        write(
+            f"memory/initiatives/{name}.md",
+            _frontmatter({"tags": ["tars/initiative"], "tars-summary": f"{TOPICS[i % len(TOPICS)]} program",
+                          "tars-status": rng.choice(["active", "active", "paused", "completed"]),
+                          "tars-owner": f'"[[{rng.choice(people)}]]"', "tars-created": created, "tars-modified": created})
+            + f"\n## Goals\n\nDeliver the {TOPICS[i % len(TOPICS)]} milestone. Stakeholders: {links(6)}.\n",
+        )
+    for i in range(counts["decision"]):
+        created = day()
+        write(
+            f"memory/decisions/Decision {i:05d}.md",
+            _frontmatter({"tags": ["tars/decision"], "tars-summary": f"Chose option {i % 3} for {TOPICS[i % len(TOPICS)]}",
+                          "tars-created": created, "tars-modified": created})
+            + f"\nDecided with {links(4)}.\n",
+        )
+    for i in range(counts["task"]):
+        created = day()
+        write(
+            f"tasks/Task {i:05d}.md",
+            _frontmatter({"tags": ["tars/task"], "tars-status": rng.choice(["open", "open", "in-progress", "done"]),
+                          "tars-owner": f'"[[{rng.choice(people)}]]"', "tars-due": day(120),
+                          "tars-created": created, "tars-modified": created})
+            + f"\nFollow up on {TOPICS[i % len(TOPICS)]} with {links(2)}.\n",
+        )
+    for i in range(counts["journal"]):
+        when = day()
+        topic = TOPICS[i % len(TOPICS)]
+        paragraphs = "\n\n".join(
+            f"- Discussed {rng.choice(TOPICS)} with {links(rng.randint(3, 8))}." for _ in range(rng.randint(3, 8))
+        )
+        write(
+            f"journal/{when[:7]}/{when}-{topic.replace(' ', '-')}-{i:05d}.md",
+            _frontmatter({"tags": ["tars/journal", "tars/meeting"], "tars-date": when,
+                          "tars-participants": [f'"[[{p}]]"' for p in rng.sample(people, min(3, len(people)))],
+                          "tars-created": when})
+            + f"\n## Topics discussed\n\n{paragraphs}\n",
+        )
+    for i in range(counts["transcript"]):
+        when = day()
+        speakers = rng.sample(people, min(4, len(people)))
+        lines = [f"{rng.choice(speakers)}: we need to revisit the {rng.choice(TOPICS)} plan before {day(60)}." for _ in range(400)]
+        write(
+            f"archive/transcripts/{when[:7]}/{when}-transcript-{i:05d}.md",
+            _frontmatter({"tags": ["tars/transcript"], "tars-date": when, "tars-format": "plain", "tars-created": when})
+            + "\n" + "\n".join(lines) + "\n",
+        )
+    return {"notes": sum(counts.values()), "counts": counts, "seed": seed, "generator": GENERATOR_VERSION,
+            "people": people, "initiatives": initiatives}
+
+
+# ---------------------------------------------------------------------------
+# Tool argument profiles
+# ---------------------------------------------------------------------------
+
+ToolArgs = Callable[[int, dict[str, Any]], dict[str, Any]]
+
+TOOL_ARGS: dict[str, ToolArgs] = {
+    "append_note": lambda i, c: {"file": "bench/append-target.md", "content": f"Line {i} about [[{c['person']}]]."},
+    "archive_note": lambda i, c: {"file": f"tasks/Task {i:05d}.md", "dry_run": True},
+    "classify_file": lambda i, c: {"path": c["journal"]},
+    "context_bundle": lambda i, c: {"query": c["person"]},
+    "create_note": lambda i, c: {"path": f"bench/created-{i}.md", "frontmatter": {"tags": ["tars/note"]}, "body": "Benchmark note."},
+    "detect_near_duplicates": lambda i, c: {"folder": "journal"},
+    "entity_timeline": lambda i, c: {"query": c["person"]},
+    "format_wikilink": lambda i, c: {"text": c["person"]},
+    "fts_search": lambda i, c: {"query": "roadmap"},
+    "install_extension": lambda i, c: {"source_path": c["extension_source"]},
+    "move_note": lambda i, c: {"src": f"bench/created-{i}.md", "dst": f"bench/moved-{i}.md", "rewrite_wikilinks": True},
+    "read_extension": lambda i, c: {"extension_id": "bench-ext"},
+    "read_note": lambda i, c: {"file": f"memory/people/{c['person']}.md"},
+    "read_system_file": lambda i, c: {"file": "workflows.yaml"},
+    "refresh_integrations": lambda i, c: {"dry_run": True},
+    "rerank": lambda i, c: {"query": "roadmap", "results": c["rerank_results"]},
+    "resolve_alias": lambda i, c: {"name": c["person"].split()[0]},
+    "resolve_capability": lambda i, c: {"capability": "calendar"},
+    "resolve_extension": lambda i, c: {"skill": "briefing"},
+    "scan_secrets": lambda i, c: {"content": c["transcript_text"]},
+    "scaffold_extension": lambda i, c: {"extension_id": f"bench-scaffold-{i}"},
+    "scaffold_workspace": lambda i, c: {"vault": str(c["scratch"] / f"workspace-{i}"), "user_name": "Bench"},
+    "search_by_tag": lambda i, c: {"tag": "tars/person"},
+    "semantic_search": lambda i, c: {"query": "vendor renewal"},
+    "suggest_entities": lambda i, c: {"prefix": c["person"][: 2 + i % 4]},
+    "update_frontmatter": lambda i, c: {"file": f"tasks/Task {i:05d}.md", "property": "tars-status", "value": "open"},
+    "validate_extension": lambda i, c: {"extension_id": "bench-ext"},
+    "write_note_from_content": lambda i, c: {"path": f"bench/written-{i}.md", "body": "Benchmark body."},
+}
+
+
+def _tool_context(vault: Path, scratch: Path, meta: dict[str, Any]) -> dict[str, Any]:
+    person = meta["people"][0]
+    journal = next(iter(sorted((vault / "journal").rglob("*.md"))))
+    transcript = next(iter(sorted((vault / "archive" / "transcripts").rglob("*.md"))))
+    (vault / "bench").mkdir(exist_ok=True)
+    (vault / "bench" / "append-target.md").write_text("---\ntags: [tars/note]\n---\n", encoding="utf-8")
+    srv._call_handler_sync("scaffold_extension", {"extension_id": "bench-ext"}, str(vault))
+    # install_extension copies from another workspace's extension directory.
+    source_ws = scratch / "extension-source"
+    srv._call_handler_sync("scaffold_workspace", {"vault": str(source_ws), "user_name": "Bench"}, str(vault))
+    made = srv._call_handler_sync("scaffold_extension", {"extension_id": "bench-import"}, str(source_ws))
+    if made.get("status") == "error":
+        raise RuntimeError(f"could not scaffold the install_extension source: {made.get('reason')}")
+    source_path = source_ws / str(made.get("path") or "")
+    return {
+        "person": person,
+        "journal": str(journal.relative_to(vault)),
+        "transcript_text": transcript.read_text(encoding="utf-8"),
+        "extension_source": str(source_path),
+        "scratch": scratch,
+        "rerank_results": [
+            {"file": f"tasks/Task {i:05d}.md", "score": 1.0 / (i + 1), "snippet": TOPICS[i % len(TOPICS)]}
+            for i in range(50)
+        ],
+    }
+
+
+def time_tools(vault: Path, scratch: Path, meta: dict[str, Any], runs: int, only: set[str] | None) -> dict[str, Any]:
+    ctx = _tool_context(vault, scratch, meta)
+    out: dict[str, Any] = {}
+    for name in sorted(srv.TOOL_REGISTRY):
+        if only and name not in only:
+            continue
+        build = TOOL_ARGS.get(name, lambda i, c: {})
+        timings: list[float] = []
+        statuses: list[str] = []
+        reason = ""
+        for i in range(runs):
+            started = time.perf_counter()
+            result = srv._call_handler_sync(name, build(i, ctx), str(vault))
+            timings.append((time.perf_counter() - started) * 1000)
+            statuses.append(str(result.get("status")))
+            if result.get("status") == "error" and not reason:
+                reason = str(result.get("reason") or "")[:160]
+        entry = {
+            "median_ms": round(statistics.median(timings), 2),
+            "cold_ms": round(timings[0], 2),
+            "max_ms": round(max(timings), 2),
+            "status": "ok" if all(s != "error" for s in statuses) else "error",
+        }
+        if reason:
+            entry["reason"] = reason
+        if name not in TOOL_ARGS:
+            entry["args"] = "default"
+        out[name] = entry
+    return out
+
+
+def time_scripts(vault: Path, runs: int, timeout: float) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    env = dict(os.environ, TARS_DISABLE_TELEMETRY="1")
+    for name, extra in SCRIPTS.items():
+        cmd = [sys.executable, str(REPO_ROOT / "scripts" / f"{name}.py"), "--vault", str(vault), *extra]
+        timings: list[float] = []
+        returncodes: list[int] = []
+        reason = ""
+        for _ in range(runs):
+            started = time.perf_counter()
+            try:
+                proc = subprocess.run(cmd, env=env, capture_output=True, timeout=timeout)
+                rc = proc.returncode
+            except subprocess.TimeoutExpired:
+                rc, proc = -1, None
+            timings.append((time.perf_counter() - started) * 1000)
+            returncodes.append(rc)
+            if rc == -1:
+                reason = f"timed out after {timeout:g}s"
+            elif rc < 0 or rc > SCRIPT_FINDINGS_EXIT.get(name, 0):
+                stderr = proc.stderr.decode("utf-8", "replace").strip().splitlines() if proc else []
+                reason = f"exit code {rc}" + (f": {stderr[-1]}" if stderr else "")
+            if reason:
+                break  # later runs would time the same failure
+        entry = {
+            "median_ms": round(statistics.median(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "returncodes": returncodes,
+            "status": "error" if reason else "ok",
+        }
+        if reason:
+            entry["reason"] = reason
+        out[name] = entry
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Regression gate
+# ---------------------------------------------------------------------------
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float, min_delta_ms: float) -> list[dict[str, Any]]:
+    """Medians that grew past both the relative and the absolute threshold.
+
+    Entries that failed in either run are skipped; ``failures`` reports them.
+    """
+    regressions = []
+    for size, result in current.get("sizes", {}).items():
+        before = baseline.get("sizes", {}).get(size)
+        if not before:
+            continue
+        for group in ("tools", "scripts"):
+            for name, entry in result.get(group, {}).items():
+                prev = before.get(group, {}).get(name)
+                if not prev or "error" in (entry.get("status"), prev.get("status")):
+                    continue
+                now_ms, was_ms = entry["median_ms"], prev["median_ms"]
+                if now_ms > was_ms * (1 + tolerance) and now_ms - was_ms > min_delta_ms:
+                    regressions.append({
+                        "size": size, "group": group, "name": name,
+                        "baseline_ms": was_ms, "median_ms": now_ms,
+                        "ratio": round(now_ms / was_ms, 2) if was_ms else None,
+                    })
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base", default="/tmp/tars-bench")
+    ap.add_argument("--sizes", default="1000", help="Comma-separated note counts, e.g. 1000,10000,100000.")
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--tools", default="", help="Comma-separated tool names (default: every registered tool).")
+    ap.add_argument("--skip-scripts", action="store_true")
+    ap.add_argument("--script-timeout", type=float, default=900.0)
+    ap.add_argument("--baseline", default=None, help="Previous results JSON to gate against.")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown (0.5 = 50%%).")
+    ap.add_argument("--min-delta-ms", type=float, default=25.0, help="Ignore slowdowns smaller than this.")
+    ap.add_argument("--out", default=None, help="Also write the results JSON here.")
+    args = ap.parse_args()
+
+    os.environ["TARS_DISABLE_TELEMETRY"] = "1"
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = {t.strip() for t in args.tools.split(",") if t.strip()} or None
+    base = Path(args.base)
+    summary: dict[str, Any] = {
+        "layer": "benchmarks",
+        "generator": GENERATOR_VERSION,
+        "seed": args.seed,
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        "sizes": {},
+    }
+    for size in sizes:
+        vault = base / f"vault-{size}"
+        scratch = base / f"scratch-{size}"
+        if scratch.exists():
+            shutil.rmtree(scratch)
+        scratch.mkdir(parents=True)
+        started = time.perf_counter()
+        try:
+            meta = generate_vault(vault, size, seed=args.seed)
+        except FileExistsError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        result: dict[str, Any] = {
+            "notes": meta["notes"],
+            "counts": meta["counts"],
+            "generate_s": round(time.perf_counter() - started, 2),
+        }
+        if not args.skip_scripts:
+            # Scripts first: build-search-index produces the index fts/semantic search read.
+            result["scripts"] = time_scripts(vault, args.runs, args.script_timeout)
+        result["tools"] = time_tools(vault, scratch, meta, args.runs, only)
+        summary["sizes"][str(size)] = result
+
+    regressions: list[dict[str, Any]] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(summary, baseline, args.tolerance, args.min_delta_ms)
+        summary["baseline"] = args.baseline
+        summary["tolerance"] = args.tolerance
+        summary["min_delta_ms"] = args.min_delta_ms
+    failures = [
+        {"size": size, "group": group, "name": name, "reason": entry.get("reason", "")}
+        for size, result in summary["sizes"].items()
+        for group in ("tools", "scripts")
+        for name, entry in result.get(group, {}).items()
+        if entry["status"] == "error"
+    ]
+    summary["regressions"] = regressions
+    summary["failures"] = failures
+    summary["passed"] = not regressions and not failures
+    text = json.dumps(summary, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0 if summary["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
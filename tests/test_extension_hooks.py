@@ -2,11 +2,13 @@
 """Hook smoke tests for extension provider-bypass enforcement."""
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
 import shutil
 import subprocess
 import tempfile
+import time
 import unittest
 from pathlib import Path
 
@@ -62,11 +64,12 @@ class ExtensionHookTests(unittest.TestCase):
     def tearDown(self) -> None:
         shutil.rmtree(self.tmp, ignore_errors=True)
 
-    def _run_hook(self, script: str, event: dict) -> dict:
+    def _run_hook(self, script: str, event: dict, *args: str, env_extra: dict | None = None) -> dict:
         env = dict(os.environ)
         env["TARS_VAULT_PATH"] = str(self.vault)
+        env.update(env_extra or {})
         proc = subprocess.run(
-            ["python3", str(ROOT / "hooks" / script)],
+            ["python3", str(ROOT / "hooks" / script), *args],
             input=json.dumps(event),
             text=True,
             capture_output=True,
@@ -123,6 +126,165 @@ class ExtensionHookTests(unittest.TestCase):
         )
         self.assertEqual(allowed, {})
 
+    def test_hook_client_matches_direct_hooks_with_and_without_daemon(self) -> None:
+        event = {"session_id": "session-3", "tool_name": "mcp__zoom__search_meetings", "tool_input": {}}
+        runtime = Path(self.tmp) / "run"
+        runtime.mkdir()
+        extra = {"XDG_RUNTIME_DIR": str(runtime)}
+        self._run_hook("instructions-loaded.py", {"session_id": "session-3", "skill": "maintain"})
+        direct = self._run_hook("pre-tool-use.py", event)
+        local = self._run_hook("hook-client.py", event, "pre-tool-use", env_extra=extra)
+        self.assertEqual(local, direct)
+
+        daemon = subprocess.Popen(
+            ["python3", str(ROOT / "hooks" / "hook-daemon.py"), "--vault", str(self.vault), "--idle-timeout", "30"],
+            env={**os.environ, **extra},
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while not list(runtime.glob("tars-hooks-*.sock")) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertTrue(list(runtime.glob("tars-hooks-*.sock")))
+            warm = self._run_hook("hook-client.py", event, "pre-tool-use", env_extra=extra)
+            self.assertEqual(warm, direct)
+            self._run_hook(
+                "hook-client.py",
+                {
+                    "session_id": "session-3",
+                    "tool_name": "mcp__tars_vault__read_extension",
+                    "tool_input": {"extension_id": "meeting-recording.zoom"},
+                    "tool_response": {},
+                },
+                "post-tool-use",
+                env_extra=extra,
+            )
+            allowed = self._run_hook("hook-client.py", event, "pre-tool-use", env_extra=extra)
+            self.assertEqual(allowed, {})
+        finally:
+            daemon.terminate()
+            daemon.wait(timeout=10)
+
+    def test_session_start_memoizes_fallback_scans_by_workspace_signature(self) -> None:
+        (self.vault / "_system" / "install.yaml").write_text(f"workspace_path: {self.vault}\n")
+        (self.vault / "_system" / "tools-registry.yaml").write_text("tools: {}\n")
+        initiatives = self.vault / "memory" / "initiatives"
+        initiatives.mkdir(parents=True)
+        (initiatives / "old.md").write_text(
+            "---\ntags: [tars/initiative]\ntars-status: active\ntars-modified: \"2020-01-01\"\n---\n"
+        )
+
+        def banner() -> str:
+            out = self._run_hook("session-start.py", {})
+            return out["hookSpecificOutput"]["additionalContext"]
+
+        self.assertIn("1 active initiative(s)", banner())
+        cache_path = self.vault / "_system" / "session-start-cache.json"
+        cache = json.loads(cache_path.read_text())
+        self.assertEqual(cache["entries"]["state_aware"]["value"], [1, 0])
+
+        # An unchanged workspace is answered from the cache.
+        cache["entries"]["state_aware"]["value"] = [7, 0]
+        cache_path.write_text(json.dumps(cache))
+        self.assertIn("7 active initiative(s)", banner())
+
+        # Any note change invalidates the memo.
+        (initiatives / "new.md").write_text("---\ntags: [tars/initiative]\ntars-status: active\n---\n")
+        self.assertIn("1 active initiative(s)", banner())
+
+    def test_install_yaml_rewrites_never_expose_a_partial_file(self) -> None:
+        import threading
+
+        spec = importlib.util.spec_from_file_location("tars_hooks_common", ROOT / "hooks" / "_common.py")
+        common = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(common)
+        install = self.vault / "_system" / "install.yaml"
+        install.parent.mkdir(parents=True, exist_ok=True)
+        install.write_text(f'workspace_path: "{self.vault}"\n' + "".join(f"key_{i}: value\n" for i in range(200)))
+
+        done = threading.Event()
+
+        def writer() -> None:
+            for i in range(300):
+                common.mark_notice_acknowledged(self.vault, f"notice-{i % 5}")
+            done.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        torn = 0
+        while not done.is_set():
+            parsed = common._parse_install_yaml(install) or {}
+            torn += not parsed.get("workspace_path")
+        thread.join()
+        self.assertEqual(torn, 0)
+        self.assertTrue(common.is_notice_suppressed(self.vault, "notice-4"))
+        self.assertEqual(list(install.parent.glob("*.tmp")), [])
+
+    def test_extension_runtime_log_compacts_and_evicts_idle_sessions(self) -> None:
+        spec = importlib.util.spec_from_file_location("tars_hooks_common", ROOT / "hooks" / "_common.py")
+        common = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(common)
+
+        common.record_skill_loaded(self.vault, "old-session", "briefing")
+        old_log = self.vault / "_system" / "extension-runtime" / "old-session.jsonl"
+        stale = time.time() - (common.EXTENSION_RUNTIME_TTL_DAYS + 1) * 86400
+        os.utime(old_log, (stale, stale))
+
+        for i in range(400):
+            common.record_skill_loaded(self.vault, "s/1", "maintain" if i % 2 else "tasks")
+        common.record_extension_loaded(self.vault, "s/1", "meeting-recording.zoom")
+
+        self.assertFalse(old_log.exists())
+        logs = list((self.vault / "_system" / "extension-runtime").glob("s_1-*.jsonl"))
+        self.assertEqual(len(logs), 1)
+        self.assertLess(logs[0].stat().st_size, common.EXTENSION_RUNTIME_COMPACT_BYTES + 512)
+        self.assertEqual(common.last_loaded_skill(self.vault, "s/1"), "maintain")
+        self.assertTrue(common.extension_loaded(self.vault, "s/1", "meeting-recording.zoom"))
+        self.assertFalse(common.extension_loaded(self.vault, "other", "meeting-recording.zoom"))
+
+    def test_extension_runtime_migrates_legacy_state_and_keeps_reading_sessions(self) -> None:
+        spec = importlib.util.spec_from_file_location("tars_hooks_common", ROOT / "hooks" / "_common.py")
+        common = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(common)
+        runtime_dir = self.vault / "_system" / "extension-runtime"
+        legacy = self.vault / common.EXTENSION_RUNTIME_LEGACY
+        legacy.parent.mkdir(parents=True, exist_ok=True)
+        legacy.write_text(json.dumps({"sessions": {
+            "long": {"last_skill": "meeting", "loaded_extensions": {"meeting-recording.zoom": "2026-01-01T00:00:00+00:00"},
+                     "updated_at": "2026-01-01T00:00:00+00:00"},
+        }}))
+        stale = time.time() - (common.EXTENSION_RUNTIME_TTL_DAYS + 1) * 86400
+        os.utime(legacy, (stale, stale))
+
+        # Upgrading mid-session keeps what the legacy file recorded.
+        self.assertTrue(common.extension_loaded(self.vault, "long", "meeting-recording.zoom"))
+        self.assertFalse(legacy.exists())
+        self.assertEqual(common.last_loaded_skill(self.vault, "long"), "meeting")
+
+        # A session that only reads stays alive past the TTL.
+        long_log = runtime_dir / "long.jsonl"
+        os.utime(long_log, (stale, stale))
+        self.assertTrue(common.extension_loaded(self.vault, "long", "meeting-recording.zoom"))
+        common.record_skill_loaded(self.vault, "fresh", "tasks")
+        self.assertTrue(long_log.exists())
+        self.assertTrue(common.extension_loaded(self.vault, "long", "meeting-recording.zoom"))
+
+        # Appends and compaction both take the directory lock.
+        if common.fcntl is not None:
+            import fcntl
+            import threading
+
+            with (runtime_dir / ".lock").open("a") as held:
+                fcntl.flock(held, fcntl.LOCK_EX)
+                writer = threading.Thread(
+                    target=common.record_extension_loaded, args=(self.vault, "long", "notes.extra")
+                )
+                writer.start()
+                writer.join(0.2)
+                self.assertTrue(writer.is_alive(), "append waits for the lock")
+                fcntl.flock(held, fcntl.LOCK_UN)
+            writer.join(5)
+            self.assertTrue(common.extension_loaded(self.vault, "long", "notes.extra"))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
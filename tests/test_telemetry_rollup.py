@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""telemetry-rollup cache and telemetry segment rotation tests."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location("telemetry_rollup", ROOT / "scripts" / "telemetry-rollup.py")
+rollup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rollup)
+
+
+class TelemetryRollupCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp(prefix="tars-rollup-test-")
+        self.vault = Path(self.tmp)
+        self.base = self.vault / "_system" / "telemetry"
+        self.base.mkdir(parents=True)
+        self.today = datetime.now().astimezone().date()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write_day(self, offset: int, events: list[dict]) -> Path:
+        path = self.base / f"{(self.today - timedelta(days=offset)).isoformat()}.jsonl"
+        with path.open("a", encoding="utf-8") as handle:
+            for event in events:
+                handle.write(json.dumps(event) + "\n")
+        return path
+
+    def test_cached_rollup_matches_full_parse_and_tracks_changes(self) -> None:
+        old = self._write_day(2, [{"event": "skill_loaded", "skill": "briefing"}, {"event": "vault_write", "file": "journal/x.md"}])
+        self._write_day(1, [{"event": "answer_delivered", "source_hit_tier": []}])
+        self._write_day(0, [{"event": "skill_loaded", "skill": "tasks"}])
+        start = self.today - timedelta(days=6)
+
+        first = rollup.aggregate(self.vault, start, self.today)
+        self.assertEqual(first, rollup.aggregate(self.vault, start, self.today, use_cache=False))
+        cache = json.loads((self.base / rollup.CACHE_NAME).read_text())
+        self.assertEqual(len(cache["days"]), 2)  # today is never cached
+        self.assertEqual(first, rollup.aggregate(self.vault, start, self.today))
+
+        self._write_day(2, [{"event": "skill_loaded", "skill": "briefing", "miss": True}])
+        updated = rollup.aggregate(self.vault, start, self.today)
+        self.assertEqual(updated["skills_loaded"]["briefing"], 2)
+        self.assertEqual(updated["miss_signals"], {"answer_no_source": 1, "skill_loaded": 1})
+        self.assertEqual(updated, rollup.aggregate(self.vault, start, self.today, use_cache=False))
+
+        old.unlink()
+        rollup.aggregate(self.vault, start, self.today)
+        cache = json.loads((self.base / rollup.CACHE_NAME).read_text())
+        self.assertNotIn((self.today - timedelta(days=2)).isoformat(), cache["days"])
+
+    def test_rotation_compresses_closed_days_and_reader_streams_them(self) -> None:
+        telemetry = rollup._telemetry
+        closed = self._write_day(1, [{"event": "skill_loaded", "skill": "briefing"}] * 3)
+        expired = self._write_day(telemetry.RETENTION_DAYS + 1, [{"event": "lint_run"}])
+        self._write_day(0, [{"event": "skill_loaded", "skill": "tasks"}])
+        quiet = time.time() - telemetry.ROTATE_GRACE_SECONDS - 60
+        for path in (closed, expired):
+            os.utime(path, (quiet, quiet))
+        start = self.today - timedelta(days=6)
+        before = rollup.aggregate(self.vault, start, self.today, use_cache=False)
+
+        summary = telemetry.rotate(self.vault, today=self.today)
+        self.assertEqual(summary, {"compressed": 1, "deleted": 1})
+        self.assertFalse(closed.exists())
+        self.assertFalse(expired.exists())
+        segment = telemetry.segment_path(self.vault, self.today - timedelta(days=1))
+        self.assertIn(segment.suffix, telemetry.COMPRESSED_SUFFIXES)
+        self.assertTrue((self.base / f"{self.today.isoformat()}.jsonl").is_file())
+
+        self.assertEqual(rollup.aggregate(self.vault, start, self.today, use_cache=False), before)
+        events = list(telemetry.iter_events(self.vault, start, self.today))
+        self.assertEqual(len(events), 4)
+
+    def test_unreadable_segment_is_reported_and_not_cached(self) -> None:
+        day = self.today - timedelta(days=1)
+        (self.base / f"{day.isoformat()}.jsonl.zst").write_bytes(b"not a zstd frame")
+        start = self.today - timedelta(days=6)
+
+        for _ in range(2):
+            report = rollup.aggregate(self.vault, start, self.today)
+            self.assertIn(day.isoformat(), report["window"]["unreadable_days"])
+        cache_file = self.base / rollup.CACHE_NAME
+        cached = json.loads(cache_file.read_text())["days"] if cache_file.exists() else {}
+        self.assertNotIn(day.isoformat(), cached)
+        self.assertIn("unreadable:", rollup.render_text(report))
+
+    def test_events_mode_streams_rotated_days(self) -> None:
+        import contextlib
+        import io
+
+        telemetry = rollup._telemetry
+        closed = self._write_day(100, [{"event": "memory_persisted", "count": 2}, {"event": "lint_run"}])
+        self._write_day(0, [{"event": "vault_write", "file": "memory/people/x.md"}])
+        quiet = time.time() - telemetry.ROTATE_GRACE_SECONDS - 60
+        os.utime(closed, (quiet, quiet))
+        telemetry.rotate(self.vault, today=self.today)
+        self.assertFalse(list(self.base.glob(f"{(self.today - timedelta(days=100)).isoformat()}.jsonl")))
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rc = rollup.main(["--vault", str(self.vault), "--days", "120", "--events", "memory_persisted,vault_write"])
+        self.assertEqual(rc, 0)
+        events = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(e["day"], e["event"]) for e in events], [
+            ((self.today - timedelta(days=100)).isoformat(), "memory_persisted"),
+            (self.today.isoformat(), "vault_write"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -60,6 +60,7 @@ REQUIRED_TOOLS = {
     "scaffold_workspace",
     "search_by_tag",
     "semantic_search",
+    "suggest_entities",
     "update_frontmatter",
     "validate_extension",
     "workspace_map",